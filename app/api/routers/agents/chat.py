@@ -1,57 +1,124 @@
 
 from fastapi import APIRouter, HTTPException, status, Depends
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ...schemas.agent import (
     ChatRequest, ChatResponse, ErrorResponse
 )
-from multi_agents.crew import ClubEventHubCrew
+from multi_agents.runtime import get_crew
+from multi_agents.executor import agent_executor
+from multi_agents.streaming import RunStream, SSE_HEADERS, final_only, sse_events
+from multi_agents import club_facts
 from models import Club
-from database import get_session
+from database import get_async_db
+from services import response_cache, tool_cache, query_latency
 import logging
+import time
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 logger = logging.getLogger(__name__)
 
 
-crew_instance = None
+async def load_club(db: AsyncSession, club_id: int) -> Club:
+    club = await db.scalar(select(Club).where(Club.id == club_id))
+    
+    if not club:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Club with ID {club_id} not found"
+        )
+    return club
+
+
+async def factual_answer(db: AsyncSession, request: ChatRequest, club: Club, personality: str):
+    """Templated answer for a pure lookup question, None when the chatbot is
+    needed; the session is closed either way so no connection is held during
+    a crew run"""
+    started = time.perf_counter()
+    try:
+        response = await club_facts.answer(db, club, request.question, personality)
+    finally:
+        await db.close()
+    if response is not None:
+        query_latency.record("club_facts", time.perf_counter() - started)
+        logger.info(f"Answered chat request for club {club.name} from club facts")
+    return response
 
-def get_crew():
-    global crew_instance
-    if crew_instance is None:
-        crew_instance = ClubEventHubCrew()
-    return crew_instance
+
+def cache_key(request: ChatRequest, club: Club):
+    personality = request.club_personality or club.personality_style or "friendly"
+    scope = (request.club_id, personality)
+    stamp = tool_cache.stamp([("club", request.club_id), ("event", None)])
+    return personality, scope, stamp
 
 
 @router.post("/club",response_model=ChatResponse)
-async def chat_with_club(request: ChatRequest ,  db: Session = Depends(get_session)):
+async def chat_with_club(request: ChatRequest ,  db: AsyncSession = Depends(get_async_db)):
    
-        club = db.query(Club).filter(Club.id == request.club_id).first()
-        db.close()
-        
-        if not club:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Club with ID {request.club_id} not found"
-            )
+        club = await load_club(db, request.club_id)
+
+        personality, scope, stamp = cache_key(request, club)
+        response = await factual_answer(db, request, club, personality)
+        if response is not None:
+            return ChatResponse(response=response, club_name=club.name)
+
+        response = response_cache.get("club_chat", scope, request.question, stamp)
+        if response is not None:
+            logger.info(f"Answered chat request for club {club.name} from the response cache")
+            return ChatResponse(response=response, club_name=club.name)
 
         crew = get_crew()
         logger.info(f"Processing chat request for club {club.name} (ID: {request.club_id})")
         
-        response = crew.handle_club_query(
+        started = time.perf_counter()
+        response = str(await agent_executor.run(
+            "chat",
+            crew.handle_club_query,
             club_id=str(request.club_id),
             student_question=request.question,
-            club_personality=request.club_personality or club.personality_style or "friendly"
-        )
+            club_personality=personality
+        ))
+        query_latency.record("club_chat", time.perf_counter() - started)
+        response_cache.put("club_chat", scope, request.question, stamp, response)
         
         logger.info(f"Successfully generated response for club {club.name}")
         
         return ChatResponse(
-            response=str(response),
+            response=response,
             club_name=club.name
         )
-        
- 
 
 
+@router.post("/club/stream")
+async def stream_chat_with_club(request: ChatRequest, db: AsyncSession = Depends(get_async_db)):
+    """Same as /chat/club as server-sent events: "step" and "token" events
+    while the chatbot works, then "final" with the ChatResponse (or "error")"""
+    club = await load_club(db, request.club_id)
+
+    personality, scope, stamp = cache_key(request, club)
+    response = await factual_answer(db, request, club, personality)
+    if response is None:
+        response = response_cache.get("club_chat", scope, request.question, stamp)
+    if response is not None:
+        return StreamingResponse(
+            final_only(ChatResponse(response=response, club_name=club.name).model_dump()),
+            media_type="text/event-stream", headers=SSE_HEADERS
+        )
 
+    def final(result):
+        response = str(result)
+        response_cache.put("club_chat", scope, request.question, stamp, response)
+        return ChatResponse(response=response, club_name=club.name).model_dump()
 
+    stream = RunStream()
+    run = agent_executor.submit(
+        "chat",
+        get_crew().handle_club_query,
+        club_id=str(request.club_id),
+        student_question=request.question,
+        club_personality=personality,
+        stream=stream
+    )
+    logger.info(f"Streaming chat response for club {club.name} (ID: {request.club_id})")
+    return StreamingResponse(sse_events(stream, run, final), media_type="text/event-stream", headers=SSE_HEADERS)
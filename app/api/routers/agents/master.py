@@ -1,54 +1,97 @@
 
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
 from ...schemas.agent import (
     QueryRequest, QueryResponse,
     OnboardingRequest, OnboardingResponse,
     ErrorResponse
 )
-from multi_agents.crew import ClubEventHubCrew
+from multi_agents.runtime import get_crew
+from multi_agents.executor import agent_executor
+from multi_agents.streaming import RunStream, SSE_HEADERS, final_only, sse_events
 from models import Student
-from database import get_session
+from database import get_async_db
+from services import response_cache, tool_cache
+import json
 import logging
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/agents", tags=["Agents"])
 logger = logging.getLogger(__name__)
 
 
-crew_instance = None
-
-def get_crew():
-    global crew_instance
-    if crew_instance is None:
-        crew_instance = ClubEventHubCrew()
-    return crew_instance
+def cache_key(request: QueryRequest):
+    context = request.context or {}
+    scope = json.dumps(context, sort_keys=True, default=str)
+    stamp = tool_cache.stamp([
+        ("student", context.get("student_id")), ("event", None), ("club", None), ("skill", None)
+    ])
+    return scope, stamp
 
 
 @router.post("/query",response_model=QueryResponse )
 async def process_query(request: QueryRequest):
 
    
+        scope, stamp = cache_key(request)
+        response = response_cache.get("query", scope, request.query, stamp)
+        if response is not None:
+            logger.info("Answered general query from the response cache")
+            return QueryResponse(response=response)
+
         crew = get_crew()
         logger.info(f"Processing general query: '{request.query[:50]}...'")
         
-        response = crew.process_student_query(
+        response = str(await agent_executor.run(
+            "query",
+            crew.process_student_query,
             student_query=request.query,
             context=request.context
-        )
+        ))
+        response_cache.put("query", scope, request.query, stamp, response)
         
         logger.info(f"Query processed successfully")
         
         return QueryResponse(
-            response=str(response)
+            response=response
         )
-        
+
+
+@router.post("/query/stream")
+async def stream_query(request: QueryRequest):
+    """Same as /agents/query as server-sent events: "step" and "token" events
+    while the crew works, then "final" with the QueryResponse (or "error")"""
+    scope, stamp = cache_key(request)
+    response = response_cache.get("query", scope, request.query, stamp)
+    if response is not None:
+        return StreamingResponse(
+            final_only(QueryResponse(response=response).model_dump()),
+            media_type="text/event-stream", headers=SSE_HEADERS
+        )
+
+    def final(result):
+        response = str(result)
+        response_cache.put("query", scope, request.query, stamp, response)
+        return QueryResponse(response=response).model_dump()
+
+    stream = RunStream()
+    run = agent_executor.submit(
+        "query",
+        get_crew().process_student_query,
+        student_query=request.query,
+        context=request.context,
+        stream=stream
+    )
+    logger.info(f"Streaming general query: '{request.query[:50]}...'")
+    return StreamingResponse(sse_events(stream, run, final), media_type="text/event-stream", headers=SSE_HEADERS)
 
 
 
 @router.post("/onboarding",response_model=OnboardingResponse)
-async def onboard_student(request: OnboardingRequest , db: Session = Depends(get_session)):
-    student = db.query(Student).filter(Student.id == request.student_id).first()
-    db.close()
+async def onboard_student(request: OnboardingRequest , db: AsyncSession = Depends(get_async_db)):
+    student = await db.scalar(select(Student).where(Student.id == request.student_id))
+    await db.close()
 
     if not student:
         raise HTTPException(
@@ -59,7 +102,7 @@ async def onboard_student(request: OnboardingRequest , db: Session = Depends(get
     crew = get_crew()
     logger.info(f"Onboarding student {student.name} (ID: {request.student_id})")
 
-    response = crew.handle_onboarding(str(request.student_id))
+    response = await agent_executor.run("onboarding", crew.handle_onboarding, str(request.student_id))
 
     logger.info(f"Successfully onboarded student {student.name}")
 
@@ -1,16 +1,24 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from sqlalchemy.orm import Session
-from database import get_session
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db, get_session
 from models import Student
 from ...schemas.agent import (
     RecommendationRequest, RecommendationResponse,
+    FastRecommendationResponse, RecommendedEvent,
     WeeklyDigestRequest, WeeklyDigestResponse,
     ErrorResponse
 )
-from multi_agents.crew import ClubEventHubCrew
+from multi_agents.runtime import get_crew
+from multi_agents.executor import agent_executor
+from multi_agents.streaming import RunStream, SSE_HEADERS, sse, sse_events
+from services import student_recommendations, query_latency
 from ..autontification.token import get_current_user 
 import logging
 import json
+import time
 
 router = APIRouter(
     prefix="/recommendations",
@@ -19,22 +27,16 @@ router = APIRouter(
 
 logger = logging.getLogger(__name__)
 
-crew_instance = None
-def get_crew():
-    global crew_instance
-    if crew_instance is None:
-        crew_instance = ClubEventHubCrew()
-    return crew_instance
-
 
 @router.post("/", response_model=RecommendationResponse)
 async def get_recommendations(
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_db),
    current_user=Depends(get_current_user)
 ):
   
-    student_email = current_user.get("email")
-    student = db.query(Student).filter(Student.email == student_email).first()
+    student_email = current_user.email
+    student = await db.scalar(select(Student).where(Student.email == student_email))
+    await db.close()
 
     if not student:
         raise HTTPException(
@@ -45,12 +47,16 @@ async def get_recommendations(
     crew = get_crew()
     logger.info(f"Generating recommendations for student {student.name} (ID: {student.id})")
 
-    recommendations = crew.handle_recommendation_request(str(student.id))
+    recommendations = await agent_executor.run(
+        "recommendations", crew.handle_recommendation_request, str(student.id)
+    )
 
     logger.info(f"Successfully generated recommendations for student {student.name}")
 
     try:
         rec_data = json.loads(str(recommendations))
+        if isinstance(rec_data, dict):
+            rec_data = rec_data.get("recommendations")
         count = len(rec_data) if isinstance(rec_data, list) else 0
     except Exception:
         count = 0
@@ -60,3 +66,85 @@ async def get_recommendations(
         student_name=student.name,
         count=count
     )
+
+
+def fast_recommendations(student_email: str, limit: int) -> FastRecommendationResponse:
+    """Recommendations from the precomputed per-student lists, no LLM involved"""
+    started = time.perf_counter()
+    session = get_session()
+    try:
+        student = session.execute(select(Student.id, Student.name).where(Student.email == student_email)).first()
+        if not student:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Student with email {student_email} not found"
+            )
+        items = student_recommendations.get(session, student.id, limit)
+    finally:
+        session.close()
+
+    recommendations = [
+        RecommendedEvent(
+            event_id=item["item_id"],
+            title=item["title"],
+            club_name=item["club_name"],
+            date=item["date"],
+            location=item["location"],
+            score=item["score"],
+            reasons=item["reasons"]
+        )
+        for item in items
+    ]
+    query_latency.record("recommendations_fast", time.perf_counter() - started)
+    return FastRecommendationResponse(
+        recommendations=recommendations,
+        student_id=student.id,
+        student_name=student.name,
+        count=len(recommendations)
+    )
+
+
+@router.post("/fast", response_model=FastRecommendationResponse)
+def get_fast_recommendations(
+    limit: int = Query(10, ge=1, le=50),
+    current_user=Depends(get_current_user)
+):
+    """Typed recommendations with scores and reasons from the scoring engine,
+    in milliseconds and with a stable count (``limit``, or fewer when fewer
+    upcoming events are eligible)"""
+    return fast_recommendations(current_user.email, limit)
+
+
+@router.post("/fast/stream")
+async def stream_fast_recommendations(
+    limit: int = Query(10, ge=1, le=50),
+    current_user=Depends(get_current_user)
+):
+    """/recommendations/fast as server-sent events: a "recommendations" event
+    right away, then the recommendation agent's explanation of them as "step"
+    and "token" events and "final" with {"explanation": ...} (or "error")"""
+    response = await run_in_threadpool(fast_recommendations, current_user.email, limit)
+    items = [item.model_dump(mode="json") for item in response.recommendations]
+
+    if not items:
+        async def events():
+            yield sse("recommendations", response.model_dump(mode="json"))
+            yield sse("final", {"explanation": None})
+        return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+    stream = RunStream()
+    run = agent_executor.submit(
+        "recommendations",
+        get_crew().explain_recommendations,
+        str(response.student_id),
+        items,
+        stream=stream
+    )
+
+    async def events():
+        yield sse("recommendations", response.model_dump(mode="json"))
+        async for event in sse_events(stream, run, lambda result: {"explanation": str(result)}):
+            yield event
+
+    logger.info(f"Streaming recommendation explanation for student {response.student_name}")
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
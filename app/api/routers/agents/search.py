@@ -3,7 +3,9 @@ from fastapi import APIRouter
 from ...schemas.agent import (
     SearchRequest, SearchResponse, ErrorResponse
 )
-from multi_agents.crew import ClubEventHubCrew
+from multi_agents.runtime import get_crew
+from multi_agents.executor import agent_executor
+from services import response_cache, tool_cache
 import logging
 import json
 
@@ -11,15 +13,6 @@ router = APIRouter(prefix="/search", tags=["Search"])
 logger = logging.getLogger(__name__)
 
 
-crew_instance = None
-
-def get_crew():
-    global crew_instance
-    if crew_instance is None:
-        crew_instance = ClubEventHubCrew()
-    return crew_instance
-
-
 @router.post(
     "/",
     response_model=SearchResponse,
@@ -27,13 +20,20 @@ def get_crew():
 )
 async def search_events(request: SearchRequest):
  
-        crew = get_crew()
-        logger.info(f"Processing search query: '{request.query}'")
-        
-        results = crew.handle_search_query(
-            search_query=request.query,
-            filters=request.filters
-        )
+        scope = json.dumps(request.filters or {}, sort_keys=True, default=str)
+        stamp = tool_cache.stamp([("event", None), ("club", None)])
+        results = response_cache.get("search", scope, request.query, stamp)
+        if results is None:
+            crew = get_crew()
+            logger.info(f"Processing search query: '{request.query}'")
+
+            results = str(await agent_executor.run(
+                "search",
+                crew.handle_search_query,
+                search_query=request.query,
+                filters=request.filters
+            ))
+            response_cache.put("search", scope, request.query, stamp, results)
         
         logger.info(f"Search completed for query: '{request.query}'")
         
@@ -1,10 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from database import get_session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_session
 from models import Student, Club
+from services import tool_cache
+from services.pagination import keyset, count_of, page
+from api.schemas.pagination import PageParams
 from api.schemas.auth import *
 from .haching import Hash
+from starlette.concurrency import run_in_threadpool
 from .token import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 from datetime import timedelta, datetime
 
@@ -13,23 +18,20 @@ router = APIRouter(
     tags=["Authentication"]
 )
 
-def get_db():
-    db = get_session()
-    try:
+async def get_db():
+    async with get_async_session() as db:
         yield db
-    finally:
-        db.close()
 
 @router.post("/student/register", status_code=status.HTTP_201_CREATED, response_model=RegisterResponse)
-def register_student(student: StudentRegister, db: Session = Depends(get_db)):
-    existing_student = db.query(Student).filter(Student.email == student.email).first()
+async def register_student(student: StudentRegister, db: AsyncSession = Depends(get_db)):
+    existing_student = await db.scalar(select(Student).where(Student.email == student.email))
     if existing_student:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    hashed_password = Hash.hash_password(student.password)
+    hashed_password = await run_in_threadpool(Hash.hash_password, student.password)
     
     new_student = Student(
         name=student.name,
@@ -40,8 +42,9 @@ def register_student(student: StudentRegister, db: Session = Depends(get_db)):
     )
     
     db.add(new_student)
-    db.commit()
-    db.refresh(new_student)
+    await db.commit()
+    await db.refresh(new_student)
+    tool_cache.invalidate("student", new_student.id)
     
     return RegisterResponse(
         success=True,
@@ -51,15 +54,15 @@ def register_student(student: StudentRegister, db: Session = Depends(get_db)):
     )
 
 @router.post("/club/register", status_code=status.HTTP_201_CREATED, response_model=RegisterResponse)
-def register_club(club: ClubRegister, db: Session = Depends(get_db)):
-    existing_club = db.query(Club).filter(Club.email == club.email).first()
+async def register_club(club: ClubRegister, db: AsyncSession = Depends(get_db)):
+    existing_club = await db.scalar(select(Club).where(Club.email == club.email))
     if existing_club:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    hashed_password = Hash.hash_password(club.password)
+    hashed_password = await run_in_threadpool(Hash.hash_password, club.password)
     
     new_club = Club(
         name=club.name,
@@ -73,8 +76,9 @@ def register_club(club: ClubRegister, db: Session = Depends(get_db)):
     )
     
     db.add(new_club)
-    db.commit()
-    db.refresh(new_club)
+    await db.commit()
+    await db.refresh(new_club)
+    tool_cache.invalidate("club", new_club.id)
     
     return RegisterResponse(
         success=True,
@@ -84,9 +88,9 @@ def register_club(club: ClubRegister, db: Session = Depends(get_db)):
     )
 
 @router.post("/student/login", status_code=status.HTTP_200_OK, response_model=Token)
-def login_student(user: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    db_student = db.query(Student).filter(Student.email == user.username).first()
-    if not db_student or not Hash.verify_password(user.password, db_student.password_hash):
+async def login_student(user: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+    db_student = await db.scalar(select(Student).where(Student.email == user.username))
+    if not db_student or not await run_in_threadpool(Hash.verify_password, user.password, db_student.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
@@ -101,9 +105,9 @@ def login_student(user: OAuth2PasswordRequestForm = Depends(), db: Session = Dep
     return Token(access_token=access_token, token_type="bearer")
 
 @router.post("/club/login", status_code=status.HTTP_200_OK, response_model=Token)
-def login_club(user: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    db_club = db.query(Club).filter(Club.email == user.username).first()
-    if not db_club or not Hash.verify_password(user.password, db_club.password_hash):
+async def login_club(user: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+    db_club = await db.scalar(select(Club).where(Club.email == user.username))
+    if not db_club or not await run_in_threadpool(Hash.verify_password, user.password, db_club.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
@@ -118,11 +122,19 @@ def login_club(user: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     return Token(access_token=access_token, token_type="bearer")
 
 @router.get("/students", status_code=status.HTTP_200_OK)
-def get_students(db: Session = Depends(get_db)):
-    students = db.query(Student).all()
-    return [{"id": s.id, "name": s.name, "email": s.email, "field_of_study": s.field_of_study} for s in students]
+async def get_students(paging: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    students = (await db.scalars(keyset(select(Student), Student.id, paging.limit, paging.after))).all()
+    total = await db.scalar(count_of(select(Student))) if paging.include_total else None
+    return page(
+        [{"id": s.id, "name": s.name, "email": s.email, "field_of_study": s.field_of_study} for s in students],
+        paging.limit, total
+    )
 
 @router.get("/clubs", status_code=status.HTTP_200_OK)
-def get_clubs(db: Session = Depends(get_db)):
-    clubs = db.query(Club).all()
-    return [{"id": c.id, "name": c.name, "email": c.email, "description": c.description} for c in clubs]
\ No newline at end of file
+async def get_clubs(paging: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    clubs = (await db.scalars(keyset(select(Club), Club.id, paging.limit, paging.after))).all()
+    total = await db.scalar(count_of(select(Club))) if paging.include_total else None
+    return page(
+        [{"id": c.id, "name": c.name, "email": c.email, "description": c.description} for c in clubs],
+        paging.limit, total
+    )
\ No newline at end of file
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from database import get_session
+from database import get_async_session
 from models import Club
 from api.schemas.club import *
 from ..autontification.haching import Hash
 from ..autontification.token import get_current_user, TokenData
+from starlette.concurrency import run_in_threadpool
+from services import recommendation_engine, tool_cache, club_context_cache, club_knowledge, student_recommendations
 
 router = APIRouter(
     prefix="/clubs",
@@ -13,22 +16,19 @@ router = APIRouter(
 )
 
 
-def get_db():
-    db = get_session()
-    try:
+async def get_db():
+    async with get_async_session() as db:
         yield db
-    finally:
-        db.close()
 
 
 
 
 @router.get("/", response_model=ClubResponse, status_code=status.HTTP_200_OK)
 async def get_club(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    club = db.query(Club).filter(Club.email == current_user.email).first()
+    club = await db.scalar(select(Club).where(Club.email == current_user.email))
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
     return club
@@ -37,38 +37,50 @@ async def get_club(
 @router.put("/", response_model=ClubResponse, status_code=status.HTTP_200_OK)
 async def update_club(
     club_update: ClubUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    club = db.query(Club).filter(Club.email == current_user.email).first()
+    club = await db.scalar(select(Club).where(Club.email == current_user.email))
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
 
     update_data = club_update.dict(exclude_unset=True)
 
     if "password" in update_data:
-        update_data["password_hash"] = Hash.hash_password(update_data.pop("password"))
+        update_data["password_hash"] = await run_in_threadpool(Hash.hash_password, update_data.pop("password"))
 
     for field, value in update_data.items():
         setattr(club, field, value)
 
     club.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(club)
+    await db.commit()
+    await db.refresh(club)
+    recommendation_engine.invalidate()
+    student_recommendations.invalidate()
+    tool_cache.invalidate("club", club.id)
+    club_context_cache.invalidate(club.id)
+    club_knowledge.invalidate(club.id)
     return club
 
 
 @router.delete("/", response_model=DeleteResponse, status_code=status.HTTP_200_OK)
 async def delete_club(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    club = db.query(Club).filter(Club.email == current_user.email).first()
+    club = await db.scalar(select(Club).where(Club.email == current_user.email))
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
 
-    db.delete(club)
-    db.commit()
+    await db.delete(club)
+    await db.commit()
+    recommendation_engine.invalidate()
+    student_recommendations.invalidate()
+    # events and memberships go with the club
+    tool_cache.invalidate("club", club.id)
+    tool_cache.invalidate("event")
+    club_context_cache.invalidate(club.id)
+    club_knowledge.invalidate(club.id)
 
     return DeleteResponse(
         success=True,
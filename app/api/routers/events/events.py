@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from database import get_session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_session
 from models import Event, Club
 from api.schemas.events import *
 from datetime import datetime
 from ..autontification.token import get_current_user  
+from services import recommendation_engine, trending_leaderboard, view_counter, tool_cache, club_context_cache, club_knowledge, student_recommendations
+from services.pagination import keyset, count_of, page
+from api.schemas.pagination import PageParams
 
 router = APIRouter(
     prefix="/events",
@@ -12,22 +16,19 @@ router = APIRouter(
 )
 
 
-def get_db():
-    db = get_session()
-    try:
+async def get_db():
+    async with get_async_session() as db:
         yield db
-    finally:
-        db.close()
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=EventResponse)
-def create_event(
+async def create_event(
     event: EventCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
     # Récupération du club depuis l'email du token
-    club = db.query(Club).filter(Club.email == current_user.email).first()
+    club = await db.scalar(select(Club).where(Club.email == current_user.email))
     if not club:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -47,25 +48,32 @@ def create_event(
     )
 
     db.add(new_event)
-    db.commit()
-    db.refresh(new_event)
+    await db.commit()
+    await db.refresh(new_event)
+    recommendation_engine.invalidate()
+    tool_cache.invalidate("event", new_event.id)
+    club_context_cache.invalidate(new_event.club_id)
+    club_knowledge.invalidate(new_event.club_id, new_event.id)
+    student_recommendations.event_changed(new_event.id)
     return new_event
 
 @router.get("/{event_id}", status_code=status.HTTP_200_OK, response_model=EventResponse)
-def get_event(event_id: int, db: Session = Depends(get_db)):
-    event = db.query(Event).filter(Event.id == event_id).first()
+async def get_event(event_id: int, db: AsyncSession = Depends(get_db)):
+    event = await db.scalar(select(Event).where(Event.id == event_id))
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    event.view_count += 1
-    db.commit()
+    # Buffered and written in batches by the view flusher; the count shown
+    # includes the views not flushed yet and is never committed from here
+    event.view_count = (event.view_count or 0) + view_counter.record(event.id)
+    trending_leaderboard.record_view(event.id)
     return event
 
 
 
 @router.put("/{event_id}", status_code=status.HTTP_200_OK, response_model=EventResponse)
-def update_event(event_id: int, event_update: EventUpdate, db: Session = Depends(get_db)):
-    event = db.query(Event).filter(Event.id == event_id).first()
+async def update_event(event_id: int, event_update: EventUpdate, db: AsyncSession = Depends(get_db)):
+    event = await db.scalar(select(Event).where(Event.id == event_id))
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
@@ -74,19 +82,31 @@ def update_event(event_id: int, event_update: EventUpdate, db: Session = Depends
         setattr(event, field, value)
 
     event.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
+    recommendation_engine.invalidate()
+    tool_cache.invalidate("event", event_id)
+    club_context_cache.invalidate(event.club_id)
+    club_knowledge.invalidate(event.club_id, event_id)
+    student_recommendations.event_changed(event_id)
     return event
 
 
 @router.delete("/{event_id}", status_code=status.HTTP_200_OK, response_model=DeleteResponse)
-def delete_event(event_id: int, db: Session = Depends(get_db)):
-    event = db.query(Event).filter(Event.id == event_id).first()
+async def delete_event(event_id: int, db: AsyncSession = Depends(get_db)):
+    event = await db.scalar(select(Event).where(Event.id == event_id))
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    db.delete(event)
-    db.commit()
+    await db.delete(event)
+    await db.commit()
+    recommendation_engine.invalidate()
+    trending_leaderboard.remove(event_id)
+    tool_cache.invalidate("event", event_id)
+    club_context_cache.invalidate(event.club_id)
+    club_knowledge.invalidate(event.club_id, event_id)
+    student_recommendations.event_changed(event_id)
+    view_counter.discard(event_id)
     return DeleteResponse(
         success=True,
         message="Event deleted successfully",
@@ -95,9 +115,10 @@ def delete_event(event_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/", status_code=status.HTTP_200_OK)
-def get_all_events(db: Session = Depends(get_db)):
-    events = db.query(Event).all()
-    return [{
+async def get_all_events(paging: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    events = (await db.scalars(keyset(select(Event), Event.id, paging.limit, paging.after))).all()
+    total = await db.scalar(count_of(select(Event))) if paging.include_total else None
+    return page([{
         "id": e.id,
         "title": e.title,
         "club_id": e.club_id,
@@ -105,22 +126,22 @@ def get_all_events(db: Session = Depends(get_db)):
         "date": e.date,
         "location": e.location,
         "current_registrations": e.current_registrations
-    } for e in events]
+    } for e in events], paging.limit, total)
 
 
 @router.get("/club", status_code=status.HTTP_200_OK)
-def get_my_events(
-    db: Session = Depends(get_db),
+async def get_my_events(
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    club = db.query(Club).filter(Club.email == current_user.email).first()
+    club = await db.scalar(select(Club).where(Club.email == current_user.email))
     if not club:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Club not found"
         )
 
-    events = db.query(Event).filter(Event.club_id == club.id).all()
+    events = (await db.scalars(select(Event).where(Event.club_id == club.id))).all()
     return [{
         "id": e.id,
         "title": e.title,
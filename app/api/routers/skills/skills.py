@@ -1,26 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from database import get_session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_session
 from models import Skill
 from api.schemas.skill import *
 from datetime import datetime
+from services import recommendation_engine, similarity_index, tool_cache, student_recommendations
+from services.pagination import keyset, count_of, page
+from api.schemas.pagination import PageParams
 
 router = APIRouter(
     prefix="/skills",
     tags=["Skills"]
 )
 
-def get_db():
-    db = get_session()
-    try:
+async def get_db():
+    async with get_async_session() as db:
         yield db
-    finally:
-        db.close()
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=SkillResponse)
-def create_skill(skill: SkillCreate, db: Session = Depends(get_db)):
-    existing_skill = db.query(Skill).filter(Skill.name == skill.name).first()
+async def create_skill(skill: SkillCreate, db: AsyncSession = Depends(get_db)):
+    existing_skill = await db.scalar(select(Skill).where(Skill.name == skill.name))
     if existing_skill:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -33,15 +34,16 @@ def create_skill(skill: SkillCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_skill)
-    db.commit()
-    db.refresh(new_skill)
+    await db.commit()
+    await db.refresh(new_skill)
+    tool_cache.invalidate("skill", new_skill.id)
     
     return new_skill
 
 
 @router.get("/{skill_id}", status_code=status.HTTP_200_OK, response_model=SkillResponse)
-def get_skill(skill_id: int, db: Session = Depends(get_db)):
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
+async def get_skill(skill_id: int, db: AsyncSession = Depends(get_db)):
+    skill = await db.scalar(select(Skill).where(Skill.id == skill_id))
     if not skill:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -51,8 +53,8 @@ def get_skill(skill_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/{skill_id}", status_code=status.HTTP_200_OK, response_model=SkillResponse)
-def update_skill(skill_id: int, skill_update: SkillUpdate, db: Session = Depends(get_db)):
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
+async def update_skill(skill_id: int, skill_update: SkillUpdate, db: AsyncSession = Depends(get_db)):
+    skill = await db.scalar(select(Skill).where(Skill.id == skill_id))
     if not skill:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,23 +66,30 @@ def update_skill(skill_id: int, skill_update: SkillUpdate, db: Session = Depends
     for field, value in update_data.items():
         setattr(skill, field, value)
     
-    db.commit()
-    db.refresh(skill)
+    await db.commit()
+    await db.refresh(skill)
+    recommendation_engine.invalidate()
+    student_recommendations.invalidate()
+    tool_cache.invalidate("skill", skill_id)
     
     return skill
 
 
 @router.delete("/{skill_id}", status_code=status.HTTP_200_OK, response_model=DeleteResponse)
-def delete_skill(skill_id: int, db: Session = Depends(get_db)):
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
+async def delete_skill(skill_id: int, db: AsyncSession = Depends(get_db)):
+    skill = await db.scalar(select(Skill).where(Skill.id == skill_id))
     if not skill:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Skill not found"
         )
     
-    db.delete(skill)
-    db.commit()
+    await db.delete(skill)
+    await db.commit()
+    recommendation_engine.invalidate()
+    student_recommendations.invalidate()
+    similarity_index.drop_skill(skill_id)
+    tool_cache.invalidate("skill", skill_id)
     
     return DeleteResponse(
         success=True,
@@ -90,18 +99,19 @@ def delete_skill(skill_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/", status_code=status.HTTP_200_OK)
-def get_all_skills(db: Session = Depends(get_db)):
-    skills = db.query(Skill).all()
-    return [{
+async def get_all_skills(paging: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    skills = (await db.scalars(keyset(select(Skill), Skill.id, paging.limit, paging.after))).all()
+    total = await db.scalar(count_of(select(Skill))) if paging.include_total else None
+    return page([{
         "id": s.id,
         "name": s.name,
         "category": s.category
-    } for s in skills]
+    } for s in skills], paging.limit, total)
 
 
 @router.get("/category/{category}", status_code=status.HTTP_200_OK)
-def get_skills_by_category(category: str, db: Session = Depends(get_db)):
-    skills = db.query(Skill).filter(Skill.category == category).all()
+async def get_skills_by_category(category: str, db: AsyncSession = Depends(get_db)):
+    skills = (await db.scalars(select(Skill).where(Skill.category == category))).all()
     return [{
         "id": s.id,
         "name": s.name,
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from database import get_session
+from database import get_async_session
 from models import Student, StudentProfile
 from api.schemas.student import *
 from ..autontification.haching import Hash
 from ..autontification.token import get_current_user, TokenData
+from starlette.concurrency import run_in_threadpool
+from services import similarity_index, tool_cache, student_recommendations
 
 router = APIRouter(
     prefix="/students",
@@ -13,22 +16,19 @@ router = APIRouter(
 )
 
 
-def get_db():
-    db = get_session()
-    try:
+async def get_db():
+    async with get_async_session() as db:
         yield db
-    finally:
-        db.close()
 
 
 
 
 @router.get("/", response_model=StudentResponse, status_code=status.HTTP_200_OK)
 async def get_student(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    student = await db.scalar(select(Student).where(Student.email == current_user.email))
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     return student
@@ -37,38 +37,42 @@ async def get_student(
 @router.put("/", response_model=StudentResponse, status_code=status.HTTP_200_OK)
 async def update_student(
     student_update: StudentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    student = await db.scalar(select(Student).where(Student.email == current_user.email))
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
     update_data = student_update.dict(exclude_unset=True)
 
     if "password" in update_data:
-        update_data["password_hash"] = Hash.hash_password(update_data.pop("password"))
+        update_data["password_hash"] = await run_in_threadpool(Hash.hash_password, update_data.pop("password"))
 
     for field, value in update_data.items():
         setattr(student, field, value)
 
     student.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(student)
+    await db.commit()
+    await db.refresh(student)
+    tool_cache.invalidate("student", student.id)
     return student
 
 
 @router.delete("/", response_model=DeleteResponse, status_code=status.HTTP_200_OK)
 async def delete_student(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    student = await db.scalar(select(Student).where(Student.email == current_user.email))
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    db.delete(student)
-    db.commit()
+    await db.delete(student)
+    await db.commit()
+    similarity_index.remove(student.id)
+    student_recommendations.remove(student.id)
+    tool_cache.invalidate("student", student.id)
 
     return DeleteResponse(
         success=True,
@@ -81,16 +85,16 @@ async def delete_student(
 @router.post("/profile", response_model=ProfileResponse, status_code=status.HTTP_201_CREATED)
 async def create_profile(
     profile: ProfileCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    student = await db.scalar(select(Student).where(Student.email == current_user.email))
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    existing_profile = db.query(StudentProfile).filter(
-        StudentProfile.student_id == student.id
-    ).first()
+    existing_profile = await db.scalar(
+        select(StudentProfile).where(StudentProfile.student_id == student.id)
+    )
     if existing_profile:
         raise HTTPException(status_code=400, detail="Profile already exists")
 
@@ -102,23 +106,24 @@ async def create_profile(
     )
 
     db.add(new_profile)
-    db.commit()
-    db.refresh(new_profile)
+    await db.commit()
+    await db.refresh(new_profile)
+    tool_cache.invalidate("student", student.id)
     return new_profile
 
 
 @router.get("/profile", response_model=ProfileResponse, status_code=status.HTTP_200_OK)
 async def get_profile(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    student = await db.scalar(select(Student).where(Student.email == current_user.email))
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    profile = db.query(StudentProfile).filter(
-        StudentProfile.student_id == student.id
-    ).first()
+    profile = await db.scalar(
+        select(StudentProfile).where(StudentProfile.student_id == student.id)
+    )
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
@@ -128,16 +133,16 @@ async def get_profile(
 @router.put("/profile", response_model=ProfileResponse, status_code=status.HTTP_200_OK)
 async def update_profile(
     profile_update: ProfileUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    student = await db.scalar(select(Student).where(Student.email == current_user.email))
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    profile = db.query(StudentProfile).filter(
-        StudentProfile.student_id == student.id
-    ).first()
+    profile = await db.scalar(
+        select(StudentProfile).where(StudentProfile.student_id == student.id)
+    )
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
@@ -146,28 +151,30 @@ async def update_profile(
         setattr(profile, field, value)
 
     profile.last_updated = datetime.utcnow()
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
+    tool_cache.invalidate("student", student.id)
     return profile
 
 
 @router.delete("/profile", response_model=DeleteResponse, status_code=status.HTTP_200_OK)
 async def delete_profile(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
-    student = db.query(Student).filter(Student.email == current_user.email).first()
+    student = await db.scalar(select(Student).where(Student.email == current_user.email))
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    profile = db.query(StudentProfile).filter(
-        StudentProfile.student_id == student.id
-    ).first()
+    profile = await db.scalar(
+        select(StudentProfile).where(StudentProfile.student_id == student.id)
+    )
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    db.delete(profile)
-    db.commit()
+    await db.delete(profile)
+    await db.commit()
+    tool_cache.invalidate("student", student.id)
 
     return DeleteResponse(
         success=True,
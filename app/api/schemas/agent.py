@@ -156,6 +156,43 @@ class RecommendationResponse(BaseModel):
         }
 
 
+class RecommendedEvent(BaseModel):
+    event_id: int = Field(..., description="Event ID")
+    title: str = Field(..., description="Event title")
+    club_name: str = Field(..., description="Organizing club")
+    date: datetime = Field(..., description="Event date")
+    location: Optional[str] = Field(None, description="Event location")
+    score: float = Field(..., description="Match score from the recommendation engine")
+    reasons: List[str] = Field(..., description="Why the event is recommended")
+
+
+class FastRecommendationResponse(BaseModel):
+    recommendations: List[RecommendedEvent] = Field(..., description="Recommended events, best first")
+    student_id: int = Field(..., description="Student ID")
+    student_name: str = Field(..., description="Student name")
+    count: int = Field(..., description="Number of recommendations")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "recommendations": [
+                    {
+                        "event_id": 42,
+                        "title": "Intro to PyTorch",
+                        "club_name": "AI Club",
+                        "date": "2025-11-05T18:00:00",
+                        "location": "Room B12",
+                        "score": 87.5,
+                        "reasons": ["Matches your skills: Python", "Trending event"]
+                    }
+                ],
+                "student_id": 1,
+                "student_name": "John Doe",
+                "count": 1
+            }
+        }
+
+
 class WeeklyDigestRequest(BaseModel):
     student_id: int = Field(..., description="Student ID for weekly digest")
     
@@ -0,0 +1,20 @@
+from fastapi import HTTPException, Query, status
+from typing import Optional
+from services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor
+
+
+class PageParams:
+    """Query parameters of the paginated list endpoints, use with Depends()"""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+        include_total: bool = False
+    ):
+        try:
+            self.after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        self.limit = limit
+        self.include_total = include_total
@@ -1,6 +1,8 @@
 import os
+import threading
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -11,14 +13,146 @@ load_dotenv()  # Look in current directory
 
 Base = declarative_base()
 
-def get_engine():
+# One engine (and therefore one connection pool) per process.
+_engine = None
+_session_factory = None
+_async_engine = None
+_async_session_factory = None
+_engine_lock = threading.Lock()
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_database_url() -> str:
     DATABASE_URL = os.getenv('DATABASE_URL')
 
     if DATABASE_URL.startswith('postgres://'):
         DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
-    
-    # Removed print statement to avoid exposing secrets in logs
-    return create_engine(DATABASE_URL, echo=True)
+    return DATABASE_URL
+
+
+def get_async_database_url() -> str:
+    """Same database as DATABASE_URL, addressed through an asyncio driver"""
+    if os.getenv('ASYNC_DATABASE_URL'):
+        return os.getenv('ASYNC_DATABASE_URL')
+
+    DATABASE_URL = get_database_url()
+    scheme, _, rest = DATABASE_URL.partition('://')
+
+    if scheme.startswith('postgresql'):
+        # asyncpg spells libpq's sslmode as ssl
+        return 'postgresql+asyncpg://' + rest.replace('sslmode=', 'ssl=')
+    if scheme.startswith('sqlite'):
+        return 'sqlite+aiosqlite://' + rest
+    return DATABASE_URL
+
+
+def get_engine_options(database_url: str) -> dict:
+    """Build create_engine() keyword arguments from the DB_* environment variables"""
+    options = {
+        "echo": _env_flag("DB_ECHO", False),
+        "pool_pre_ping": _env_flag("DB_POOL_PRE_PING", True),
+    }
+
+    # SQLite uses its own single-file pools; the sizing knobs only apply to server databases
+    if database_url.startswith("sqlite"):
+        return options
+
+    options.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", 5)),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", 30)),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", 1800)),
+    )
+
+    statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+    if statement_timeout and database_url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(statement_timeout)}}
+    elif statement_timeout and database_url.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+
+    return options
+
+
+def get_engine():
+    global _engine, _session_factory
+
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                # Removed print statement to avoid exposing secrets in logs
+                database_url = get_database_url()
+                _engine = create_engine(database_url, **get_engine_options(database_url))
+                _session_factory = sessionmaker(bind=_engine)
+    return _engine
+
+
+def get_sessionmaker():
+    get_engine()
+    return _session_factory
+
+
+def get_async_engine():
+    global _async_engine, _async_session_factory
+
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                database_url = get_async_database_url()
+                _async_engine = create_async_engine(database_url, **get_engine_options(database_url))
+                _async_session_factory = async_sessionmaker(
+                    bind=_async_engine,
+                    class_=AsyncSession,
+                    expire_on_commit=False
+                )
+    return _async_engine
+
+
+def get_async_sessionmaker():
+    get_async_engine()
+    return _async_session_factory
+
+
+def dispose_engine():
+    """Close every pooled connection, e.g. on application shutdown"""
+    global _engine, _session_factory
+
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = None
+        _session_factory = None
+
+
+async def dispose_async_engine():
+    global _async_engine, _async_session_factory
+
+    engine = _async_engine
+    _async_engine = None
+    _async_session_factory = None
+    if engine is not None:
+        await engine.dispose()
+
+
+def _reset_after_fork():
+    # A forked worker must never reuse the parent's sockets. dispose(close=False)
+    # drops the inherited connections without closing them under the parent's feet,
+    # and the engine opens fresh ones on demand in the child.
+    global _engine_lock
+    _engine_lock = threading.Lock()
+    if _engine is not None:
+        _engine.dispose(close=False)
+    if _async_engine is not None:
+        _async_engine.sync_engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
 
 
 
@@ -32,16 +166,14 @@ def init_db():
         student_skills, event_skills,
         event_registrations, club_members
     )
-    
+
     engine = get_engine()
     Base.metadata.create_all(engine)
     print("✅ Database tables created successfully!")
 
 
 def get_session():
-    engine = get_engine()
-    Session = sessionmaker(bind=engine)
-    return Session()
+    return get_sessionmaker()()
 
 
 def get_db():
@@ -53,5 +185,14 @@ def get_db():
         db.close()
 
 
+def get_async_session() -> AsyncSession:
+    return get_async_sessionmaker()()
+
+
+async def get_async_db():
+    async with get_async_session() as db:
+        yield db
+
+
 if __name__ == "__main__":
-    init_db()
\ No newline at end of file
+    init_db()
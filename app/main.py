@@ -5,8 +5,25 @@ from api.routers.student import student
 from api.routers.club import club
 from api.routers.events import  events
 from api.routers.skills import skills
-from fastapi import FastAPI
+import asyncio
+import os
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from database import dispose_engine, dispose_async_engine, get_session
+from multi_agents import runtime
+from multi_agents.executor import AgentBusy, agent_executor
+from services import (
+    trending_leaderboard, view_counter, tool_cache, query_latency, response_cache, club_context_cache,
+    student_recommendations
+)
+
+# Seconds between write-behind flushes to the events table
+VIEW_FLUSH_INTERVAL = float(os.getenv("VIEW_FLUSH_INTERVAL", 5))
+TRENDING_FLUSH_INTERVAL = float(os.getenv("TRENDING_FLUSH_INTERVAL", 60))
+# Seconds between checks whether the recommendation store needs a rebuild
+RECOMMENDATIONS_REFRESH_INTERVAL = float(os.getenv("RECOMMENDATIONS_REFRESH_INTERVAL", 30))
 
 
 
@@ -38,6 +55,106 @@ app.include_router(events.router)
 app.include_router(skills.router)
 
 
+@app.exception_handler(AgentBusy)
+async def agents_busy(request: Request, exc: AgentBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@app.get("/stats/agent-executor", tags=["Monitoring"])
+def agent_executor_stats():
+    return agent_executor.stats()
+
+
+@app.get("/stats/tool-cache", tags=["Monitoring"])
+def tool_cache_stats():
+    return tool_cache.stats()
+
+
+@app.get("/stats/response-cache", tags=["Monitoring"])
+def response_cache_stats():
+    return response_cache.stats()
+
+
+@app.get("/stats/chatbot-pool", tags=["Monitoring"])
+def chatbot_pool_stats():
+    return runtime.get_crew().club_chatbots.stats()
+
+
+@app.get("/stats/student-recommendations", tags=["Monitoring"])
+def student_recommendations_stats():
+    return student_recommendations.stats()
+
+
+@app.get("/stats/query-latency", tags=["Monitoring"])
+def query_latency_stats():
+    return query_latency.stats()
+
+
+def run_with_session(task):
+    session = get_session()
+    try:
+        return task(session)
+    finally:
+        session.close()
+
+
+async def flush_periodically(name, interval, flush):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(run_with_session, flush)
+        except Exception as e:
+            print(f"⚠️ {name} flush failed: {e}")
+
+
+# Write-behind buffers, drained in this order on shutdown
+FLUSHERS = [
+    ("View count", VIEW_FLUSH_INTERVAL, view_counter.flush),
+    ("Trending", TRENDING_FLUSH_INTERVAL, trending_leaderboard.flush),
+]
+
 
+@app.on_event("startup")
+async def start_flushers():
+    try:
+        await run_in_threadpool(run_with_session, trending_leaderboard.load)
+    except Exception as e:
+        print(f"⚠️ Trending leaderboard not loaded: {e}")
+    try:
+        await run_in_threadpool(run_with_session, club_context_cache.load)
+    except Exception as e:
+        print(f"⚠️ Club context packs not preloaded: {e}")
+    try:
+        await run_in_threadpool(run_with_session, student_recommendations.load)
+    except Exception as e:
+        print(f"⚠️ Student recommendations not precomputed, scoring on request: {e}")
+    try:
+        await run_in_threadpool(runtime.warm)
+    except Exception as e:
+        print(f"⚠️ Agent runtime not warmed, building on first request: {e}")
+    app.state.flushers = [
+        asyncio.create_task(flush_periodically(name, interval, flush))
+        for name, interval, flush in FLUSHERS
+    ]
+    # rebuilds are not needed on shutdown, so this one is not in FLUSHERS
+    app.state.flushers.append(asyncio.create_task(flush_periodically(
+        "Student recommendations", RECOMMENDATIONS_REFRESH_INTERVAL, student_recommendations.refresh
+    )))
 
 
+@app.on_event("shutdown")
+async def shutdown_database():
+    for task in getattr(app.state, "flushers", []):
+        task.cancel()
+    for name, _, flush in FLUSHERS:
+        try:
+            await run_in_threadpool(run_with_session, flush)
+        except Exception as e:
+            print(f"⚠️ {name} flush failed: {e}")
+    agent_executor.shutdown()
+    dispose_engine()
+    await dispose_async_engine()
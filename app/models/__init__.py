@@ -1,4 +1,7 @@
-from database import Base, get_engine, init_db, get_session, get_db
+from database import (
+    Base, get_engine, get_sessionmaker, dispose_engine, init_db, get_session, get_db,
+    get_async_engine, get_async_sessionmaker, get_async_session, get_async_db
+)
 from .student import Student, StudentProfile
 from .club import Club
 from .event import Event
@@ -7,15 +10,23 @@ from .relations import (
     student_skills,
     event_skills,
     event_registrations,
+    event_waitlist,
     club_members
 )
+from .search import POSTGRES_SEARCH_DDL, SQLITE_SEARCH_DDL
 
 __all__ = [
     'Base',
     'get_engine',
+    'get_sessionmaker',
+    'dispose_engine',
     'init_db',
     'get_session',
     'get_db',
+    'get_async_engine',
+    'get_async_sessionmaker',
+    'get_async_session',
+    'get_async_db',
     'Student',
     'StudentProfile',
     'Club',
@@ -24,5 +35,8 @@ __all__ = [
     'student_skills',
     'event_skills',
     'event_registrations',
-    'club_members'
+    'event_waitlist',
+    'club_members',
+    'POSTGRES_SEARCH_DDL',
+    'SQLITE_SEARCH_DDL'
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -7,6 +7,12 @@ from .relations import event_skills, event_registrations
 
 class Event(Base):
     __tablename__ = 'events'
+    __table_args__ = (
+        # upcoming/trending listings (equality column first, then the date
+        # range) and per-club upcoming events
+        Index('ix_events_is_trending_date', 'is_trending', 'date'),
+        Index('ix_events_club_id_date', 'club_id', 'date'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     club_id = Column(Integer, ForeignKey('clubs.id', ondelete='CASCADE'), nullable=False)
@@ -20,6 +26,7 @@ class Event(Base):
     current_registrations = Column(Integer, default=0)
     is_trending = Column(Boolean, default=False, index=True)
     view_count = Column(Integer, default=0)
+    trending_score = Column(Float, index=True)  # log-space decayed activity, see services/trending.py
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
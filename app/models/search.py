@@ -0,0 +1,65 @@
+from sqlalchemy import DDL, event
+from .event import Event
+
+# Full-text search over events.title / event_type / description.
+#
+# Postgres: a generated, weighted tsvector column with a GIN index. The
+# database maintains it on every INSERT/UPDATE, whoever writes the row.
+#
+# SQLite: an external-content FTS5 table mirroring events, kept in sync by
+# triggers on insert, update and delete.
+#
+# These fire with Base.metadata.create_all(); existing databases are upgraded
+# with scripts/migrate_event_search.py.
+
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(event_type, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_events_search_vector ON events USING GIN (search_vector)",
+]
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        title, event_type, description,
+        content='events', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts(rowid, title, event_type, description)
+        VALUES (new.id, new.title, new.event_type, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, event_type, description)
+        VALUES ('delete', old.id, old.title, old.event_type, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE OF title, event_type, description ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, event_type, description)
+        VALUES ('delete', old.id, old.title, old.event_type, old.description);
+        INSERT INTO events_fts(rowid, title, event_type, description)
+        VALUES (new.id, new.title, new.event_type, new.description);
+    END
+    """,
+]
+
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(Event.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Event.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+# The mirror table is not part of the metadata, drop it alongside events
+event.listen(
+    Event.__table__, "after_drop",
+    DDL("DROP TABLE IF EXISTS events_fts").execute_if(dialect="sqlite")
+)
@@ -1,5 +1,5 @@
 from crewai import Agent
-from ..tools.databasetool import DatabaseTool
+from ..tools.agent_tools import StudentProfileTool, RecommendTool, SimilarStudentsTool, TrendingEventsTool, ListClubsTool
 import os
 from dotenv import load_dotenv
 from .openrouter import OpenRouterLLM
@@ -33,7 +33,11 @@ def create_recommendation_agent() -> Agent:
         verbose=True,
         allow_delegation=False,
            tools=[
-            DatabaseTool()
+            StudentProfileTool(),
+            RecommendTool(),
+            SimilarStudentsTool(),
+            TrendingEventsTool(),
+            ListClubsTool()
         ],
         llm= MODEL,
          memory=True
@@ -1,5 +1,4 @@
 from crewai import Agent
-from ..tools.databasetool import DatabaseTool
 import os
 from dotenv import load_dotenv
 from .openrouter import OpenRouterLLM
@@ -1,5 +1,5 @@
 from crewai import Agent
-from ..tools.databasetool import DatabaseTool
+from ..tools.agent_tools import StudentProfileTool, ClubInfoTool, ClubMembersTool, SearchEventsTool, TrendingEventsTool, RecommendTool
 import os
 from dotenv import load_dotenv
 from .openrouter import OpenRouterLLM
@@ -32,7 +32,12 @@ def create_master_orchestrator() -> Agent:
         verbose=True,
         allow_delegation=True,
          tools=[
-            DatabaseTool()
+            StudentProfileTool(),
+            ClubInfoTool(),
+            ClubMembersTool(),
+            SearchEventsTool(),
+            TrendingEventsTool(),
+            RecommendTool()
         ],
         llm= MODEL,
          memory=True
@@ -1,5 +1,5 @@
 from crewai import Agent
-from ..tools.databasetool import DatabaseTool
+from ..tools.agent_tools import StudentProfileTool, UpdateProfileTool, ListSkillsTool, ListClubsTool, RecommendTool, RegisterEventTool
 import os
 from dotenv import load_dotenv
 from .openrouter import OpenRouterLLM
@@ -34,7 +34,12 @@ def create_onboarding_agent() -> Agent:
         verbose=True,
         allow_delegation=True,
           tools=[
-            DatabaseTool()
+            StudentProfileTool(),
+            UpdateProfileTool(),
+            ListSkillsTool(),
+            ListClubsTool(),
+            RecommendTool(),
+            RegisterEventTool()
         ],
         llm=MODEL,
          memory=True
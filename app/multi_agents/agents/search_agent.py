@@ -1,5 +1,5 @@
 from crewai import Agent
-from ..tools.databasetool import DatabaseTool
+from ..tools.agent_tools import SearchEventsTool, ListEventsTool, TrendingEventsTool
 import os
 from dotenv import load_dotenv
 from .openrouter import OpenRouterLLM
@@ -32,7 +32,9 @@ def create_search_agent() -> Agent:
         verbose=True,
         allow_delegation=False,
           tools=[
-            DatabaseTool()
+            SearchEventsTool(),
+            ListEventsTool(),
+            TrendingEventsTool()
         ],
         llm= MODEL,
          memory=True
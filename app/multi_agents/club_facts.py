@@ -0,0 +1,165 @@
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Club, Event, club_members
+from .intents import EVENT_TYPES
+
+
+# Direct answers for /chat/club questions that are pure lookups (next event,
+# where it is, contact email, website, member count): one or two SQL reads and
+# a reply phrased in the club's personality style instead of a chatbot run.
+# ``answer`` returns None for anything open-ended, and the question then goes
+# to the club chatbot as before.
+
+NEXT_EVENT = "next_event"
+LOCATION = "location"
+CONTACT = "contact"
+WEBSITE = "website"
+MEMBERS = "members"
+
+_EVENT_WORDS = r"(events?|meetings?|meetups?|sessions?|workshops?|hackathons?|competitions?|socials?|talks?|gatherings?)"
+FACTS = {
+    NEXT_EVENT: re.compile(
+        rf"\b(next|upcoming|coming up|soonest)\b.*\b{_EVENT_WORDS}\b"
+        rf"|\bwhen\b.*\b({_EVENT_WORDS}|meet)\b"
+    ),
+    # "where is/are/will/do ...", so "where can I find the meeting notes" stays out
+    LOCATION: re.compile(rf"\bwhere (is|are|will|do|does)\b.*\b({_EVENT_WORDS}|meet|held|located|take place)\b"),
+    CONTACT: re.compile(r"\b(e-?mail|contact|reach (you|the club|out))\b"),
+    WEBSITE: re.compile(r"\b(website|web site|url|homepage|web page)\b"),
+    MEMBERS: re.compile(
+        r"\bhow many (members|people (are )?in (the|your|this) club)\b|\bhow big is (the|your|this) club\b"
+        r"|\bmember(ship)? count\b|\bnumber of members\b"
+    ),
+}
+# Questions that need the chatbot even when they mention a fact
+OPEN_ENDED = re.compile(
+    r"\b(why|explain|compare|difference|advice|should i|worth|tell me about|what (is|are) .*\babout|"
+    r"what do (you|they) do|like|think|opinion|describe|join|prepare|bring|need|recommend|suggest|help|"
+    r"good|beginners?|new to|suitable|easy|hard|difficult|"
+    # the templates only know what is coming up, not what happened
+    r"was|were|did|last|previous|past|attended|ago|start(ed)?|founded)\b"
+)
+# Longer questions usually carry more than a lookup
+MAX_WORDS = 16
+
+# personality style -> fact -> phrasing; "friendly" covers unknown styles
+TEMPLATES: Dict[str, Dict[str, str]] = {
+    "friendly": {
+        NEXT_EVENT: "Our next {kind} is {title} on {when}{at}! Hope to see you there 😊",
+        "no_" + NEXT_EVENT: "We don't have any {kind}s scheduled right now, but keep an eye out, new ones are coming! 😊",
+        LOCATION: "{title} will be held at {location}. See you there!",
+        "no_" + LOCATION: "We haven't announced where {title} will be held yet, check back soon!",
+        CONTACT: "You can reach us at {contact_email}, we'd love to hear from you!",
+        "no_" + CONTACT: "We don't have a contact email listed yet{website_hint}.",
+        WEBSITE: "Check out our website: {website}",
+        "no_" + WEBSITE: "We don't have a website yet{contact_hint}.",
+        MEMBERS: "We're {members} members strong and always happy to welcome more!",
+    },
+    "formal": {
+        NEXT_EVENT: "The next {kind} of {club} is {title}, scheduled for {when}{at}.",
+        "no_" + NEXT_EVENT: "{club} has no {kind}s scheduled at present.",
+        LOCATION: "{title} will take place at {location}.",
+        "no_" + LOCATION: "The venue for {title} has not been announced yet.",
+        CONTACT: "{club} may be contacted at {contact_email}.",
+        "no_" + CONTACT: "{club} has not listed a contact email{website_hint}.",
+        WEBSITE: "The official website of {club} is {website}.",
+        "no_" + WEBSITE: "{club} does not have a website at present{contact_hint}.",
+        MEMBERS: "{club} currently has {members} members.",
+    },
+    "casual": {
+        NEXT_EVENT: "Next up: {title}, {when}{at}. Come hang out!",
+        "no_" + NEXT_EVENT: "Nothing on the calendar right now, stay tuned!",
+        LOCATION: "{title} is happening at {location}.",
+        "no_" + LOCATION: "No spot picked for {title} yet, we'll let you know!",
+        CONTACT: "Drop us a line at {contact_email}!",
+        "no_" + CONTACT: "No email up yet{website_hint}.",
+        WEBSITE: "We're online at {website}",
+        "no_" + WEBSITE: "No website yet{contact_hint}.",
+        MEMBERS: "We've got {members} members so far, come join the crew!",
+    },
+    "tech-focused": {
+        NEXT_EVENT: "Next {kind}: {title}, {when}{at}.",
+        "no_" + NEXT_EVENT: "No upcoming {kind}s in the schedule yet.",
+        LOCATION: "Location for {title}: {location}.",
+        "no_" + LOCATION: "Location for {title}: TBA.",
+        CONTACT: "Contact: {contact_email}",
+        "no_" + CONTACT: "No contact email configured{website_hint}.",
+        WEBSITE: "Website: {website}",
+        "no_" + WEBSITE: "No website deployed yet{contact_hint}.",
+        MEMBERS: "Member count: {members}.",
+    },
+}
+FACT_ORDER = (NEXT_EVENT, LOCATION, CONTACT, WEBSITE, MEMBERS)
+# facts read straight off the club row
+CLUB_FIELDS = {CONTACT: "contact_email", WEBSITE: "website"}
+
+
+def detect(question: str) -> List[str]:
+    """Facts a question asks for, empty when it isn't a pure lookup"""
+    text = question.lower().replace("'", "").strip()
+    if len(text.split()) > MAX_WORDS or OPEN_ENDED.search(text):
+        return []
+    facts = [fact for fact in FACT_ORDER if FACTS[fact].search(text)]
+    # "where is the next meeting" asks for the place, not the date
+    if LOCATION in facts and NEXT_EVENT in facts and not re.search(r"\bwhen\b", text):
+        facts.remove(NEXT_EVENT)
+    return facts
+
+
+def _event_type(question: str) -> Optional[str]:
+    words = re.findall(r"[a-z]+", question.lower())
+    return next((EVENT_TYPES[word] for word in words if word in EVENT_TYPES), None)
+
+
+async def answer(db: AsyncSession, club: Club, question: str, personality: str) -> Optional[str]:
+    """Templated reply for a factual question, None to fall back to the chatbot"""
+    facts = detect(question)
+    if not facts:
+        return None
+    templates = TEMPLATES.get((personality or "").lower(), TEMPLATES["friendly"])
+    values = {
+        "club": club.name,
+        "contact_email": club.contact_email,
+        "website": club.website,
+        "website_hint": f", but you can find us at {club.website}" if club.website else "",
+        "contact_hint": f", but you can reach us at {club.contact_email}" if club.contact_email else "",
+    }
+
+    if NEXT_EVENT in facts or LOCATION in facts:
+        event_type = _event_type(question)
+        upcoming = select(Event.title, Event.date, Event.location).where(
+            Event.club_id == club.id, Event.date > datetime.utcnow()
+        )
+        if event_type is not None:
+            upcoming = upcoming.where(Event.event_type == event_type)
+        event = (await db.execute(upcoming.order_by(Event.date, Event.id).limit(1))).first()
+        values["kind"] = event_type or "event"
+        if event is None:
+            # nothing to place either, one "nothing scheduled" line covers both
+            facts = ["no_" + NEXT_EVENT] + [fact for fact in facts if fact not in (NEXT_EVENT, LOCATION)]
+        else:
+            values.update(
+                title=event.title,
+                when=f"{event.date:%A %d %B at %H:%M}",
+                at=f" at {event.location}" if event.location and LOCATION not in facts else "",
+                location=event.location,
+            )
+            if LOCATION in facts and not event.location:
+                facts[facts.index(LOCATION)] = "no_" + LOCATION
+
+    if MEMBERS in facts:
+        values["members"] = await db.scalar(
+            select(func.count()).select_from(club_members).where(club_members.c.club_id == club.id)
+        )
+
+    lines = []
+    for fact in facts:
+        if fact in CLUB_FIELDS and not values[CLUB_FIELDS[fact]]:
+            fact = "no_" + fact
+        lines.append(templates[fact].format(**values))
+    return " ".join(lines)
@@ -8,118 +8,99 @@ from .tasks.master_task import create_routing_task
 from .tasks.recemndation import create_weekly_digest_task
 from .tasks.clubchatboot import create_club_info_task
 from .tasks.onboarding import create_onboarding_task
-from .tasks.recemndation import create_personalized_recommendations_task
+from .tasks.recemndation import create_personalized_recommendations_task, create_recommendation_explanation_task
 from .tasks.search_tasks import create_search_task
+from .intents import classify
+from . import fast_path, student_context
+from .pool import AgentPool
+from services import query_latency, club_context_cache, club_knowledge
+from database import get_session
 from typing import Dict, Any
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# passages of club text retrieved for each club question
+CLUB_PASSAGES = int(os.getenv("CLUB_PASSAGES", 3))
 
 class ClubEventHubCrew:
-    
+    """Agents are built once and shared; each run works on a copy, since a
+    crew run stores its executor on the agent and runs overlap across threads"""
     
     def __init__(self):
         self.master_orchestrator = create_master_orchestrator()
         self.recommendation_agent = create_recommendation_agent()
         self.search_agent = create_search_agent()
         self.onboarding_agent = create_onboarding_agent()
-        self.club_chatbots = {} 
+        self.club_chatbots = AgentPool(create_club_chatbot)
     
     def get_club_chatbot(self, club_id: str, personality: str = "friendly"):
-        
-        if club_id not in self.club_chatbots:
-            self.club_chatbots[club_id] = create_club_chatbot(club_id, personality)
-        return self.club_chatbots[club_id]
-    
-    def process_student_query(self, student_query: str, context: Dict[str, Any] = None) -> str:
-  
-        if context is None:
-            context = {}
-     
-        routing_task = create_routing_task(self.master_orchestrator, student_query)
-        
-    
-        routing_crew = Crew(
-            agents=[self.master_orchestrator],
-            tasks=[routing_task],
+        return self.club_chatbots.get(club_id, personality)
+
+    def _kickoff(self, agent, create_task, *args, stream=None):
+        agent = agent.copy()
+        if stream is not None:
+            stream.watch(agent)
+        crew = Crew(
+            agents=[agent],
+            tasks=[create_task(agent, *args)],
             process=Process.sequential,
             verbose=True
         )
+        return crew.kickoff()
+    
+    def process_student_query(self, student_query: str, context: Dict[str, Any] = None, stream=None) -> str:
   
-        routing_result = routing_crew.kickoff()
+        if context is None:
+            context = {}
+
+        # confident, simple intents are answered locally without an LLM call
+        started = time.perf_counter()
+        intent = classify(student_query)
+        answer = fast_path.answer(intent, context)
+        if answer is not None:
+            query_latency.record("fast_path", time.perf_counter() - started)
+            logger.info(f"Answered '{intent.name}' locally (confidence {intent.confidence})")
+            return answer
+
+        routing_result = self._kickoff(self.master_orchestrator, create_routing_task, student_query, stream=stream)
+        query_latency.record("crew", time.perf_counter() - started)
         
         return routing_result
     
-    def handle_club_query(self, club_id: str, student_question: str, club_personality: str = "friendly"):
-   
-   
-    
-        
+    def handle_club_query(self, club_id: str, student_question: str, club_personality: str = "friendly", stream=None):
         club_agent = self.get_club_chatbot(club_id, club_personality)
-        task = create_club_info_task(club_agent, club_id, student_question)
-        
-        crew = Crew(
-            agents=[club_agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
+        session = get_session()
+        try:
+            club_context = club_context_cache.get(session, int(club_id))
+            club_passages = club_knowledge.passages(session, int(club_id), student_question, k=CLUB_PASSAGES)
+        finally:
+            session.close()
+        return self._kickoff(
+            club_agent, create_club_info_task, club_id, student_question, club_context, club_passages, stream=stream
         )
-        
-        return crew.kickoff()
     
     def handle_recommendation_request(self, student_id: str):
-
-        
-        
-        task = create_personalized_recommendations_task(self.recommendation_agent, student_id)
-        
-        crew = Crew(
-            agents=[self.recommendation_agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
+        return self._kickoff(
+            self.recommendation_agent, create_personalized_recommendations_task,
+            student_id, student_context.build(student_id)
         )
-        
-        return crew.kickoff()
     
-    def handle_search_query(self, search_query: str, filters: dict = None):
-        
-       
-        
-        task = create_search_task(self.search_agent, search_query, filters)
-        
-        crew = Crew(
-            agents=[self.search_agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
+    def explain_recommendations(self, student_id: str, recommendations: list, stream=None):
+        return self._kickoff(
+            self.recommendation_agent, create_recommendation_explanation_task, student_id, recommendations,
+            stream=stream
         )
-        
-        return crew.kickoff()
+    
+    def handle_search_query(self, search_query: str, filters: dict = None):
+        return self._kickoff(self.search_agent, create_search_task, search_query, filters)
     
     def handle_onboarding(self, student_id: str):
-
-
-        
-        task = create_onboarding_task(self.onboarding_agent, student_id)
-        
-        crew = Crew(
-            agents=[self.onboarding_agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        return crew.kickoff()
+        return self._kickoff(self.onboarding_agent, create_onboarding_task, student_id, student_context.build(student_id))
     
     def handle_weekly_digest(self, student_id: str):
-
-        
-        
-        task = create_weekly_digest_task(self.recommendation_agent, student_id)
-        
-        crew = Crew(
-            agents=[self.recommendation_agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
+        return self._kickoff(
+            self.recommendation_agent, create_weekly_digest_task, student_id, student_context.build(student_id)
         )
-        
-        return crew.kickoff()
\ No newline at end of file
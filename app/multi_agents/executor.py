@@ -0,0 +1,121 @@
+import asyncio
+import functools
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# Crew runs block for seconds on LLM calls. Routes hand them to this executor
+# so the event loop keeps serving other requests while they run.
+
+# endpoint -> (runs at once, runs allowed to wait for a slot)
+DEFAULT_LIMITS = (int(os.getenv("AGENT_CONCURRENCY", 4)), int(os.getenv("AGENT_QUEUE", 16)))
+ENDPOINT_LIMITS: Dict[str, Tuple[int, int]] = {
+    "chat": DEFAULT_LIMITS,
+    "query": DEFAULT_LIMITS,
+    "search": DEFAULT_LIMITS,
+    "recommendations": (max(1, DEFAULT_LIMITS[0] // 2), DEFAULT_LIMITS[1] // 2),
+    "onboarding": (max(1, DEFAULT_LIMITS[0] // 2), DEFAULT_LIMITS[1] // 2),
+}
+
+
+class AgentBusy(Exception):
+    """An endpoint has every slot running and its queue full"""
+
+    def __init__(self, endpoint: str, retry_after: int):
+        super().__init__(f"{endpoint} agents are busy, retry in {retry_after} s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class EndpointLimit:
+    def __init__(self, concurrency: int, queue: int):
+        self.concurrency = concurrency
+        self.queue = queue
+        self.slots = asyncio.Semaphore(concurrency)
+        self.admitted = 0
+        self.running = 0
+        self.rejected = 0
+        # moving average of run time, seeds the Retry-After estimate
+        self.average_seconds = 5.0
+
+
+class AgentExecutor:
+    """Bounded thread pool for crew runs with per-endpoint admission control.
+
+    Each endpoint runs at most ``concurrency`` calls at once and lets up to
+    ``queue`` more wait; beyond that ``run`` raises AgentBusy right away, with
+    a Retry-After estimate from the endpoint's recent run times, instead of
+    letting requests pile up behind a slow model.
+
+    Waiting happens on the event loop, so pool threads only ever hold running
+    calls; by default the pool has one thread per slot. Admission counters
+    are only touched from the event loop.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, limits: Optional[Dict[str, Tuple[int, int]]] = None):
+        limits = limits or ENDPOINT_LIMITS
+        if max_workers is None:
+            max_workers = int(os.getenv("AGENT_WORKERS", 0)) or sum(concurrency for concurrency, _ in limits.values())
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent")
+        self._lock = threading.Lock()
+        self._limits = {
+            endpoint: EndpointLimit(concurrency, queue)
+            for endpoint, (concurrency, queue) in limits.items()
+        }
+
+    def _limit(self, endpoint: str) -> EndpointLimit:
+        with self._lock:
+            if endpoint not in self._limits:
+                self._limits[endpoint] = EndpointLimit(*DEFAULT_LIMITS)
+            return self._limits[endpoint]
+
+    def submit(self, endpoint: str, function: Callable[..., Any], *args, **kwargs) -> "asyncio.Task":
+        """Admit a call and start it as a task; raises AgentBusy right away
+        when the endpoint is saturated"""
+        limit = self._limit(endpoint)
+        if limit.admitted >= limit.concurrency + limit.queue:
+            limit.rejected += 1
+            waves = (limit.admitted - limit.concurrency) // limit.concurrency + 1
+            raise AgentBusy(endpoint, max(1, math.ceil(waves * limit.average_seconds)))
+        limit.admitted += 1
+        return asyncio.ensure_future(self._run(limit, functools.partial(function, *args, **kwargs)))
+
+    async def run(self, endpoint: str, function: Callable[..., Any], *args, **kwargs) -> Any:
+        return await self.submit(endpoint, function, *args, **kwargs)
+
+    async def _run(self, limit: EndpointLimit, call: Callable[[], Any]) -> Any:
+        try:
+            async with limit.slots:
+                limit.running += 1
+                started = time.perf_counter()
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(self._pool, call)
+                finally:
+                    limit.running -= 1
+                    limit.average_seconds = 0.8 * limit.average_seconds + 0.2 * (time.perf_counter() - started)
+        finally:
+            limit.admitted -= 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                endpoint: {
+                    "running": limit.running,
+                    "waiting": limit.admitted - limit.running,
+                    "concurrency": limit.concurrency,
+                    "queue": limit.queue,
+                    "rejected": limit.rejected,
+                    "average_seconds": round(limit.average_seconds, 2),
+                }
+                for endpoint, limit in self._limits.items()
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+agent_executor = AgentExecutor()
@@ -0,0 +1,130 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .intents import CLUBS, RECOMMEND, SEARCH, TRENDING, Intent
+from .tools.databasetool import DatabaseTool
+
+
+# Direct answers for queries the intent classifier is sure about: one
+# DatabaseTool read and a templated reply instead of an LLM crew. Every
+# handler returns None when it cannot answer, and the query then goes to the
+# crew as before.
+
+MAX_ITEMS = 5
+
+_database = DatabaseTool()
+
+
+def _read(operation: str, parameters: Dict[str, Any]) -> Any:
+    result = json.loads(_database._run(operation, parameters))
+    if isinstance(result, dict) and "error" in result:
+        return None
+    return result
+
+
+def _when(value: str) -> str:
+    return datetime.fromisoformat(value).strftime("%a %d %b %Y at %H:%M")
+
+
+def _event_line(event: Dict[str, Any]) -> str:
+    line = f"{event['title']} by {event['club_name']} on {_when(event['date'])}"
+    if event.get("location"):
+        line += f" ({event['location']})"
+    return line
+
+
+def _join(lines: List[str]) -> str:
+    return "\n".join(f"- {line}" for line in lines)
+
+
+def _in_period(event: Dict[str, Any], slots: Dict[str, Any]) -> bool:
+    date = datetime.fromisoformat(event["date"])
+    return ((slots["date_from"] is None or date >= slots["date_from"])
+            and (slots["date_to"] is None or date <= slots["date_to"]))
+
+
+def search(intent: Intent, context: Dict[str, Any]) -> Optional[str]:
+    slots = intent.slots
+    filters = {
+        name: value.isoformat() if isinstance(value, datetime) else value
+        for name, value in (
+            ("event_type", slots["event_type"]),
+            ("date_from", slots["date_from"]),
+            ("date_to", slots["date_to"]),
+        )
+        if value is not None
+    }
+    if slots["terms"]:
+        events = _read("search_events", {"query": " ".join(slots["terms"]), "filters": filters})
+    else:
+        events = _read("get_events", dict(filters, limit=MAX_ITEMS))
+    if events is None:
+        return None
+
+    kind = f"{slots['event_type']}s" if slots["event_type"] else "events"
+    about = f" about \"{' '.join(slots['terms'])}\"" if slots["terms"] else ""
+    period = f" {slots['period']}" if slots["period"] else ""
+    if not events:
+        return f"I couldn't find any upcoming {kind}{about}{period}. Try a broader search or another date range."
+    shown = events[:MAX_ITEMS]
+    return (f"Here {'is' if len(shown) == 1 else 'are'} {len(shown)} upcoming {kind}{about}{period}:\n"
+            f"{_join([_event_line(event) for event in shown])}")
+
+
+def trending(intent: Intent, context: Dict[str, Any]) -> Optional[str]:
+    events = _read("get_trending_events", {"limit": MAX_ITEMS})
+    if events is None:
+        return None
+    if not events:
+        return "Nothing is trending right now. Check back once registrations pick up."
+    lines = [
+        f"{_event_line(event)}, {event['registration_count']} registered"
+        + (" (full)" if event["is_full"] else "")
+        for event in events
+    ]
+    return f"These events are trending right now:\n{_join(lines)}"
+
+
+def recommend(intent: Intent, context: Dict[str, Any]) -> Optional[str]:
+    student_id = context.get("student_id")
+    if student_id is None:
+        return None
+    recommendations = _read("get_recommendations", {"student_id": student_id})
+    if recommendations is None:
+        return None
+    recommendations = [item for item in recommendations if _in_period(item, intent.slots)]
+    if not recommendations:
+        return "I don't have any event suggestions for you right now. Adding skills to your profile helps."
+    lines = []
+    for item in recommendations[:MAX_ITEMS]:
+        reasons = ", ".join(item["reasons"][:2])
+        lines.append(f"{_event_line(item)}: {reasons[:1].lower()}{reasons[1:]}")
+    return f"Based on your profile, I'd suggest:\n{_join(lines)}"
+
+
+def clubs(intent: Intent, context: Dict[str, Any]) -> Optional[str]:
+    result = _read("get_all_clubs", {"limit": MAX_ITEMS * 2})
+    if result is None:
+        return None
+    if not result["items"]:
+        return "There are no clubs yet."
+    lines = [f"{club['name']} ({club['member_count']} members)" for club in result["items"]]
+    more = "\nAsk about any of them for details." if result["next_cursor"] is None else \
+        "\nThere are more clubs; ask about a topic to narrow it down."
+    return f"Here are clubs you can join:\n{_join(lines)}{more}"
+
+
+HANDLERS = {
+    SEARCH: search,
+    TRENDING: trending,
+    RECOMMEND: recommend,
+    CLUBS: clubs,
+}
+
+
+def answer(intent: Intent, context: Dict[str, Any]) -> Optional[str]:
+    """Reply for a confident intent, None to fall back to the crew"""
+    if not intent.confident:
+        return None
+    return HANDLERS[intent.name](intent, context)
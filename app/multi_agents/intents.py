@@ -0,0 +1,223 @@
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Local intent classifier for /agents/query: keyword rules blended with a
+# multinomial Naive Bayes model trained at import on the examples below. No
+# network calls; a query is classified in well under a millisecond.
+
+SEARCH = "search_events"
+TRENDING = "trending_events"
+RECOMMEND = "recommendations"
+CLUBS = "list_clubs"
+OTHER = "other"
+
+# Below this the query goes to the LLM crew
+INTENT_CONFIDENCE = float(os.getenv("INTENT_CONFIDENCE", 0.7))
+
+TRAINING_EXAMPLES = {
+    SEARCH: [
+        "show me ai workshops this week",
+        "find hackathons next month",
+        "are there any python events",
+        "search for robotics competitions",
+        "what workshops are coming up",
+        "any social events this weekend",
+        "list upcoming events about machine learning",
+        "i am looking for a data science workshop",
+        "events about startups tomorrow",
+        "find me a coding competition",
+        "upcoming music events",
+        "which events are about design",
+        "show events for web development",
+        "is there a hackathon this weekend",
+    ],
+    TRENDING: [
+        "what is trending",
+        "whats trending on campus",
+        "show me trending events",
+        "most popular events right now",
+        "which events are hot this week",
+        "what are people signing up for",
+        "popular events",
+        "what events are everyone going to",
+        "top events on campus",
+    ],
+    RECOMMEND: [
+        "recommend me some events",
+        "what should i attend",
+        "suggest events for me",
+        "events that match my skills",
+        "what would you recommend",
+        "give me recommendations",
+        "which events fit my profile",
+        "personalized suggestions please",
+        "what events are good for me",
+    ],
+    CLUBS: [
+        "list all clubs",
+        "what clubs are there",
+        "show me the clubs",
+        "which clubs can i join",
+        "clubs on campus",
+        "what student clubs exist",
+    ],
+    OTHER: [
+        "hello",
+        "how do i join the robotics club and what should i prepare",
+        "can you help me plan my semester",
+        "what is the difference between the ai club and the data club",
+        "how do i update my password",
+        "tell me about yourself",
+        "why was my registration cancelled",
+        "i feel overwhelmed with exams any advice",
+        "who is the president of the chess club",
+        "how can i start my own club",
+        "thanks",
+        "what time does the library close",
+    ],
+}
+
+# Phrases that pin an intent on their own
+RULES = {
+    SEARCH: re.compile(r"\b(find|search|look(ing)? for|show( me)?|any|(are|is) there|upcoming|coming up)\b.*\b(events?|workshops?|hackathons?|competitions?|meetups?|talks?|socials?)\b"),
+    TRENDING: re.compile(r"\b(trending|popular|hot|hype|everyone is going|most (viewed|registered))\b"),
+    RECOMMEND: re.compile(r"\b(recommend\w*|suggest\w*|for me|should i (attend|go|join)|match(es)? my|fit my|my (skills|profile|interests))\b"),
+    CLUBS: re.compile(r"\b(list|show|what|which|all)\b.*\bclubs\b(?!.*\b(events?|workshops?)\b)"),
+}
+# Signs that the query needs real reasoning, whatever the keywords say
+COMPLEX = re.compile(r"\b(how (do|can|should)|why|difference|compare|explain|plan|advice|help me)\b")
+# Questions about the student's own registrations or activity; the fast path
+# only knows public listings, so these go to the crew
+PERSONAL = re.compile(
+    r"\b(i|ive|i have|im|i am|i was) (registered|signed up|sign up|enrolled|attending|attended|going to|booked)\b"
+    r"|\bmy (events|registrations?|schedule|calendar|bookings?|clubs|waitlist)\b"
+)
+
+EVENT_TYPES = {
+    "workshop": "workshop", "workshops": "workshop",
+    "hackathon": "hackathon", "hackathons": "hackathon",
+    "competition": "competition", "competitions": "competition", "contest": "competition",
+    "social": "social", "socials": "social", "party": "social", "meetup": "social", "meetups": "social",
+}
+
+STOPWORDS = set("""
+a an the and or of for in on at to me my i is are there any some what which show find search
+looking look events event upcoming coming up happening please can you about with that this next
+week weekend today tomorrow month tonight list all give get want would like see new
+where when who how could learn go join attend something anything am do does should
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+
+def tokenize(text: str) -> List[str]:
+    words = _TOKEN.findall(text.lower())
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+class NaiveBayes:
+    """Multinomial Naive Bayes over words and bigrams, Laplace smoothed"""
+
+    def __init__(self, examples: Dict[str, List[str]]):
+        self.labels = list(examples)
+        self.counts = {label: Counter() for label in self.labels}
+        for label, texts in examples.items():
+            for text in texts:
+                self.counts[label].update(tokenize(text))
+        self.vocabulary = set().union(*self.counts.values())
+        total = sum(len(texts) for texts in examples.values())
+        self.log_prior = {label: math.log(len(examples[label]) / total) for label in self.labels}
+        self.totals = {label: sum(counts.values()) for label, counts in self.counts.items()}
+
+    def posterior(self, text: str) -> Dict[str, float]:
+        tokens = [token for token in tokenize(text) if token in self.vocabulary]
+        size = len(self.vocabulary)
+        scores = {
+            label: self.log_prior[label] + sum(
+                math.log((self.counts[label][token] + 1) / (self.totals[label] + size)) for token in tokens
+            )
+            for label in self.labels
+        }
+        top = max(scores.values())
+        exp = {label: math.exp(score - top) for label, score in scores.items()}
+        norm = sum(exp.values())
+        return {label: value / norm for label, value in exp.items()}
+
+
+_model = NaiveBayes(TRAINING_EXAMPLES)
+
+
+@dataclass
+class Intent:
+    name: str
+    confidence: float
+    slots: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def confident(self) -> bool:
+        return self.name != OTHER and self.confidence >= INTENT_CONFIDENCE
+
+
+def classify(query: str, now: Optional[datetime] = None) -> Intent:
+    text = query.lower().replace("'", "").strip()
+    posterior = _model.posterior(text)
+    fired = [label for label, rule in RULES.items() if rule.search(text)]
+
+    # rules and model vote, a lone rule hit counts for 0.4
+    scores = {label: 0.6 * p + (0.4 / len(fired) if label in fired else 0.0) for label, p in posterior.items()}
+    if COMPLEX.search(text):
+        scores[OTHER] += 0.5
+    if PERSONAL.search(text):
+        scores[OTHER] += 1.0
+    name, confidence = max(scores.items(), key=lambda item: item[1])
+    return Intent(name, round(min(confidence, 1.0), 3), extract_slots(text, now or datetime.utcnow()))
+
+
+def date_range(text: str, now: datetime) -> Tuple[Optional[datetime], Optional[datetime], Optional[str]]:
+    """(date_from, date_to, phrase) for the first relative date phrase in ``text``"""
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    end_of = lambda day: day + timedelta(days=1) - timedelta(microseconds=1)
+    if "today" in text or "tonight" in text:
+        return now, end_of(today), "today"
+    if "tomorrow" in text:
+        day = today + timedelta(days=1)
+        return day, end_of(day), "tomorrow"
+    if "weekend" in text:
+        saturday = today + timedelta(days=(5 - today.weekday()) % 7)
+        return max(now, saturday), end_of(saturday + timedelta(days=1)), "this weekend"
+    if "next week" in text:
+        monday = today + timedelta(days=7 - today.weekday())
+        return monday, end_of(monday + timedelta(days=6)), "next week"
+    if "this week" in text:
+        return now, end_of(today + timedelta(days=6 - today.weekday())), "this week"
+    if "next month" in text:
+        first = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+        return first, end_of((first + timedelta(days=32)).replace(day=1) - timedelta(days=1)), "next month"
+    if "this month" in text:
+        last = (today.replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        return now, end_of(last), "this month"
+    return None, None, None
+
+
+def extract_slots(text: str, now: datetime) -> Dict[str, Any]:
+    words = _TOKEN.findall(text)
+    date_from, date_to, period = date_range(text, now)
+    event_type = next((EVENT_TYPES[word] for word in words if word in EVENT_TYPES), None)
+    intent_words = {"trending", "popular", "hot", "recommend", "suggest", "clubs", "club"}
+    terms = [
+        word for word in words
+        if word not in STOPWORDS and word not in EVENT_TYPES and word not in intent_words
+    ]
+    return {
+        "terms": terms,
+        "event_type": event_type,
+        "date_from": date_from,
+        "date_to": date_to,
+        "period": period,
+    }
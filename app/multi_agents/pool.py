@@ -0,0 +1,61 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class AgentPool:
+    """LRU pool of agents built on demand, each kept at most ``ttl_seconds``.
+
+    Holds at most ``max_size`` agents however many keys are ever requested.
+    Agents are built outside the lock; when two threads race for the same
+    key the first one stored wins and the other copy is dropped.
+    """
+
+    def __init__(self, factory: Callable[..., Any], max_size: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None):
+        if max_size is None:
+            max_size = int(os.getenv("CHATBOT_POOL_SIZE", 256))
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("CHATBOT_POOL_TTL", 1800))
+        self.factory = factory
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._agents: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._stats = {"hits": 0, "builds": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, *key) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._agents.get(key)
+            if entry is not None and entry[0] >= now:
+                self._agents.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[1]
+            if entry is not None:
+                del self._agents[key]
+                self._stats["expirations"] += 1
+
+        agent = self.factory(*key)
+        with self._lock:
+            entry = self._agents.setdefault(key, (now + self.ttl_seconds, agent))
+            self._agents.move_to_end(key)
+            self._stats["builds"] += 1
+            while len(self._agents) > self.max_size:
+                self._agents.popitem(last=False)
+                self._stats["evictions"] += 1
+            return entry[1]
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def clear(self):
+        with self._lock:
+            self._agents.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, size=len(self._agents), max_size=self.max_size)
@@ -0,0 +1,22 @@
+import threading
+from .crew import ClubEventHubCrew
+
+
+# One ClubEventHubCrew per process, shared by every agents router. Built by
+# warm() at startup, or by the first request if that failed.
+
+_lock = threading.Lock()
+_crew = None
+
+
+def get_crew() -> ClubEventHubCrew:
+    global _crew
+    if _crew is None:
+        with _lock:
+            if _crew is None:
+                _crew = ClubEventHubCrew()
+    return _crew
+
+
+def warm() -> ClubEventHubCrew:
+    return get_crew()
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from crewai.events import (
+    AgentExecutionStartedEvent,
+    LLMStreamChunkEvent,
+    ToolUsageErrorEvent,
+    ToolUsageFinishedEvent,
+    ToolUsageStartedEvent,
+    crewai_event_bus,
+)
+
+
+# Bridges crewAI's process-wide event bus to one asyncio queue per streamed
+# run. Every crew run works on its own agent copy (see ClubEventHubCrew), so
+# the copy's id tells which stream an event belongs to.
+
+# keep proxies from buffering the stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+_lock = threading.Lock()
+_streams: Dict[str, "RunStream"] = {}
+_installed = False
+
+
+class RunCancelled(Exception):
+    """The client went away; raised from the step callback, so the run stops
+    once the step in progress (an LLM call and the tool it asked for) ends.
+    crewAI retries a task that raises, so the watched agents' retry limit is
+    dropped to 0 first; runs that are not cancelled keep their retries."""
+
+
+class RunStream:
+    """Tokens and agent/tool steps of one crew run, read from the event loop"""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue" = asyncio.Queue()
+        self.cancelled = threading.Event()
+        self._agent_ids = set()
+        self._agents = []
+        _install()
+
+    def watch(self, agent):
+        """Route ``agent``'s events here and stream its LLM output"""
+        agent_id = str(agent.id)
+        with _lock:
+            _streams[agent_id] = self
+        self._agent_ids.add(agent_id)
+        self._agents.append(agent)
+        agent.llm.stream = True
+        agent.step_callback = self._check_cancelled
+
+    def push(self, event: str, data: Dict[str, Any]):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, (event, data))
+
+    def close(self):
+        self.cancelled.set()
+        with _lock:
+            for agent_id in self._agent_ids:
+                _streams.pop(agent_id, None)
+
+    def _check_cancelled(self, _step):
+        if self.cancelled.is_set():
+            # a retry would start the cancelled run over instead of ending it
+            for agent in self._agents:
+                agent.max_retry_limit = 0
+            raise RunCancelled()
+
+
+def _stream_for(event) -> Optional[RunStream]:
+    with _lock:
+        return _streams.get(str(event.agent_id)) if event.agent_id else None
+
+
+def _install():
+    global _installed
+    with _lock:
+        if _installed:
+            return
+        _installed = True
+
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def on_chunk(source, event):
+        stream = _stream_for(event)
+        if stream is not None and event.chunk:
+            stream.push("token", {"text": event.chunk})
+
+    @crewai_event_bus.on(AgentExecutionStartedEvent)
+    def on_agent_started(source, event):
+        stream = _stream_for(event)
+        if stream is not None:
+            stream.push("step", {"type": "agent_started", "agent": event.agent_role})
+
+    @crewai_event_bus.on(ToolUsageStartedEvent)
+    def on_tool_started(source, event):
+        stream = _stream_for(event)
+        if stream is not None:
+            stream.push("step", {"type": "tool_started", "tool": event.tool_name, "args": event.tool_args})
+
+    @crewai_event_bus.on(ToolUsageFinishedEvent)
+    def on_tool_finished(source, event):
+        stream = _stream_for(event)
+        if stream is not None:
+            stream.push("step", {"type": "tool_finished", "tool": event.tool_name})
+
+    @crewai_event_bus.on(ToolUsageErrorEvent)
+    def on_tool_error(source, event):
+        stream = _stream_for(event)
+        if stream is not None:
+            stream.push("step", {"type": "tool_error", "tool": event.tool_name})
+
+
+def sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def final_only(data: Dict[str, Any]) -> AsyncIterator[str]:
+    yield sse("final", data)
+
+
+async def sse_events(stream: RunStream, run: "asyncio.Task", final: Callable[[Any], Dict[str, Any]]) -> AsyncIterator[str]:
+    """Server-sent events of ``run``: its steps and tokens as they come, then
+    "final" with ``final(result)`` or "error".
+
+    If the client disconnects the run is cancelled once its current step
+    (LLM call and tool) finishes, and it keeps its executor slot until then.
+    """
+    # an abandoned run's exception is nobody's to report
+    run.add_done_callback(lambda task: task.cancelled() or task.exception())
+    getter = None
+    try:
+        while True:
+            getter = asyncio.ensure_future(stream.queue.get())
+            done, _ = await asyncio.wait({getter, run}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield sse(*getter.result())
+                continue
+            getter.cancel()
+            while not stream.queue.empty():
+                yield sse(*stream.queue.get_nowait())
+            if run.exception() is not None:
+                yield sse("error", {"detail": str(run.exception())})
+            else:
+                yield sse("final", final(run.result()))
+            return
+    finally:
+        if getter is not None:
+            getter.cancel()
+        stream.close()
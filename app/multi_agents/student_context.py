@@ -0,0 +1,104 @@
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from services import tool_cache
+from .tools.databasetool import DatabaseTool
+
+
+# Compact student context for the recommendation, onboarding and digest
+# tasks. The agents used to spend their first LLM turns calling get_student,
+# get_recommendations and get_trending_events one after the other; the crew
+# now runs the three reads as one DatabaseTool batch before kickoff (in
+# parallel on one snapshot on Postgres) and puts the result in the task
+# description. The rendered context is kept in tool_cache with the row tags
+# of the three reads, so kickoffs for the same student reuse it until one of
+# those rows changes.
+
+CANDIDATE_EVENTS = int(os.getenv("STUDENT_CONTEXT_EVENTS", 8))
+TRENDING_EVENTS = 5
+
+
+def _tags(student_id: int):
+    return [("student", student_id), ("event", None), ("club", None), ("skill", None)]
+
+_database = DatabaseTool()
+logger = logging.getLogger(__name__)
+
+
+def _when(value: str) -> str:
+    return datetime.fromisoformat(value).strftime("%a %d %b %Y")
+
+
+def _event_line(event: Dict[str, Any]) -> str:
+    event_id = event.get("id", event.get("item_id"))
+    return f"- [{event_id}] {event['title']} by {event['club_name']}, {_when(event['date'])}"
+
+
+def fetch(student_id: int) -> Optional[Dict[str, Any]]:
+    """Profile, top candidate events and trending events of a student, None
+    when there is no such student"""
+    operations = [
+        {"operation": "get_student", "parameters": {"student_id": student_id}, "key": "student"},
+        {"operation": "get_recommendations", "parameters": {"student_id": student_id}, "key": "candidates"},
+        {"operation": "get_trending_events", "parameters": {"limit": TRENDING_EVENTS}, "key": "trending"},
+    ]
+    results = json.loads(_database._run("batch", {"operations": operations}))["results"]
+    if "error" in results["student"]:
+        return None
+    return {
+        key: [] if isinstance(value, dict) and "error" in value else value
+        for key, value in results.items()
+    }
+
+
+def render(bundle: Dict[str, Any]) -> str:
+    student = bundle["student"]
+    profile = student["profile"]
+    lines = [f"Student: {student['name']} (id {student['id']})"]
+    if student["field_of_study"] or student["year_level"]:
+        year = f", year {student['year_level']}" if student["year_level"] else ""
+        lines.append(f"Studies: {student['field_of_study'] or 'unknown field'}{year}")
+    if profile["bio"]:
+        lines.append(f"Bio: {profile['bio']}")
+    if profile["goals"]:
+        lines.append(f"Goals: {profile['goals']}")
+    lines.append(f"Skills: {', '.join(skill['name'] for skill in student['skills']) or 'none listed'}")
+    lines.append(f"Clubs: {', '.join(club['name'] for club in student['clubs']) or 'none yet'}")
+    lines.append(f"Registered events: {student['registered_events_count']}")
+
+    candidates: List[Dict[str, Any]] = bundle["candidates"][:CANDIDATE_EVENTS]
+    lines.append("Top candidate events (match score: reasons):")
+    lines.extend([
+        f"{_event_line(event)}, {event['score']}: {'; '.join(event['reasons'])}" for event in candidates
+    ] or ["- none"])
+    lines.append("Trending events:")
+    lines.extend([
+        f"{_event_line(event)}, {event['registration_count']} registered" for event in bundle["trending"]
+    ] or ["- none"])
+    return "\n".join(lines)
+
+
+def build(student_id) -> Optional[str]:
+    """Rendered context of ``student_id``, None when it can't be built and
+    the agent has to look the student up itself"""
+    try:
+        student_id = int(student_id)
+        key = tool_cache.key("student_context", {"student_id": student_id})
+        cached = tool_cache.get(key)
+        if cached is not None:
+            return cached
+        generation = tool_cache.generation
+        bundle = fetch(student_id)
+    except Exception as e:
+        # a bad id, a batch that came back as {"error": ...} (no "results"),
+        # or the snapshot setup failing on Postgres
+        logger.warning(f"Student context for {student_id!r} not built: {e!r}")
+        return None
+    if bundle is None:
+        return None
+    context = render(bundle)
+    tool_cache.put(key, context, _tags(student_id), generation)
+    return context
@@ -1,12 +1,29 @@
 from crewai import Task
 
-def create_club_info_task(agent, club_id: str, student_question: str) -> Task:
+def create_club_info_task(agent, club_id: str, student_question: str, club_context: str = None,
+                          club_passages: list = None) -> Task:
   
+    facts = ""
+    if club_context:
+        facts = f"""
+Club facts, current as of now:
+{club_context}
+"""
+        if club_passages:
+            passages = "\n".join(f"- {passage}" for passage in club_passages)
+            facts += f"""
+Passages from the club's texts and event descriptions relevant to the question:
+{passages}
+"""
+        facts += """
+Answer from these facts. If they do not cover the question, say what you don't know
+and point the student to the club's contact.
+"""
     return Task(
         description=f"""Answer the following question about Club {club_id}:
 
 Question: {student_question}
-
+{facts}
 Respond concisely and directly based on the question. 
 Only include detailed information (such as history, mission, members, events, joining requirements, or resources) **if the user specifically asks for it** or if it is clearly relevant to the question.
 
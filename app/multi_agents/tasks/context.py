@@ -0,0 +1,11 @@
+def student_context_block(student_context: str = None) -> str:
+    """Prefetched student context for a task description, empty when there is none"""
+    if not student_context:
+        return ""
+    return f"""
+Student context, current as of now (profile, candidate events from the
+recommendation engine, trending events):
+{student_context}
+
+Build on this context; only call tools for details it does not cover.
+"""
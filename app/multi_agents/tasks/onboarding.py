@@ -1,9 +1,11 @@
 from crewai import Task
 
-def create_onboarding_task(agent, student_id: str) -> Task:
+from .context import student_context_block
+
+def create_onboarding_task(agent, student_id: str, student_context: str = None) -> Task:
     return Task(
         description=f"""Guide student {student_id} through the onboarding process.
-        
+        {student_context_block(student_context)}
         Steps:
         1. Welcome the student warmly
         2. Ask quick questionnaire about:
@@ -1,9 +1,11 @@
 from crewai import Task
 
-def create_personalized_recommendations_task(agent, student_id: str) -> Task:
+from .context import student_context_block
+
+def create_personalized_recommendations_task(agent, student_id: str, student_context: str = None) -> Task:
     return Task(
         description=f"""Generate personalized recommendations for student {student_id}.
-        
+        {student_context_block(student_context)}
         Steps:
         1. Retrieve student profile (interests, skills, field of study, year)
         2. Analyze platform activity (viewed events, registered events)
@@ -39,10 +41,10 @@ def create_personalized_recommendations_task(agent, student_id: str) -> Task:
         expected_output="JSON object with a list of personalized recommendations"
     )
 
-def create_weekly_digest_task(agent, student_id: str) -> Task:
+def create_weekly_digest_task(agent, student_id: str, student_context: str = None) -> Task:
     return Task(
         description=f"""Create a weekly personalized digest for student {student_id}.
-        
+        {student_context_block(student_context)}
         Include:
         1. Top 5 recommended events this week
         2. New clubs that match their interests
@@ -86,4 +88,22 @@ def create_weekly_digest_task(agent, student_id: str) -> Task:
         }}""",
         agent=agent,
         expected_output="JSON object with a structured weekly digest"
-    )
\ No newline at end of file
+    )
+
+def create_recommendation_explanation_task(agent, student_id: str, recommendations: list) -> Task:
+    events = "\n".join(
+        f"- {item['title']} by {item['club_name']} on {item['date']}, score {item['score']}: {'; '.join(item['reasons'])}"
+        for item in recommendations
+    )
+    return Task(
+        description=f"""Explain to student {student_id} why these events were recommended to them.
+        
+        The recommendations are final, they come from the scoring engine, best first:
+{events}
+        
+        For each event write one or two friendly sentences connecting it to the student's
+        skills, clubs and goals (look up the student profile if you need it). Do not add,
+        drop or reorder events and do not change the scores.""",
+        agent=agent,
+        expected_output="A short personalized explanation for each recommended event, in the given order"
+    )
@@ -0,0 +1,210 @@
+from crewai.tools import BaseTool
+from typing import Type, Dict, Any, List, Literal, Optional
+from datetime import date, datetime, time
+from pydantic import BaseModel, ConfigDict, Field
+from .databasetool import DatabaseTool
+
+
+# Focused tools handed to each agent instead of the whole DatabaseTool catalog.
+# Each one wraps a single operation behind a strict schema: the model sees a
+# one-line description and typed arguments, and an unknown or misspelled
+# argument is rejected before any query runs. All of them share the
+# DatabaseTool read cache and write invalidation.
+
+_database = DatabaseTool()
+
+
+def _clean(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        name: value.isoformat() if isinstance(value, date) else value
+        for name, value in parameters.items() if value is not None
+    }
+
+
+def _end_of_day(value: Optional[date]) -> Optional[datetime]:
+    # the queries compare date_to against event datetimes: a bare date would
+    # mean midnight and drop that day's events
+    return datetime.combine(value, time.max) if value is not None else None
+
+
+def _query(operation: str, **parameters) -> str:
+    return _database._run(operation, _clean(parameters))
+
+
+class StrictInput(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+
+class StudentInput(StrictInput):
+    student_id: int = Field(..., description="Student id")
+
+
+class StudentProfileTool(BaseTool):
+    name: str = "get_student_profile"
+    description: str = "Profile of a student: field of study, year, skills, clubs, bio and goals."
+    args_schema: Type[BaseModel] = StudentInput
+
+    def _run(self, student_id: int) -> str:
+        return _query("get_student", student_id=student_id)
+
+
+class ClubInput(StrictInput):
+    club_id: Optional[int] = Field(None, description="Club id")
+    club_name: Optional[str] = Field(None, description="Club name, used when the id is unknown")
+    question: Optional[str] = Field(None, description="The student's question, to get only the relevant passages of the club's texts")
+
+
+class ClubInfoTool(BaseTool):
+    name: str = "get_club_info"
+    description: str = "Details of one club (mission, history, contact, member count) and its next 10 events."
+    args_schema: Type[BaseModel] = ClubInput
+
+    def _run(self, club_id: Optional[int] = None, club_name: Optional[str] = None, question: Optional[str] = None) -> str:
+        return _query("get_club", club_id=club_id, club_name=club_name, question=question)
+
+
+class ClubMembersInput(StrictInput):
+    club_id: int = Field(..., description="Club id")
+
+
+class ClubMembersTool(BaseTool):
+    name: str = "get_club_members"
+    description: str = "Members of a club with their field of study and year."
+    args_schema: Type[BaseModel] = ClubMembersInput
+
+    def _run(self, club_id: int) -> str:
+        return _query("get_club_members", club_id=club_id)
+
+
+class EventFilters(StrictInput):
+    club_id: Optional[int] = Field(None, description="Only this club's events")
+    event_type: Optional[str] = Field(None, description="workshop, hackathon, social, competition...")
+    date_from: Optional[date] = Field(None, description="Earliest date, YYYY-MM-DD")
+    date_to: Optional[date] = Field(None, description="Latest date, included, YYYY-MM-DD")
+
+
+class SearchEventsInput(EventFilters):
+    query: str = Field(..., description="Free-text search, e.g. 'AI workshop'")
+
+
+class SearchEventsTool(BaseTool):
+    name: str = "search_events"
+    description: str = "Full-text search over upcoming events, best match first."
+    args_schema: Type[BaseModel] = SearchEventsInput
+
+    def _run(self, query: str, club_id: Optional[int] = None, event_type: Optional[str] = None,
+             date_from: Optional[date] = None, date_to: Optional[date] = None) -> str:
+        filters = _clean(dict(club_id=club_id, event_type=event_type, date_from=date_from,
+                              date_to=_end_of_day(date_to)))
+        return _query("search_events", query=query, filters=filters)
+
+
+class ListEventsInput(EventFilters):
+    include_past: bool = Field(False, description="Also list events that already happened")
+    limit: int = Field(20, ge=1, le=50)
+
+
+class ListEventsTool(BaseTool):
+    name: str = "list_events"
+    description: str = "Upcoming events in date order, optionally filtered by club, type or dates."
+    args_schema: Type[BaseModel] = ListEventsInput
+
+    def _run(self, club_id: Optional[int] = None, event_type: Optional[str] = None,
+             date_from: Optional[date] = None, date_to: Optional[date] = None,
+             include_past: bool = False, limit: int = 20) -> str:
+        return _query("get_events", club_id=club_id, event_type=event_type, date_from=date_from,
+                      date_to=_end_of_day(date_to), include_past=include_past, limit=limit)
+
+
+class TrendingInput(StrictInput):
+    limit: int = Field(10, ge=1, le=20)
+
+
+class TrendingEventsTool(BaseTool):
+    name: str = "get_trending_events"
+    description: str = "Upcoming events with the most recent views and registrations."
+    args_schema: Type[BaseModel] = TrendingInput
+
+    def _run(self, limit: int = 10) -> str:
+        return _query("get_trending_events", limit=limit)
+
+
+class RecommendTool(BaseTool):
+    name: str = "recommend_events"
+    description: str = "Top upcoming events for a student, scored on skills, clubs and trends, with reasons."
+    args_schema: Type[BaseModel] = StudentInput
+
+    def _run(self, student_id: int) -> str:
+        return _query("get_recommendations", student_id=student_id)
+
+
+class SimilarStudentsInput(StudentInput):
+    mode: Literal["exact", "approximate"] = "exact"
+
+
+class SimilarStudentsTool(BaseTool):
+    name: str = "find_similar_students"
+    description: str = "Students sharing the most skills with a student."
+    args_schema: Type[BaseModel] = SimilarStudentsInput
+
+    def _run(self, student_id: int, mode: str = "exact") -> str:
+        return _query("get_similar_students", student_id=student_id, mode=mode)
+
+
+class ListPageInput(StrictInput):
+    limit: int = Field(50, ge=1, le=200)
+    cursor: Optional[str] = Field(None, description="next_cursor of the previous page")
+
+
+class ListClubsTool(BaseTool):
+    name: str = "list_clubs"
+    description: str = "One page of clubs with member counts; pass next_cursor back for more."
+    args_schema: Type[BaseModel] = ListPageInput
+
+    def _run(self, limit: int = 50, cursor: Optional[str] = None) -> str:
+        return _query("get_all_clubs", limit=limit, cursor=cursor)
+
+
+class NoInput(StrictInput):
+    pass
+
+
+class ListSkillsTool(BaseTool):
+    name: str = "list_skills"
+    description: str = "Every skill name students can add to their profile."
+    args_schema: Type[BaseModel] = NoInput
+
+    def _run(self) -> str:
+        return _query("get_all_skills")
+
+
+class UpdateProfileInput(StudentInput):
+    bio: Optional[str] = None
+    goals: Optional[str] = None
+    field_of_study: Optional[str] = None
+    year_level: Optional[int] = None
+    skills: Optional[List[str]] = Field(None, description="Full list of skill names, replaces the current skills")
+    notification_preferences: Optional[Dict[str, Any]] = None
+
+
+class UpdateProfileTool(BaseTool):
+    name: str = "update_student_profile"
+    description: str = "Update a student's profile; only the fields given are changed."
+    args_schema: Type[BaseModel] = UpdateProfileInput
+
+    def _run(self, student_id: int, **fields) -> str:
+        return _query("update_profile", student_id=student_id, **fields)
+
+
+class RegisterInput(StudentInput):
+    event_id: int = Field(..., description="Event id")
+    waitlist: bool = Field(False, description="Join the waitlist if the event is full")
+
+
+class RegisterEventTool(BaseTool):
+    name: str = "register_for_event"
+    description: str = "Register a student for an upcoming event."
+    args_schema: Type[BaseModel] = RegisterInput
+
+    def _run(self, student_id: int, event_id: int, waitlist: bool = False) -> str:
+        return _query("register_event", student_id=student_id, event_id=event_id, waitlist=waitlist)
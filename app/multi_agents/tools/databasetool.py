@@ -1,13 +1,50 @@
 from crewai.tools import BaseTool
-from typing import Type, Dict, Any
+from typing import Type, Dict, Any, Optional
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, or_, desc, func, select, exists, text
 from models import (
-    get_session, Student, StudentProfile, Club, Event, Skill
+    get_session, Student, StudentProfile, Club, Event, Skill,
+    student_skills, event_registrations, club_members
 )
+from services import (
+    similarity_index, trending_leaderboard, search_events,
+    register_for_event, cancel_registration, tool_cache, club_knowledge, student_recommendations
+)
+from services.pagination import decode_cursor, page_size, keyset, count_of, page
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import json
+import re
+
+
+# Relationships each operation reads, loaded up front in a bounded number of
+# statements instead of one lazy load per row.
+EVENT_WITH_CLUB = (joinedload(Event.club),)
+EVENT_WITH_CLUB_AND_SKILLS = (joinedload(Event.club), selectinload(Event.required_skills))
+STUDENT_DETAILS = (joinedload(Student.profile), selectinload(Student.skills), selectinload(Student.clubs))
+
+# Read operations served through tool_cache, with the rows each result is built
+# from: (kind, id) for one row, (kind, None) for any row of that kind. Writers
+# call tool_cache.invalidate(kind, id) for the rows they change.
+CACHED_READS = {
+    "get_student": lambda p: [("student", p.get('student_id')), ("club", None), ("skill", None)],
+    "get_club": lambda p: [("club", p.get('club_id')), ("event", None)],
+    "get_events": lambda p: [("event", None), ("club", None), ("skill", None)],
+    "search_events": lambda p: [("event", None), ("club", None)],
+    "get_trending_events": lambda p: [("event", None), ("club", None)],
+    "get_recommendations": lambda p: [("student", p.get('student_id')), ("event", None), ("club", None), ("skill", None)],
+    "get_club_members": lambda p: [("club", p.get('club_id')), ("student", None)],
+    "get_similar_students": lambda p: [("student", None), ("skill", None)],
+    "get_all_students": lambda p: [("student", None)],
+    "get_all_clubs": lambda p: [("club", None)],
+    "get_all_skills": lambda p: [("skill", None)],
+}
+
+# batch: entries per call, and connections used at once on Postgres
+BATCH_MAX_OPERATIONS = 20
+BATCH_MAX_WORKERS = 4
+SNAPSHOT_ID = re.compile(r"^[0-9A-Fa-f-]+$")
 
 
 class DatabaseToolInput(BaseModel):
@@ -23,21 +60,54 @@ class DatabaseTool(BaseTool):
     
     Available operations:
     - get_student: Get student information by ID or email
-    - get_club: Get club information by ID or name
+    - get_club: Get club information by ID or name (question: only the relevant passages of its texts)
     - get_events: Get events with optional filters
     - search_events: Search events by query and filters
     - get_recommendations: Get personalized recommendations for a student
     - update_profile: Update student profile information
-    - register_event: Register a student for an event
+    - register_event: Register a student for an event (waitlist: true to queue when full)
+    - cancel_registration: Cancel a registration, the seat goes to the waitlist
     - get_trending_events: Get currently trending events
     - get_club_members: Get members of a specific club
-    - get_similar_students: Find students with similar skills
+    - get_similar_students: Find students with similar skills (mode: exact or approximate)
+    - get_all_students / get_all_clubs: One page of students or clubs (limit, cursor,
+      include_total); pass next_cursor back as cursor for the following page
+    - batch: Run several read operations in one call. parameters: {"operations": [
+      {"operation": ..., "parameters": {...}, "key": optional name}]}; returns
+      {"results": {key: result}}, key defaulting to the operation name
     """
     args_schema: Type[BaseModel] = DatabaseToolInput
 
     def _run(self, operation: str, parameters: Dict[str, Any]) -> str:
-        """Execute database operations"""
-        session = get_session()
+        """Execute database operations, reads through the cache"""
+        if operation == "batch":
+            return self._batch(parameters)
+        if operation not in CACHED_READS:
+            return self._execute(operation, parameters)
+        return self._read(operation, parameters)
+
+    def _read(self, operation: str, parameters: Dict[str, Any], session: Optional[Session] = None) -> str:
+        key = tool_cache.key(operation, parameters)
+        cached = tool_cache.get(key)
+        if cached is not None:
+            return cached
+        return self._read_and_store(operation, parameters, tool_cache.generation, session)
+
+    def _read_and_store(self, operation: str, parameters: Dict[str, Any], generation: int,
+                        session: Optional[Session] = None) -> str:
+        """Run a cached read against the database and store the result, never
+        answering from the cache (a batch must see its own snapshot).
+        ``generation`` is read before the transaction starts, so a write
+        committed after the snapshot keeps its result out of the cache."""
+        result = self._execute(operation, parameters, session)
+        if not result.startswith('{"error"'):
+            tool_cache.put(tool_cache.key(operation, parameters), result, CACHED_READS[operation](parameters), generation)
+        return result
+
+    def _execute(self, operation: str, parameters: Dict[str, Any], session: Optional[Session] = None) -> str:
+        owns_session = session is None
+        if owns_session:
+            session = get_session()
         try:
             if operation == "get_student":
                 return self._get_student(session, parameters)
@@ -53,6 +123,8 @@ class DatabaseTool(BaseTool):
                 return self._update_profile(session, parameters)
             elif operation == "register_event":
                 return self._register_event(session, parameters)
+            elif operation == "cancel_registration":
+                return self._cancel_registration(session, parameters)
             elif operation == "get_trending_events":
                 return self._get_trending_events(session, parameters)
             elif operation == "get_club_members":
@@ -67,6 +139,76 @@ class DatabaseTool(BaseTool):
                 return self._get_all_skills(session, parameters)
             else:
                 return json.dumps({"error": f"Unknown operation: {operation}"})
+        except Exception as e:
+            if not owns_session:
+                session.rollback()
+            return json.dumps({"error": str(e)})
+        finally:
+            if owns_session:
+                session.close()
+
+    def _batch(self, params: Dict) -> str:
+        """Run several read operations on one snapshot, results keyed by entry"""
+        entries = params.get('operations')
+        if not isinstance(entries, list) or not entries:
+            return json.dumps({"error": "operations must be a non-empty list"})
+        if len(entries) > BATCH_MAX_OPERATIONS:
+            return json.dumps({"error": f"A batch runs at most {BATCH_MAX_OPERATIONS} operations"})
+        
+        planned = []
+        for index, entry in enumerate(entries):
+            entry = entry if isinstance(entry, dict) else {}
+            key = base = entry.get('key') or entry.get('operation') or f"operation_{index}"
+            suffix = index
+            while any(key == other for other, _, _ in planned) or any(
+                key == other.get('key') for other in entries[index + 1:] if isinstance(other, dict)
+            ):
+                key = f"{base}_{suffix}"
+                suffix += 1
+            planned.append((key, entry.get('operation'), entry.get('parameters') or {}))
+        
+        results = {
+            key: {"error": f"Only read operations can be batched, not {operation}"}
+            for key, operation, _ in planned if operation not in CACHED_READS
+        }
+        reads = [item for item in planned if item[1] in CACHED_READS]
+        
+        # Reads run against the database, not tool_cache: a cached result may
+        # come from a different point in time than the rest of the batch
+        generation = tool_cache.generation
+        session = get_session()
+        try:
+            if session.get_bind().dialect.name == "postgresql":
+                session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            if len(reads) > 1 and session.get_bind().dialect.name == "postgresql":
+                # Each worker joins this transaction's snapshot on its own connection
+                snapshot = session.scalar(text("SELECT pg_export_snapshot()"))
+                with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(reads))) as pool:
+                    outputs = list(pool.map(
+                        lambda item: self._read_in_snapshot(snapshot, item[1], item[2], generation), reads
+                    ))
+            else:
+                outputs = [
+                    self._read_and_store(operation, parameters, generation, session)
+                    for _, operation, parameters in reads
+                ]
+        except Exception as e:
+            return json.dumps({"error": str(e)})
+        finally:
+            session.close()
+        
+        for (key, _, _), output in zip(reads, outputs):
+            results[key] = json.loads(output)
+        return json.dumps({"results": {key: results[key] for key, _, _ in planned}})
+
+    def _read_in_snapshot(self, snapshot: str, operation: str, parameters: Dict[str, Any], generation: int) -> str:
+        if not SNAPSHOT_ID.match(snapshot):
+            return json.dumps({"error": f"Unexpected snapshot id: {snapshot}"})
+        session = get_session()
+        try:
+            session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            session.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot}'"))
+            return self._read_and_store(operation, parameters, generation, session)
         except Exception as e:
             return json.dumps({"error": str(e)})
         finally:
@@ -77,16 +219,21 @@ class DatabaseTool(BaseTool):
         student_id = params.get('student_id')
         email = params.get('email')
         
+        query = session.query(Student).options(*STUDENT_DETAILS)
         if student_id:
-            student = session.query(Student).filter(Student.id == student_id).first()
+            student = query.filter(Student.id == student_id).first()
         elif email:
-            student = session.query(Student).filter(Student.email == email).first()
+            student = query.filter(Student.email == email).first()
         else:
             return json.dumps({"error": "Either student_id or email is required"})
         
         if not student:
             return json.dumps({"error": "Student not found"})
         
+        registered_events_count = session.query(func.count()).select_from(event_registrations).filter(
+            event_registrations.c.student_id == student.id
+        ).scalar()
+        
         return json.dumps({
             "id": student.id,
             "name": student.name,
@@ -95,7 +242,7 @@ class DatabaseTool(BaseTool):
             "year_level": student.year_level,
             "skills": [{"id": skill.id, "name": skill.name, "category": skill.category} for skill in student.skills],
             "clubs": [{"id": club.id, "name": club.name} for club in student.clubs],
-            "registered_events_count": len(student.registered_events),
+            "registered_events_count": registered_events_count,
             "profile": {
                 "bio": student.profile.bio if student.profile else None,
                 "goals": student.profile.goals if student.profile else None,
@@ -118,16 +265,28 @@ class DatabaseTool(BaseTool):
         if not club:
             return json.dumps({"error": "Club not found"})
         
+        member_count = session.query(func.count()).select_from(club_members).filter(
+            club_members.c.club_id == club.id
+        ).scalar()
+        upcoming_events = session.query(Event).filter(
+            Event.club_id == club.id,
+            Event.date > datetime.utcnow()
+        ).order_by(Event.date).limit(10).all()
+        
+        # with a question, only the passages of the club's texts that answer it
+        if params.get('question'):
+            texts = {"relevant_passages": club_knowledge.passages(session, club.id, params['question'])}
+        else:
+            texts = {"description": club.description, "mission": club.mission, "history": club.history}
+        
         return json.dumps({
             "id": club.id,
             "name": club.name,
-            "description": club.description,
-            "mission": club.mission,
-            "history": club.history,
+            **texts,
             "contact_email": club.contact_email,
             "website": club.website,
             "personality_style": club.personality_style,
-            "member_count": len(club.members),
+            "member_count": member_count,
             "upcoming_events": [
                 {
                     "id": event.id,
@@ -136,13 +295,13 @@ class DatabaseTool(BaseTool):
                     "location": event.location,
                     "event_type": event.event_type
                 }
-                for event in club.events if event.date > datetime.utcnow()
-            ][:10]
+                for event in upcoming_events
+            ]
         })
 
     def _get_events(self, session: Session, params: Dict) -> str:
         """Get events with filters"""
-        query = session.query(Event)
+        query = session.query(Event).options(*EVENT_WITH_CLUB_AND_SKILLS)
         
         if params.get('club_id'):
             query = query.filter(Event.club_id == params['club_id'])
@@ -189,37 +348,7 @@ class DatabaseTool(BaseTool):
         query_text = params.get('query', '')
         filters = params.get('filters', {})
         
-        query = session.query(Event)
-        
-        # Text search
-        if query_text:
-            search_terms = query_text.lower().split()
-            conditions = []
-            for term in search_terms:
-                conditions.append(
-                    or_(
-                        Event.title.ilike(f"%{term}%"),
-                        Event.description.ilike(f"%{term}%"),
-                        Event.event_type.ilike(f"%{term}%")
-                    )
-                )
-            if conditions:
-                query = query.filter(or_(*conditions))
-        
-        # Apply filters
-        if filters.get('date_from'):
-            query = query.filter(Event.date >= datetime.fromisoformat(filters['date_from']))
-        if filters.get('date_to'):
-            query = query.filter(Event.date <= datetime.fromisoformat(filters['date_to']))
-        if filters.get('club_id'):
-            query = query.filter(Event.club_id == filters['club_id'])
-        if filters.get('event_type'):
-            query = query.filter(Event.event_type == filters['event_type'])
-        
-        # Only future events
-        query = query.filter(Event.date > datetime.utcnow())
-        
-        events = query.order_by(desc(Event.is_trending), Event.date).limit(20).all()
+        events = search_events(session, query_text, filters, limit=20)
         
         return json.dumps([
             {
@@ -238,12 +367,20 @@ class DatabaseTool(BaseTool):
 
     def _get_trending_events(self, session: Session, params: Dict) -> str:
         """Get trending events"""
-        trending_events = session.query(Event).filter(
+        limit = params.get('limit', 10)
+        trending_leaderboard.ensure_loaded(session)
+        # over-fetch: events that started since the last flush are dropped below
+        scores = dict(trending_leaderboard.top(limit * 3))
+        if not scores:
+            return json.dumps([])
+        
+        events = session.query(Event).options(*EVENT_WITH_CLUB).filter(
             and_(
-                Event.date > datetime.utcnow(),
-                Event.is_trending == True
+                Event.id.in_(list(scores)),
+                Event.date > datetime.utcnow()
             )
-        ).order_by(desc(Event.view_count), desc(Event.current_registrations)).limit(10).all()
+        ).all()
+        trending_events = sorted(events, key=lambda event: (-scores[event.id], event.id))[:limit]
         
         return json.dumps([
             {
@@ -254,6 +391,7 @@ class DatabaseTool(BaseTool):
                 "seats_remaining": event.seats_available,
                 "registration_count": event.current_registrations,
                 "view_count": event.view_count,
+                "trending_score": scores[event.id],
                 "is_full": event.is_full
             }
             for event in trending_events
@@ -265,61 +403,10 @@ class DatabaseTool(BaseTool):
         if not student_id:
             return json.dumps({"error": "student_id is required"})
         
-        student = session.query(Student).filter(Student.id == student_id).first()
-        if not student:
+        if not session.query(exists().where(Student.id == student_id)).scalar():
             return json.dumps({"error": "Student not found"})
         
-        student_skill_ids = [s.id for s in student.skills]
-        
-        # Find events matching student skills
-        upcoming_events = session.query(Event).filter(
-            Event.date > datetime.utcnow()
-        ).all()
-        
-        recommendations = []
-        for event in upcoming_events:
-            # Skip if already registered
-            if event in student.registered_events:
-                continue
-            
-            score = 0
-            reasons = []
-            
-            # Check skill match
-            event_skill_ids = [s.id for s in event.required_skills]
-            matching_skills = set(student_skill_ids) & set(event_skill_ids)
-            if matching_skills:
-                skill_names = [s.name for s in event.required_skills if s.id in matching_skills]
-                score += len(matching_skills) * 25
-                reasons.append(f"Matches your skills: {', '.join(skill_names)}")
-            
-            # Check if student is in same club
-            if event.club in student.clubs:
-                score += 30
-                reasons.append("Your club's event")
-            
-            # Trending bonus
-            if event.is_trending:
-                score += 15
-                reasons.append("Trending event")
-            
-            # Popularity score
-            score += event.view_count * 0.05
-            
-            if score > 0 or len(reasons) > 0:
-                recommendations.append({
-                    "item_id": event.id,
-                    "item_type": "event",
-                    "title": event.title,
-                    "club_name": event.club.name,
-                    "date": event.date.isoformat(),
-                    "location": event.location,
-                    "score": round(score, 2),
-                    "reasons": reasons if reasons else ["Popular event"]
-                })
-        
-        recommendations.sort(key=lambda x: x['score'], reverse=True)
-        return json.dumps(recommendations[:15])
+        return json.dumps(student_recommendations.get(session, student_id))
 
     def _update_profile(self, session: Session, params: Dict) -> str:
         """Update student profile"""
@@ -327,7 +414,9 @@ class DatabaseTool(BaseTool):
         if not student_id:
             return json.dumps({"error": "student_id is required"})
         
-        student = session.query(Student).filter(Student.id == student_id).first()
+        student = session.query(Student).options(
+            joinedload(Student.profile), selectinload(Student.skills)
+        ).filter(Student.id == student_id).first()
         if not student:
             return json.dumps({"error": "Student not found"})
         
@@ -356,7 +445,13 @@ class DatabaseTool(BaseTool):
         if 'year_level' in params:
             student.year_level = params['year_level']
         
+        updated_skill_ids = [skill.id for skill in student.skills]
+        updated_student_id = student.id
         session.commit()
+        tool_cache.invalidate("student", updated_student_id)
+        if 'skills' in params:
+            similarity_index.update(updated_student_id, updated_skill_ids)
+            student_recommendations.student_changed(updated_student_id)
         return json.dumps({"success": True, "message": "Profile updated successfully"})
 
     def _register_event(self, session: Session, params: Dict) -> str:
@@ -367,37 +462,30 @@ class DatabaseTool(BaseTool):
         if not student_id or not event_id:
             return json.dumps({"error": "student_id and event_id are required"})
         
-        student = session.query(Student).filter(Student.id == student_id).first()
-        event = session.query(Event).filter(Event.id == event_id).first()
-        
-        if not student or not event:
-            return json.dumps({"error": "Student or event not found"})
-        
-        # Check if already registered
-        if event in student.registered_events:
-            return json.dumps({"error": "Already registered for this event"})
-        
-        # Check if event is full
-        if event.is_full:
-            return json.dumps({"error": "Event is full"})
-        
-        # Check if event is in the past
-        if event.is_past:
-            return json.dumps({"error": "Cannot register for past events"})
+        result = register_for_event(session, student_id, event_id, waitlist=bool(params.get('waitlist')))
+        if result.get('success'):
+            tool_cache.invalidate("student", student_id)
+            tool_cache.invalidate("event", event_id)
+            student_recommendations.student_changed(student_id)
+        return json.dumps(result)
+
+    def _cancel_registration(self, session: Session, params: Dict) -> str:
+        """Cancel a registration or waitlist place"""
+        student_id = params.get('student_id')
+        event_id = params.get('event_id')
         
-        student.registered_events.append(event)
-        event.current_registrations += 1
+        if not student_id or not event_id:
+            return json.dumps({"error": "student_id and event_id are required"})
         
-        session.commit()
-        return json.dumps({
-            "success": True,
-            "message": f"Successfully registered for {event.title}",
-            "event": {
-                "id": event.id,
-                "title": event.title,
-                "date": event.date.isoformat()
-            }
-        })
+        result = cancel_registration(session, student_id, event_id)
+        if result.get('success'):
+            tool_cache.invalidate("student", student_id)
+            student_recommendations.student_changed(student_id)
+            if 'promoted_student_id' in result:
+                tool_cache.invalidate("student", result['promoted_student_id'])
+                student_recommendations.student_changed(result['promoted_student_id'])
+            tool_cache.invalidate("event", event_id)
+        return json.dumps(result)
 
     def _get_club_members(self, session: Session, params: Dict) -> str:
         """Get members of a club"""
@@ -405,7 +493,7 @@ class DatabaseTool(BaseTool):
         if not club_id:
             return json.dumps({"error": "club_id is required"})
         
-        club = session.query(Club).filter(Club.id == club_id).first()
+        club = session.query(Club).options(selectinload(Club.members)).filter(Club.id == club_id).first()
         if not club:
             return json.dumps({"error": "Club not found"})
         
@@ -430,34 +518,55 @@ class DatabaseTool(BaseTool):
         if not student_id:
             return json.dumps({"error": "student_id is required"})
         
-        student = session.query(Student).filter(Student.id == student_id).first()
-        if not student:
+        if not session.query(exists().where(Student.id == student_id)).scalar():
             return json.dumps({"error": "Student not found"})
         
-        student_skill_ids = {s.id for s in student.skills}
+        student_skill_ids = set(session.scalars(
+            select(student_skills.c.skill_id).where(student_skills.c.student_id == student_id)
+        ))
+        if not student_skill_ids:
+            return json.dumps([])
+        
+        similarity_index.ensure_loaded(session)
+        if params.get('mode') == 'approximate':
+            top_matches = similarity_index.approximate_top_k(student_id, student_skill_ids, k=10)
+        else:
+            top_matches = similarity_index.exact_top_k(student_id, student_skill_ids, k=10)
+        
+        others = {
+            other.id: other
+            for other in session.query(Student).filter(
+                Student.id.in_([other_id for other_id, _ in top_matches])
+            )
+        }
+        skill_names = dict(session.query(Skill.id, Skill.name).filter(Skill.id.in_(student_skill_ids)).all())
         
         similar_students = []
-        for other in session.query(Student).filter(Student.id != student_id).all():
-            other_skill_ids = {s.id for s in other.skills}
-            
-            similarity = len(student_skill_ids & other_skill_ids)
-            
-            if similarity > 0:
-                similar_students.append({
-                    "id": other.id,
-                    "name": other.name,
-                    "field_of_study": other.field_of_study,
-                    "similarity_score": similarity,
-                    "common_skills": [s.name for s in other.skills if s.id in student_skill_ids]
-                })
-        
-        similar_students.sort(key=lambda x: x['similarity_score'], reverse=True)
-        return json.dumps(similar_students[:10])
+        for other_id, similarity in top_matches:
+            other = others.get(other_id)
+            if other is None:
+                continue
+            common = sorted(similarity_index.skills_of(other_id) & student_skill_ids)
+            similar_students.append({
+                "id": other.id,
+                "name": other.name,
+                "field_of_study": other.field_of_study,
+                "similarity_score": similarity,
+                "common_skills": [skill_names[skill_id] for skill_id in common]
+            })
+        
+        return json.dumps(similar_students)
 
     def _get_all_students(self, session: Session, params: Dict) -> str:
-        """Get all students"""
-        students = session.query(Student).all()
-        return json.dumps([
+        """Get all students, one page at a time"""
+        limit = page_size(params.get('limit'))
+        after = decode_cursor(params.get('cursor'))
+        students = session.execute(keyset(
+            select(Student.id, Student.name, Student.email, Student.field_of_study, Student.year_level),
+            Student.id, limit, after
+        )).all()
+        total = session.scalar(count_of(select(Student.id))) if params.get('include_total') else None
+        return json.dumps(page([
             {
                 "id": s.id,
                 "name": s.name,
@@ -466,20 +575,29 @@ class DatabaseTool(BaseTool):
                 "year_level": s.year_level
             }
             for s in students
-        ])
+        ], limit, total))
 
     def _get_all_clubs(self, session: Session, params: Dict) -> str:
-        """Get all clubs"""
-        clubs = session.query(Club).all()
-        return json.dumps([
+        """Get all clubs, one page at a time"""
+        limit = page_size(params.get('limit'))
+        after = decode_cursor(params.get('cursor'))
+        member_count = func.count(club_members.c.student_id)
+        clubs = session.execute(keyset(
+            select(Club.id, Club.name, Club.description, member_count).outerjoin(
+                club_members, club_members.c.club_id == Club.id
+            ).group_by(Club.id),
+            Club.id, limit, after
+        )).all()
+        total = session.scalar(count_of(select(Club.id))) if params.get('include_total') else None
+        return json.dumps(page([
             {
-                "id": c.id,
-                "name": c.name,
-                "description": c.description,
-                "member_count": len(c.members)
+                "id": club_id,
+                "name": name,
+                "description": description,
+                "member_count": count
             }
-            for c in clubs
-        ])
+            for club_id, name, description, count in clubs
+        ], limit, total))
 
     def _get_all_skills(self, session: Session, params: Dict) -> str:
         """Get all skills"""
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent /chat/club requests with a slow crew
+
+Replaces the shared crew with one whose handle_club_query blocks for
+--latency seconds, the way a crew run blocks on the LLM, and sends
+--requests concurrent chat requests:
+
+  1. the old way, the crew called inline in an async handler, which
+     serializes every request behind the event loop;
+  2. through /chat/club, where the agent executor overlaps them up to the
+     endpoint's concurrency limit, while a monitoring endpoint is probed to
+     show the event loop stays responsive;
+  3. a burst larger than concurrency + queue, to check the overflow gets
+     503 with Retry-After instead of queueing without bound.
+
+Run from app/:
+    python scripts/bench_agent_executor.py --requests 16 --latency 0.5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import httpx
+import database
+from multi_agents import runtime
+from multi_agents.executor import ENDPOINT_LIMITS
+from seed_data import seed
+
+
+class SlowCrew:
+    """Stands in for ClubEventHubCrew: blocks like a crew waiting on the LLM"""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def handle_club_query(self, club_id, student_question, club_personality="friendly"):
+        time.sleep(self.latency)
+        return f"Answer to {student_question!r}"
+
+
+async def inline(crew, requests):
+    async def handler(i):
+        return crew.handle_club_query("1", f"question {i}")
+    started = time.perf_counter()
+    await asyncio.gather(*(handler(i) for i in range(requests)))
+    return time.perf_counter() - started
+
+
+async def through_executor(client, requests, prefix):
+    probes = []
+
+    async def probe():
+        # the monitoring endpoint stands in for any cheap request
+        while True:
+            started = time.perf_counter()
+            await client.get("/stats/agent-executor")
+            probes.append(time.perf_counter() - started)
+            await asyncio.sleep(0.05)
+
+    prober = asyncio.create_task(probe())
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(
+        client.post("/chat/club", json={"club_id": 1, "question": f"{prefix} question {i}"})
+        for i in range(requests)
+    ))
+    elapsed = time.perf_counter() - started
+    prober.cancel()
+    return elapsed, responses, probes
+
+
+async def main(args):
+    from main import app
+
+    crew = SlowCrew(args.latency)
+    runtime._crew = crew
+    concurrency, queue = ENDPOINT_LIMITS["chat"]
+
+    elapsed = await inline(crew, args.requests)
+    print(f"inline crew calls : {args.requests} requests in {elapsed:.2f} s "
+          f"(serialized would be {args.requests * args.latency:.2f} s)")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        requests = min(args.requests, concurrency + queue)
+        elapsed, responses, probes = await through_executor(client, requests, "overlap")
+        waves = -(-requests // concurrency)
+        print(f"agent executor    : {requests} requests in {elapsed:.2f} s "
+              f"(concurrency {concurrency}: {waves} waves, ~{waves * args.latency:.2f} s), "
+              f"statuses {dict(Counter(r.status_code for r in responses))}")
+        if probes:
+            print(f"    other requests meanwhile: {len(probes)} answered, slowest {max(probes) * 1000:.1f} ms")
+
+        burst = concurrency + queue + args.overflow
+        _, responses, _ = await through_executor(client, burst, "burst")
+        rejected = [r for r in responses if r.status_code == 503]
+        print(f"burst of {burst}       : {dict(Counter(r.status_code for r in responses))}, "
+              f"Retry-After {sorted({r.headers.get('retry-after') for r in rejected})}")
+    return len(rejected) == args.overflow
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--overflow", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/executor.db"
+        database.dispose_engine()
+        database.init_db()
+        seed(database.get_engine(), students=10, events=10, clubs=2, skills=5)
+        ok = asyncio.run(main(args))
+        database.dispose_engine()
+    sys.exit(0 if ok else 1)
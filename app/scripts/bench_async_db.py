@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Requests-per-second benchmark: sync SQLAlchemy sessions vs the async data layer
+
+Serves the same "load a student by email" lookup twice through FastAPI, once as a
+sync handler on a blocking Session and once as an async handler on AsyncSession,
+then drives both with concurrent in-process HTTP requests.
+
+Run from app/:
+    python scripts/bench_async_db.py --requests 2000 --concurrency 50
+
+DATABASE_URL defaults to a scratch SQLite file (exercises aiosqlite); point it at a
+scratch Postgres database to exercise psycopg2 vs asyncpg.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench_async.db")
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from database import get_async_db, get_db, get_session, init_db, dispose_async_engine
+from models import Student
+
+
+def seed(students: int):
+    init_db()
+    session = get_session()
+    try:
+        existing = session.scalar(select(func.count(Student.id)))
+        session.add_all([
+            Student(
+                name=f"Bench Student {i}",
+                email=f"bench{i}@example.com",
+                password_hash="x",
+                field_of_study="Computer Science",
+                year_level=i % 5 + 1
+            )
+            for i in range(existing, students)
+        ])
+        session.commit()
+    finally:
+        session.close()
+
+
+def build_app(students: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync/students/{n}")
+    def sync_student(n: int, db: Session = Depends(get_db)):
+        student = db.scalar(select(Student).where(Student.email == f"bench{n % students}@example.com"))
+        return {"id": student.id, "name": student.name}
+
+    @app.get("/async/students/{n}")
+    async def async_student(n: int, db: AsyncSession = Depends(get_async_db)):
+        student = await db.scalar(select(Student).where(Student.email == f"bench{n % students}@example.com"))
+        return {"id": student.id, "name": student.name}
+
+    return app
+
+
+async def drive(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(n: int):
+            async with semaphore:
+                response = await client.get(f"{path}/{n}")
+                response.raise_for_status()
+
+        # warm the pools before timing
+        await asyncio.gather(*(one(n) for n in range(concurrency)))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(n) for n in range(requests)))
+        return requests / (time.perf_counter() - started)
+
+
+async def main(args):
+    seed(args.students)
+    app = build_app(args.students)
+
+    print(f"database: {os.environ['DATABASE_URL'].split('@')[-1]}")
+    print(f"{args.requests} requests, concurrency {args.concurrency}\n")
+
+    for label, path in (("sync  Session     ", "/sync/students"), ("async AsyncSession", "/async/students")):
+        rps = await drive(app, path, args.requests, args.concurrency)
+        print(f"  {label}  {rps:10.1f} req/s")
+
+    await dispose_async_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--students", type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /chat/club template answers versus the club chatbot
+
+Runs a recorded set of club chat questions through multi_agents.club_facts
+against a seeded scratch SQLite database, reports which ones are answered
+from SQL without an LLM call and whether that matches the label, then times
+the template path for every personality style. The chatbot path needs the
+LLM API keys and network access, so it only runs with --crew, on the
+questions that fall back.
+
+Run from app/:
+    python scripts/bench_club_facts.py --repeat 200
+    python scripts/bench_club_facts.py --crew
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import database
+from models import Club
+from multi_agents import club_facts
+from services.latency import percentile
+from seed_data import seed
+
+# (question, answered from SQL?) as students asked them in club chats
+QUESTIONS = [
+    ("When is your next event?", True),
+    ("what's the next meeting?", True),
+    ("when is the next hackathon", True),
+    ("Where is the next workshop held?", True),
+    ("when and where is the next event", True),
+    ("any upcoming events?", True),
+    ("how can I contact the club?", True),
+    ("what's your email", True),
+    ("do you have a website?", True),
+    ("what is the club's url", True),
+    ("how many members do you have?", True),
+    ("How big is the club?", True),
+    ("what's your email and website", True),
+    ("what is this club about?", False),
+    ("how do I join?", False),
+    ("tell me about your history", False),
+    ("why should I join this club rather than the AI club", False),
+    ("what do you do at meetings?", False),
+    ("I'm new to coding, is the next workshop good for beginners?", False),
+    ("what should I bring to the next hackathon", False),
+    ("hi!", False),
+    ("what's your mission", False),
+    ("when was your last meeting?", False),
+    ("when did the club start meeting?", False),
+    ("how many events does the club host each year?", False),
+    ("how many people attended the last hackathon?", False),
+    ("is the meeting site wheelchair accessible?", False),
+    ("where can I find the meeting notes?", False),
+    ("how many people are in the club?", True),
+]
+STYLES = ("friendly", "formal", "casual", "tech-focused")
+
+
+def summary(label, samples):
+    samples = sorted(samples)
+    print(f"{label}: {len(samples)} runs  p50 {percentile(samples, 50) * 1000:9.2f} ms"
+          f"  p99 {percentile(samples, 99) * 1000:9.2f} ms")
+
+
+async def run(args):
+    async with database.get_async_session() as db:
+        club = await db.get(Club, 1)
+        club.contact_email, club.website = "club-1@campus.example", "https://club-1.campus.example"
+
+        local, correct, fallbacks = 0, 0, []
+        for question, expected in QUESTIONS:
+            response = await club_facts.answer(db, club, question, "friendly")
+            answered = response is not None
+            local += answered
+            correct += answered == expected
+            if not answered:
+                fallbacks.append(question)
+            print(f"  {'sql ' if answered else 'llm '} {'ok ' if answered == expected else 'BAD'}  {question}")
+            if answered and args.verbose:
+                print(f"         -> {response}")
+        print(f"\n{local}/{len(QUESTIONS)} ({local / len(QUESTIONS):.0%}) answered without the LLM, "
+              f"{correct}/{len(QUESTIONS)} as labelled\n")
+
+        for style in STYLES:
+            samples = []
+            for _ in range(args.repeat):
+                for question, _ in QUESTIONS:
+                    started = time.perf_counter()
+                    if await club_facts.answer(db, club, question, style) is not None:
+                        samples.append(time.perf_counter() - started)
+            summary(f"template answer, {style:12}", samples)
+    return correct == len(QUESTIONS), fallbacks
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/club_facts.db"
+        database.dispose_engine()
+        database.init_db()
+        seed(database.get_engine(), students=args.students, events=args.events, clubs=args.clubs, skills=20)
+        ok, fallbacks = asyncio.run(run(args))
+
+        if args.crew:
+            from multi_agents.crew import ClubEventHubCrew
+            crew = ClubEventHubCrew()
+            samples = []
+            for question in fallbacks:
+                started = time.perf_counter()
+                crew.handle_club_query("1", question)
+                samples.append(time.perf_counter() - started)
+            summary("club chatbot                 ", samples)
+        else:
+            print("club chatbot: skipped, pass --crew (needs API keys and network)")
+        database.dispose_engine()
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--clubs", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--crew", action="store_true")
+    sys.exit(0 if main(parser.parse_args()) else 1)
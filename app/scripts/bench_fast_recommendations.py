@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: POST /recommendations/fast latency and result stability
+
+Seeds a scratch SQLite database, signs in a sample of students and calls
+/recommendations/fast for each through the ASGI app, checking that repeated
+calls return the same events and count, and that the p99 stays under the
+--budget-ms target. The LLM route (POST /recommendations/) is not timed here,
+it needs the API keys and network access.
+
+Run from app/:
+    python scripts/bench_fast_recommendations.py --events 5000 --students 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+import database
+from models import Student
+from services.latency import percentile
+from seed_data import seed
+
+
+def main(args):
+    from main import app
+    from api.routers.autontification.token import create_access_token
+
+    with database.get_session() as session:
+        emails = session.scalars(select(Student.email).order_by(Student.id).limit(args.sample)).all()
+
+    samples, stable = [], True
+    with TestClient(app) as client:
+        for email in emails:
+            headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+            first = None
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                response = client.post("/recommendations/fast", params={"limit": args.limit}, headers=headers)
+                samples.append(time.perf_counter() - started)
+                response.raise_for_status()
+                body = response.json()
+                result = (body["count"], [item["event_id"] for item in body["recommendations"]])
+                first = first or result
+                stable &= result == first
+
+    samples.sort()
+    p50, p99 = percentile(samples, 50) * 1000, percentile(samples, 99) * 1000
+    print(f"/recommendations/fast: {len(samples)} calls for {len(emails)} students, "
+          f"p50 {p50:.2f} ms  p99 {p99:.2f} ms (budget {args.budget_ms} ms), "
+          f"results {'stable' if stable else 'CHANGED between calls'}")
+    return stable and p99 <= args.budget_ms
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--clubs", type=int, default=50)
+    parser.add_argument("--sample", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/fast_recommendations.db"
+        database.dispose_engine()
+        database.init_db()
+        seed(database.get_engine(), students=args.students, events=args.events, clubs=args.clubs, skills=40)
+        ok = main(args)
+        database.dispose_engine()
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /agents/query fast path versus the LLM crew
+
+Classifies a labelled set of student queries with multi_agents.intents, checks
+which ones would be answered locally and whether the intent was right, then
+times both paths. The fast path (classify + one DatabaseTool read + template)
+runs against a seeded scratch SQLite database. The crew path needs the LLM
+API keys and network access, so it only runs with --crew, on the queries the
+classifier hands over.
+
+Run from app/:
+    python scripts/bench_intents.py --repeat 200
+    python scripts/bench_intents.py --crew --crew-repeat 3
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import database
+from multi_agents import fast_path
+from multi_agents.intents import CLUBS, OTHER, RECOMMEND, SEARCH, TRENDING, classify
+from services import tool_cache, trending_leaderboard
+from services.latency import percentile
+from seed_data import seed
+
+# (query, expected intent); OTHER means the crew should answer
+QUERIES = [
+    ("show me AI workshops this week", SEARCH),
+    ("any hackathons next month?", SEARCH),
+    ("find python events", SEARCH),
+    ("are there social events this weekend", SEARCH),
+    ("I want to learn guitar, any music events?", SEARCH),
+    ("upcoming competitions", SEARCH),
+    ("what's trending?", TRENDING),
+    ("most popular events right now", TRENDING),
+    ("show me trending events", TRENDING),
+    ("recommend something for me", RECOMMEND),
+    ("what events should I attend", RECOMMEND),
+    ("suggest events that match my skills", RECOMMEND),
+    ("what clubs can I join", CLUBS),
+    ("list all clubs", CLUBS),
+    ("how do I join the chess club?", OTHER),
+    ("compare the AI club and the data club", OTHER),
+    ("can you help me plan my week around exams", OTHER),
+    ("tell me about the robotics club", OTHER),
+    ("hello there", OTHER),
+    ("why was my registration cancelled?", OTHER),
+    ("show me events I registered for", OTHER),
+    ("which events am I attending", OTHER),
+    ("list my events", OTHER),
+    ("are there any events where I can learn to cook", SEARCH),
+]
+CONTEXT = {"student_id": 1}
+
+
+def summary(label, samples):
+    samples = sorted(samples)
+    print(f"{label}: {len(samples)} runs  p50 {percentile(samples, 50) * 1000:9.2f} ms"
+          f"  p99 {percentile(samples, 99) * 1000:9.2f} ms")
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/intents.db"
+        database.dispose_engine()
+        database.init_db()
+        seed(database.get_engine(), students=args.students, events=args.events, clubs=args.clubs, skills=40)
+        trending_leaderboard.invalidate()
+
+        routed, correct, fallbacks = 0, 0, []
+        for query, expected in QUERIES:
+            intent = classify(query)
+            local = fast_path.answer(intent, CONTEXT) is not None
+            right = (intent.name if local else OTHER) == expected
+            routed += local
+            correct += right
+            if not local:
+                fallbacks.append(query)
+            print(f"  {'fast' if local else 'crew'}  {intent.name:16} {intent.confidence:5.2f}"
+                  f"  {'ok ' if right else 'BAD'}  {query}")
+        print(f"\n{routed}/{len(QUERIES)} answered locally, {correct}/{len(QUERIES)} routed as labelled\n")
+
+        classify_times, cold, warm = [], [], []
+        for _ in range(args.repeat):
+            for query, _ in QUERIES:
+                started = time.perf_counter()
+                classify(query)
+                classify_times.append(time.perf_counter() - started)
+            for samples in (cold, warm):
+                if samples is cold:
+                    tool_cache.clear()
+                for query, _ in QUERIES:
+                    started = time.perf_counter()
+                    if fast_path.answer(classify(query), CONTEXT) is not None:
+                        samples.append(time.perf_counter() - started)
+
+        summary("classifier only        ", classify_times)
+        summary("fast path, cold cache  ", cold)
+        summary("fast path, warm cache  ", warm)
+
+        if args.crew:
+            from multi_agents.crew import ClubEventHubCrew
+            crew = ClubEventHubCrew()
+            crew_times = []
+            for _ in range(args.crew_repeat):
+                for query in fallbacks:
+                    started = time.perf_counter()
+                    crew.process_student_query(query, CONTEXT)
+                    crew_times.append(time.perf_counter() - started)
+            summary("LLM crew               ", crew_times)
+        else:
+            print("LLM crew: skipped, pass --crew (needs API keys and network)")
+        database.dispose_engine()
+    return correct == len(QUERIES)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--clubs", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--crew", action="store_true")
+    parser.add_argument("--crew-repeat", type=int, default=1)
+    sys.exit(0 if main(parser.parse_args()) else 1)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Before/after query-plan benchmark for the DatabaseTool hot queries
+
+Builds two scratch databases with identical seed data: "before" has the old
+unkeyed association tables and no composite events indexes, "after" has the
+schema declared in models/. For each query behind a DatabaseTool operation it
+prints the plan and the mean execution time on both.
+
+Run from app/:
+    python scripts/bench_query_plans.py
+    python scripts/bench_query_plans.py --url-before postgresql://.../scratch_a --url-after postgresql://.../scratch_b
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, text
+from database import Base
+from models import Event, student_skills, event_skills, event_registrations, club_members
+from seed_data import seed
+
+ASSOCIATION_TABLES = [student_skills, event_skills, event_registrations, club_members]
+# composite indexes the "after" schema adds; the single-column ones predate it
+COMPOSITE_EVENT_INDEXES = {"ix_events_is_trending_date", "ix_events_club_id_date"}
+
+# (DatabaseTool operation, description, SQL as emitted by the relationship/filter)
+QUERIES = [
+    ("get_student", "student.skills",
+     "SELECT skills.id, skills.name FROM skills JOIN student_skills ON skills.id = student_skills.skill_id "
+     "WHERE student_skills.student_id = :student_id"),
+    ("get_student", "student.clubs",
+     "SELECT clubs.id, clubs.name FROM clubs JOIN club_members ON clubs.id = club_members.club_id "
+     "WHERE club_members.student_id = :student_id"),
+    ("get_club_members", "club.members",
+     "SELECT students.id, students.name FROM students JOIN club_members ON students.id = club_members.student_id "
+     "WHERE club_members.club_id = :club_id"),
+    ("get_events", "event.required_skills",
+     "SELECT skills.id, skills.name FROM skills JOIN event_skills ON skills.id = event_skills.skill_id "
+     "WHERE event_skills.event_id = :event_id"),
+    ("register_event", "already registered?",
+     "SELECT 1 FROM event_registrations WHERE student_id = :student_id AND event_id = :event_id"),
+    ("get_recommendations", "event.registered_students",
+     "SELECT students.id FROM students JOIN event_registrations ON students.id = event_registrations.student_id "
+     "WHERE event_registrations.event_id = :event_id"),
+    ("get_similar_students", "students sharing a skill",
+     "SELECT student_skills.student_id FROM student_skills WHERE student_skills.skill_id = :skill_id"),
+    ("get_trending_events", "upcoming trending",
+     "SELECT events.id FROM events WHERE events.date > :now AND events.is_trending = :trending "
+     "ORDER BY events.view_count DESC LIMIT 10"),
+    ("get_club", "club upcoming events",
+     "SELECT events.id FROM events WHERE events.club_id = :club_id AND events.date > :now "
+     "ORDER BY events.date LIMIT 10"),
+]
+
+
+def build(url: str, legacy: bool, args):
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    if legacy:
+        with engine.begin() as conn:
+            for table in ASSOCIATION_TABLES:
+                conn.execute(text(f"ALTER TABLE {table.name} RENAME TO {table.name}_keyed"))
+                conn.execute(text(f"CREATE TABLE {table.name} AS SELECT * FROM {table.name}_keyed WHERE 1 = 0"))
+                conn.execute(text(f"DROP TABLE {table.name}_keyed"))
+            for index in Event.__table__.indexes:
+                if index.name in COMPOSITE_EVENT_INDEXES:
+                    index.drop(conn)
+
+    seed(engine, students=args.students, events=args.events, clubs=args.clubs, skills=args.skills)
+    return engine
+
+
+def plan(conn, sql: str, params: dict) -> str:
+    if conn.dialect.name == "sqlite":
+        rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql), params).all()
+        return "; ".join(row[-1] for row in rows)
+    rows = conn.execute(text("EXPLAIN " + sql), params).all()
+    return "; ".join(row[0].strip() for row in rows)
+
+
+def timed(conn, sql: str, params_for, repeat: int) -> float:
+    started = time.perf_counter()
+    for i in range(repeat):
+        conn.execute(text(sql), params_for(i)).all()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main(args):
+    rng = random.Random(7)
+    now = datetime.utcnow()
+
+    def params_for(_):
+        return {
+            "student_id": rng.randint(1, args.students),
+            "club_id": rng.randint(1, args.clubs),
+            "event_id": rng.randint(1, args.events),
+            "skill_id": rng.randint(1, args.skills),
+            "now": now,
+            "trending": True,
+        }
+
+    engines = {
+        "before": build(args.url_before, True, args),
+        "after": build(args.url_after, False, args),
+    }
+
+    print(f"{args.students} students, {args.events} events, {args.clubs} clubs, {args.skills} skills\n")
+    for operation, label, sql in QUERIES:
+        print(f"{operation} -- {label}")
+        timings = {}
+        for name, engine in engines.items():
+            with engine.connect() as conn:
+                print(f"  {name:6}  {plan(conn, sql, params_for(0))}")
+                timings[name] = timed(conn, sql, params_for, args.repeat)
+        speedup = timings["before"] / timings["after"] if timings["after"] else float("inf")
+        print(f"  time    before {timings['before']:.3f} ms  after {timings['after']:.3f} ms  ({speedup:.1f}x)\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url-before", default="sqlite://", help="scratch database for the old schema")
+    parser.add_argument("--url-after", default="sqlite://", help="scratch database for the new schema")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--clubs", type=int, default=200)
+    parser.add_argument("--skills", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=200)
+    main(parser.parse_args())
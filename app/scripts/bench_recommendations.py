@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorised RecommendationEngine vs the per-event Python loop
+
+Seeds a scratch SQLite database, then for a sample of students checks that the
+engine returns exactly the same top-15 (ids, scores, reasons) as the original
+loop and reports the latency of both.
+
+Run from app/:
+    python scripts/bench_recommendations.py --events 30000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import select
+import database
+from models import Event, Skill, student_skills, event_skills, event_registrations, club_members
+from services import RecommendationEngine
+from seed_data import seed
+
+
+def legacy_recommendations(session, student_id):
+    """The per-event scoring loop the engine replaces"""
+    skill_ids = set(session.scalars(select(student_skills.c.skill_id).where(student_skills.c.student_id == student_id)))
+    club_ids = set(session.scalars(select(club_members.c.club_id).where(club_members.c.student_id == student_id)))
+    registered = set(session.scalars(select(event_registrations.c.event_id).where(event_registrations.c.student_id == student_id)))
+
+    now = datetime.utcnow()
+    events = session.query(Event).filter(Event.date > now).order_by(Event.date, Event.id).all()
+    skills_by_event = {}
+    for event_id, skill_id, name in session.execute(
+        select(event_skills.c.event_id, Skill.id, Skill.name)
+        .join(Skill, Skill.id == event_skills.c.skill_id)
+        .order_by(event_skills.c.skill_id)
+    ):
+        skills_by_event.setdefault(event_id, []).append((skill_id, name))
+
+    recommendations = []
+    for event in events:
+        if event.id in registered:
+            continue
+        score = 0
+        reasons = []
+        event_skill_list = skills_by_event.get(event.id, [])
+        matching = skill_ids & {s for s, _ in event_skill_list}
+        if matching:
+            score += len(matching) * 25
+            reasons.append(f"Matches your skills: {', '.join(n for s, n in event_skill_list if s in matching)}")
+        if event.club_id in club_ids:
+            score += 30
+            reasons.append("Your club's event")
+        if event.is_trending:
+            score += 15
+            reasons.append("Trending event")
+        score += event.view_count * 0.05
+        if score > 0 or reasons:
+            recommendations.append({
+                "item_id": event.id,
+                "score": round(score, 2),
+                "reasons": reasons if reasons else ["Popular event"]
+            })
+    recommendations.sort(key=lambda x: x["score"], reverse=True)
+    return recommendations[:15]
+
+
+def ms(samples):
+    return f"p50 {statistics.median(samples):8.2f} ms   max {max(samples):8.2f} ms"
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/recommendations.db"
+        database.init_db()
+        seed(database.get_engine(), students=args.students, events=args.events, clubs=args.clubs, skills=args.skills)
+
+        engine = RecommendationEngine(ttl_seconds=3600)
+        session = database.get_session()
+        try:
+            started = time.perf_counter()
+            snapshot = engine.snapshot(session)
+            print(f"snapshot of {snapshot.size} upcoming events built in {(time.perf_counter() - started) * 1000:.1f} ms\n")
+
+            engine_times, legacy_times, mismatches = [], [], 0
+            for student_id in range(1, args.students + 1, max(1, args.students // args.samples)):
+                started = time.perf_counter()
+                fast = engine.recommend(session, student_id)
+                engine_times.append((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                slow = legacy_recommendations(session, student_id)
+                legacy_times.append((time.perf_counter() - started) * 1000)
+
+                if [(r["item_id"], r["score"], r["reasons"]) for r in fast] != \
+                        [(r["item_id"], r["score"], r["reasons"]) for r in slow]:
+                    mismatches += 1
+        finally:
+            session.close()
+            database.dispose_engine()
+
+    print(f"  engine  {ms(engine_times)}")
+    print(f"  legacy  {ms(legacy_times)}")
+    print(f"\n  {len(engine_times)} students compared, {mismatches} mismatching top-15 lists")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=30000)
+    parser.add_argument("--clubs", type=int, default=200)
+    parser.add_argument("--skills", type=int, default=300)
+    parser.add_argument("--samples", type=int, default=20)
+    sys.exit(0 if main(parser.parse_args()) else 1)
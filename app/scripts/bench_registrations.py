@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent registrations for one popular event
+
+Fires thousands of parallel register_event calls (every student twice, to
+exercise the double-registration guard) at one event with a limited number of
+seats, first with the original read-check-increment code and then with
+services.register_for_event. Checks that the seat counter matches the
+registration rows and never exceeds max_seats.
+
+Runs on a scratch SQLite file by default. --database-url points it at an
+empty scratch database instead (e.g. Postgres, where row contention is real);
+the script creates and fills its tables.
+
+Run from app/:
+    python scripts/bench_registrations.py --students 3000 --seats 500 --workers 64
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from datetime import datetime, timedelta
+from sqlalchemy import delete, exists, func, select, update
+import database
+from models import Event, event_registrations
+from services import register_for_event
+from seed_data import seed
+
+EVENT_ID = 1
+
+
+def legacy_register(session, student_id, event_id):
+    """The check-then-increment registration the engine replaces"""
+    event = session.query(Event).filter(Event.id == event_id).first()
+    if session.query(exists().where(
+        event_registrations.c.student_id == student_id,
+        event_registrations.c.event_id == event_id
+    )).scalar():
+        return {"error": "Already registered for this event"}
+    if event.is_full:
+        return {"error": "Event is full"}
+    session.execute(event_registrations.insert().values(student_id=student_id, event_id=event_id))
+    event.current_registrations += 1
+    session.commit()
+    return {"success": True}
+
+
+def attempt(register, student_id):
+    session = database.get_session()
+    try:
+        result = register(session, student_id, EVENT_ID)
+        return "registered" if result.get("success") else result["error"]
+    except Exception as e:
+        session.rollback()
+        return f"exception: {type(e).__name__}"
+    finally:
+        session.close()
+
+
+def reset(engine, seats):
+    with engine.begin() as conn:
+        conn.execute(delete(event_registrations).where(event_registrations.c.event_id == EVENT_ID))
+        conn.execute(
+            update(Event.__table__)
+            .where(Event.__table__.c.id == EVENT_ID)
+            .values(max_seats=seats, current_registrations=0, date=datetime.utcnow() + timedelta(days=7))
+        )
+
+
+def run(label, register, engine, args):
+    reset(engine, args.seats)
+    attempts = [student_id for student_id in range(1, args.students + 1) for _ in range(args.repeat)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        outcomes = Counter(pool.map(lambda student_id: attempt(register, student_id), attempts))
+    elapsed = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        counter = conn.scalar(select(Event.current_registrations).where(Event.id == EVENT_ID))
+        rows = conn.scalar(select(func.count()).select_from(event_registrations).where(event_registrations.c.event_id == EVENT_ID))
+
+    exact = counter == rows == min(args.seats, args.students)
+    print(f"{label}: {len(attempts)} attempts in {elapsed:.2f} s ({len(attempts) / elapsed:.0f}/s)")
+    for outcome, count in outcomes.most_common():
+        print(f"    {count:6}  {outcome}")
+    print(f"    counter {counter}, registration rows {rows}, seats {args.seats}  "
+          f"{'[EXACT]' if exact else '[WRONG]'}\n")
+    return exact
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/registrations.db"
+        database.dispose_engine()
+        database.init_db()
+        engine = database.get_engine()
+        seed(engine, students=args.students, events=1, clubs=1, skills=1)
+
+        try:
+            run("original check-then-increment", legacy_register, engine, args)
+            exact = run("conditional UPDATE", register_for_event, engine, args)
+        finally:
+            database.dispose_engine()
+    return exact
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=3000)
+    parser.add_argument("--seats", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--database-url", default=None)
+    sys.exit(0 if main(parser.parse_args()) else 1)
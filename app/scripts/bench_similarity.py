@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SimilarityIndex lookups vs a per-request SQL scan of student_skills
+
+Reports latency of the SQL shared-skill aggregate, the posting-list exact
+lookup and the MinHash/LSH approximate lookup, plus the recall of the
+approximate top-10 against the exact Jaccard top-10.
+
+Run from app/:
+    python scripts/bench_similarity.py --students 50000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import desc, func, select
+import database
+from models import student_skills
+from services import SimilarityIndex
+from seed_data import seed
+
+
+def sql_top_k(session, student_id, skill_ids, k=10):
+    shared = func.count(student_skills.c.skill_id)
+    return session.execute(
+        select(student_skills.c.student_id, shared)
+        .where(student_skills.c.skill_id.in_(skill_ids), student_skills.c.student_id != student_id)
+        .group_by(student_skills.c.student_id)
+        .order_by(desc(shared), student_skills.c.student_id)
+        .limit(k)
+    ).all()
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/similarity.db"
+        database.init_db()
+        seed(database.get_engine(), students=args.students, events=10, clubs=5, skills=args.skills)
+
+        index = SimilarityIndex(ttl_seconds=3600)
+        session = database.get_session()
+        try:
+            _, load_ms = timed(index.load, session)
+            print(f"index over {args.students} students loaded in {load_ms:.0f} ms\n")
+
+            sql_ms, exact_ms, approx_ms, recall = [], [], [], []
+            for student_id in range(1, args.students + 1, max(1, args.students // args.samples)):
+                skill_ids = index.skills_of(student_id)
+
+                _, ms = timed(sql_top_k, session, student_id, skill_ids)
+                sql_ms.append(ms)
+                _, ms = timed(index.exact_top_k, student_id, skill_ids)
+                exact_ms.append(ms)
+                approximate, ms = timed(index.approximate_top_k, student_id, skill_ids)
+                approx_ms.append(ms)
+
+                # ground truth: exact Jaccard over everyone sharing a skill
+                overlap = index.exact_top_k(student_id, skill_ids, k=args.students)
+                jaccard = sorted(
+                    ((other, shared / len(skill_ids | index.skills_of(other))) for other, shared in overlap),
+                    key=lambda item: (-item[1], item[0])
+                )
+                if jaccard:
+                    threshold = jaccard[min(9, len(jaccard) - 1)][1]
+                    relevant = {other for other, score in jaccard if score >= threshold}
+                    found = [other for other, _ in approximate]
+                    recall.append(len(relevant.intersection(found)) / min(10, len(relevant)))
+        finally:
+            session.close()
+            database.dispose_engine()
+
+    for label, samples in (("SQL aggregate", sql_ms), ("exact postings", exact_ms), ("MinHash/LSH", approx_ms)):
+        print(f"  {label:15} p50 {statistics.median(samples):8.3f} ms   max {max(samples):8.3f} ms")
+    if recall:
+        print(f"\n  LSH recall@10 vs exact Jaccard: {statistics.mean(recall):.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--skills", type=int, default=300)
+    parser.add_argument("--samples", type=int, default=50)
+    main(parser.parse_args())
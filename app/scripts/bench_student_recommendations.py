@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark: precomputed per-student recommendations versus scoring on request
+
+Seeds a scratch SQLite database, builds the StudentRecommendationStore in bulk
+and checks that every student's stored list equals what the engine computes
+from scratch. It then applies the changes the store follows incrementally (a
+new event, a registration, a skill change, a trending flip, a deleted event),
+reporting each one the way the writers do, and checks again after each.
+Finally it times reads from the store against the engine.
+
+Run from app/:
+    python scripts/bench_student_recommendations.py --students 2000 --events 5000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import delete, insert, select, update
+import database
+from models import Event, Skill, Student, event_skills, student_skills
+from services import RecommendationEngine, StudentRecommendationStore, register_for_event
+from services.latency import percentile
+from seed_data import seed
+
+
+def mismatches(session, store, engine, student_ids, limit):
+    engine.invalidate()
+    return [
+        student_id for student_id in student_ids
+        if store.get(session, student_id, limit) != engine.recommend(session, student_id, limit)
+    ]
+
+
+def timed(label, function):
+    started = time.perf_counter()
+    result = function()
+    print(f"{label}: {(time.perf_counter() - started) * 1000:.1f} ms")
+    return result
+
+
+def main(args):
+    rng = random.Random(7)
+    engine = RecommendationEngine()
+    store = StudentRecommendationStore(top_n=args.top, engine=engine)
+    ok = True
+
+    with database.get_session() as session:
+        student_ids = session.scalars(select(Student.id)).all()
+        skill_ids = session.scalars(select(Skill.id)).all()
+        club_id = session.scalar(select(Event.club_id).limit(1))
+        sample = rng.sample(student_ids, min(args.sample, len(student_ids)))
+
+        timed(f"bulk load of {len(student_ids)} students", lambda: store.load(session))
+
+        def check(step):
+            nonlocal ok
+            wrong = mismatches(session, store, engine, sample, args.limit)
+            ok &= not wrong
+            print(f"  {step}: {len(sample) - len(wrong)}/{len(sample)} lists match the engine")
+
+        check("after load")
+
+        event_id = session.execute(insert(Event).values(
+            club_id=club_id, title="bench-new-event", event_type="workshop", location="Lab 1",
+            date=datetime.utcnow() + timedelta(days=3), is_trending=False, view_count=0,
+            current_registrations=0
+        )).inserted_primary_key[0]
+        session.execute(insert(event_skills), [{"event_id": event_id, "skill_id": s} for s in skill_ids[:3]])
+        session.commit()
+        store.event_changed(event_id)
+        timed("  merge of a new event for every student", lambda: store.get(session, sample[0], args.limit))
+        check("new event")
+
+        student_id = sample[1]
+        top = store.get(session, student_id, args.limit)
+        if top:
+            register_for_event(session, student_id, top[0]["item_id"])
+            store.student_changed(student_id)
+        check("registration")
+
+        student_id = sample[2]
+        session.execute(delete(student_skills).where(student_skills.c.student_id == student_id))
+        session.execute(insert(student_skills), [{"student_id": student_id, "skill_id": s} for s in skill_ids[-4:]])
+        session.commit()
+        store.student_changed(student_id)
+        check("skill change")
+
+        flipped = session.scalar(
+            select(Event.id).where(Event.date > datetime.utcnow(), Event.is_trending == False).limit(1)
+        )
+        session.execute(update(Event).where(Event.id == flipped).values(is_trending=True))
+        session.commit()
+        store.event_changed(flipped)
+        check("trending flip")
+
+        listed = store.get(session, sample[3], args.limit)
+        if listed:
+            session.execute(delete(Event).where(Event.id == listed[0]["item_id"]))
+            session.commit()
+            store.event_changed(listed[0]["item_id"])
+        check("deleted event")
+
+        stored, scored = [], []
+        for _ in range(args.repeat):
+            for student_id in sample:
+                started = time.perf_counter()
+                store.get(session, student_id, args.limit)
+                stored.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                engine.recommend(session, student_id, args.limit)
+                scored.append(time.perf_counter() - started)
+        for label, samples in (("stored lists ", stored), ("engine scoring", scored)):
+            samples.sort()
+            print(f"{label}: p50 {percentile(samples, 50) * 1000:7.3f} ms  p99 {percentile(samples, 99) * 1000:7.3f} ms")
+        print(store.stats())
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--clubs", type=int, default=50)
+    parser.add_argument("--sample", type=int, default=200)
+    parser.add_argument("--top", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/student_recommendations.db"
+        database.dispose_engine()
+        database.init_db()
+        seed(database.get_engine(), students=args.students, events=args.events, clubs=args.clubs, skills=40)
+        ok = main(args)
+        database.dispose_engine()
+    sys.exit(0 if ok else 1)
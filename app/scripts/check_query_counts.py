@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Check that every DatabaseTool operation runs a bounded number of SQL statements
+
+Seeds a small and a 20x larger scratch SQLite database, runs each operation on
+both and counts the statements it sends. Fails if an operation goes over its
+budget or if its statement count grows with the data (an N+1 lazy load).
+
+Run from app/:
+    python scripts/check_query_counts.py
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from datetime import datetime
+from sqlalchemy import event, select
+import database
+from models import Event, event_registrations
+from seed_data import seed
+
+# operation -> (parameters, max statements)
+OPERATIONS = {
+    "get_student": ({"student_id": 1}, 4),
+    "get_club": ({"club_id": 1}, 3),
+    "get_events": ({"limit": 20}, 2),
+    "search_events": ({"query": "workshop event"}, 1),
+    "get_trending_events": ({}, 1),
+    "get_recommendations": ({"student_id": 1}, 6),
+    "get_club_members": ({"club_id": 1}, 2),
+    "get_similar_students": ({"student_id": 1}, 5),
+    "get_all_students": ({}, 1),
+    "get_all_clubs": ({}, 1),
+    "get_all_skills": ({}, 1),
+    "update_profile": ({"student_id": 2, "bio": "hi", "skills": ["skill-1", "skill-2"]}, 6),
+    "register_event": ({"student_id": 3}, 3),
+}
+
+
+def count_statements(scale: int, workdir: str) -> dict:
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/scale_{scale}.db"
+    database.dispose_engine()
+    engine = database.get_engine()
+    database.init_db()
+    seed(engine, students=100 * scale, events=100 * scale, clubs=5 * scale, skills=20 * scale)
+
+    with engine.connect() as conn:
+        open_event_id = conn.scalar(
+            select(Event.id)
+            .where(Event.date > datetime.utcnow())
+            .where(Event.id.not_in(
+                select(event_registrations.c.event_id).where(event_registrations.c.student_id == 3)
+            ))
+            .order_by(Event.id)
+        )
+
+    from multi_agents.tools.databasetool import DatabaseTool
+    from services import recommendation_engine, similarity_index, trending_leaderboard, tool_cache
+    tool_cache.clear()
+    recommendation_engine.invalidate()
+    similarity_index.invalidate()
+    # loaded at app startup
+    session = database.get_session()
+    trending_leaderboard.load(session)
+    session.close()
+    tool = DatabaseTool()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    counts = {}
+    for operation, (parameters, _) in OPERATIONS.items():
+        if operation == "register_event":
+            parameters = dict(parameters, event_id=open_event_id)
+        statements.clear()
+        result = tool._run(operation, parameters)
+        if '"error"' in result[:20]:
+            raise SystemExit(f"{operation} failed: {result}")
+        counts[operation] = len(statements)
+
+    database.dispose_engine()
+    return counts
+
+
+def main() -> bool:
+    with tempfile.TemporaryDirectory() as workdir:
+        small = count_statements(1, workdir)
+        large = count_statements(20, workdir)
+
+    all_good = True
+    print(f"\n  {'operation':24} {'small':>6} {'large':>6} {'budget':>7}")
+    for operation, (_, budget) in OPERATIONS.items():
+        ok = large[operation] <= budget and small[operation] == large[operation]
+        all_good = all_good and ok
+        print(f"  {operation:24} {small[operation]:>6} {large[operation]:>6} {budget:>7}  {'[OK]' if ok else '[FAIL]'}")
+    print()
+    return all_good
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Migration: primary keys and indexes for the association tables and events
+
+- removes duplicate / NULL-keyed rows from student_skills, event_skills,
+  event_registrations and club_members
+- adds the composite primary keys and reverse-direction indexes declared in
+  models/relations.py
+- adds the composite events indexes declared in models/event.py, replacing
+  the earlier ix_events_date_is_trending (range column first)
+
+Safe to run more than once. Run from app/:
+    python scripts/migrate_association_keys.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+from database import get_engine
+from models import Event, student_skills, event_skills, event_registrations, club_members
+
+
+ASSOCIATION_TABLES = [student_skills, event_skills, event_registrations, club_members]
+
+
+def _key_columns(table):
+    return [column.name for column in table.primary_key.columns]
+
+
+def _has_primary_key(conn, table) -> bool:
+    constrained = inspect(conn).get_pk_constraint(table.name).get("constrained_columns") or []
+    return sorted(constrained) == sorted(_key_columns(table))
+
+
+def _migrate_postgres(conn, table):
+    keys = _key_columns(table)
+    null_keys = " OR ".join(f"{key} IS NULL" for key in keys)
+    same_keys = " AND ".join(f"a.{key} = b.{key}" for key in keys)
+
+    removed = conn.execute(text(f"DELETE FROM {table.name} WHERE {null_keys}")).rowcount
+    removed += conn.execute(text(
+        f"DELETE FROM {table.name} a USING {table.name} b "
+        f"WHERE a.ctid < b.ctid AND {same_keys}"
+    )).rowcount
+    conn.execute(text(f"ALTER TABLE {table.name} ADD PRIMARY KEY ({', '.join(keys)})"))
+    return removed
+
+
+def _migrate_sqlite(conn, table):
+    # SQLite cannot add a primary key in place: rebuild the table and copy the
+    # distinct rows across.
+    keys = _key_columns(table)
+    columns = ", ".join(column.name for column in table.columns)
+    not_null = " AND ".join(f"{key} IS NOT NULL" for key in keys)
+    before = conn.execute(text(f"SELECT COUNT(*) FROM {table.name}")).scalar()
+
+    conn.execute(text(f"ALTER TABLE {table.name} RENAME TO {table.name}_unkeyed"))
+    table.create(conn)
+    conn.execute(text(
+        f"INSERT OR IGNORE INTO {table.name} ({columns}) "
+        f"SELECT {columns} FROM {table.name}_unkeyed WHERE {not_null}"
+    ))
+    conn.execute(text(f"DROP TABLE {table.name}_unkeyed"))
+
+    after = conn.execute(text(f"SELECT COUNT(*) FROM {table.name}")).scalar()
+    return before - after
+
+
+def migrate():
+    engine = get_engine()
+    dialect = engine.dialect.name
+
+    with engine.begin() as conn:
+        for table in ASSOCIATION_TABLES:
+            if not inspect(conn).has_table(table.name):
+                print(f"  [SKIP] {table.name} does not exist (init_db will create it)")
+                continue
+
+            if _has_primary_key(conn, table):
+                print(f"  [OK] {table.name} already keyed on ({', '.join(_key_columns(table))})")
+            else:
+                if dialect == "postgresql":
+                    removed = _migrate_postgres(conn, table)
+                elif dialect == "sqlite":
+                    removed = _migrate_sqlite(conn, table)
+                else:
+                    raise RuntimeError(f"Unsupported database dialect: {dialect}")
+                print(f"  [DONE] {table.name} keyed on ({', '.join(_key_columns(table))}), "
+                      f"{removed} duplicate or incomplete rows removed")
+
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+        conn.execute(text("DROP INDEX IF EXISTS ix_events_date_is_trending"))
+        for index in Event.__table__.indexes:
+            index.create(conn, checkfirst=True)
+        print("  [DONE] indexes created")
+
+
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("  Association keys migration")
+    print("="*60 + "\n")
+    migrate()
+    print()
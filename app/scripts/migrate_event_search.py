@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Migration: full-text search index for events
+
+- Postgres: adds the generated, weighted events.search_vector column and its
+  GIN index
+- SQLite: creates the events_fts FTS5 mirror and its sync triggers, then
+  rebuilds it from the existing rows
+
+The DDL lives in models/search.py. Safe to run more than once. Run from app/:
+    python scripts/migrate_event_search.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+from database import get_engine
+from models import POSTGRES_SEARCH_DDL, SQLITE_SEARCH_DDL
+
+
+def migrate():
+    engine = get_engine()
+    dialect = engine.dialect.name
+
+    with engine.begin() as conn:
+        if not inspect(conn).has_table("events"):
+            print("  [SKIP] events does not exist (init_db will create it)")
+            return
+
+        if dialect == "postgresql":
+            for statement in POSTGRES_SEARCH_DDL:
+                conn.execute(text(statement))
+            print("  [DONE] events.search_vector and ix_events_search_vector")
+        elif dialect == "sqlite":
+            for statement in SQLITE_SEARCH_DDL:
+                conn.execute(text(statement))
+            conn.execute(text("INSERT INTO events_fts(events_fts) VALUES ('rebuild')"))
+            indexed = conn.execute(text("SELECT COUNT(*) FROM events_fts")).scalar()
+            print(f"  [DONE] events_fts and triggers, {indexed} events indexed")
+        else:
+            raise RuntimeError(f"Unsupported database dialect: {dialect}")
+
+
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("  Event search migration")
+    print("="*60 + "\n")
+    migrate()
+    print()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Migration: events.trending_score for the trending leaderboard
+
+- adds the nullable events.trending_score column and its index declared in
+  models/event.py
+
+Rows start NULL; the leaderboard seeds them from view_count and
+current_registrations on its next load. Safe to run more than once. Run from app/:
+    python scripts/migrate_trending_score.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+from database import get_engine
+from models import Event
+
+
+def migrate():
+    engine = get_engine()
+
+    with engine.begin() as conn:
+        if not inspect(conn).has_table("events"):
+            print("  [SKIP] events does not exist (init_db will create it)")
+            return
+
+        columns = {column["name"] for column in inspect(conn).get_columns("events")}
+        if "trending_score" in columns:
+            print("  [OK] events.trending_score already exists")
+        else:
+            column_type = Event.__table__.c.trending_score.type.compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE events ADD COLUMN trending_score {column_type}"))
+            print("  [DONE] events.trending_score added")
+
+        for index in Event.__table__.indexes:
+            if "trending_score" in index.columns:
+                index.create(conn, checkfirst=True)
+        print("  [DONE] index created")
+
+
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("  Trending score migration")
+    print("="*60 + "\n")
+    migrate()
+    print()
@@ -0,0 +1,76 @@
+"""
+Synthetic ClubEvent Hub data for the benchmark and check scripts
+
+Inserts with Core executemany so large data sets seed in seconds. Ids are
+1..N for every table, a fixed RNG seed keeps runs comparable.
+"""
+import random
+from datetime import datetime, timedelta
+
+from models import (
+    Student, Club, Event, Skill,
+    student_skills, event_skills, event_registrations, club_members
+)
+
+
+def seed(engine, students=1000, events=1000, clubs=50, skills=100, rng_seed=42):
+    rng = random.Random(rng_seed)
+    now = datetime.utcnow()
+
+    def pairs(owners, targets, per_owner):
+        per_owner = min(per_owner, targets)
+        return {(o, t) for o in range(1, owners + 1) for t in rng.sample(range(1, targets + 1), per_owner)}
+
+    with engine.begin() as conn:
+        conn.execute(Skill.__table__.insert(), [
+            {"id": i, "name": f"skill-{i}", "category": "technical"} for i in range(1, skills + 1)
+        ])
+        conn.execute(Club.__table__.insert(), [
+            {
+                "id": i,
+                "name": f"club-{i}",
+                "email": f"club{i}@example.com",
+                "password_hash": "x",
+                "description": f"Club number {i}",
+                "personality_style": "friendly"
+            }
+            for i in range(1, clubs + 1)
+        ])
+        conn.execute(Student.__table__.insert(), [
+            {
+                "id": i,
+                "name": f"student-{i}",
+                "email": f"student{i}@example.com",
+                "password_hash": "x",
+                "field_of_study": "Computer Science",
+                "year_level": i % 5 + 1
+            }
+            for i in range(1, students + 1)
+        ])
+        conn.execute(Event.__table__.insert(), [
+            {
+                "id": i,
+                "club_id": rng.randint(1, clubs),
+                "title": f"event-{i}",
+                "description": f"Workshop number {i}",
+                "event_type": rng.choice(["workshop", "hackathon", "social", "competition"]),
+                "location": "Main hall",
+                "date": now + timedelta(days=rng.randint(-180, 180), minutes=rng.randint(0, 1440)),
+                "is_trending": rng.random() < 0.05,
+                "view_count": rng.randint(0, 500),
+                "current_registrations": 0,
+            }
+            for i in range(1, events + 1)
+        ])
+        conn.execute(student_skills.insert(), [
+            {"student_id": s, "skill_id": k} for s, k in pairs(students, skills, 5)
+        ])
+        conn.execute(event_skills.insert(), [
+            {"event_id": e, "skill_id": k} for e, k in pairs(events, skills, 3)
+        ])
+        conn.execute(event_registrations.insert(), [
+            {"student_id": s, "event_id": e} for s, e in pairs(students, events, 4)
+        ])
+        conn.execute(club_members.insert(), [
+            {"student_id": s, "club_id": c} for s, c in pairs(students, clubs, 2)
+        ])
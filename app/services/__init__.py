@@ -0,0 +1,41 @@
+from .recommendations import RecommendationEngine, EventSnapshot, recommendation_engine
+from .similarity import SimilarityIndex, similarity_index
+from .trending import TrendingLeaderboard, trending_leaderboard
+from .views import ViewCounter, view_counter
+from .cache import ToolCache, tool_cache
+from .search import search_events, search_terms
+from .registrations import register_for_event, cancel_registration, waitlist_position
+from .latency import LatencyStats, query_latency
+from .response_cache import ResponseCache, response_cache
+from .club_context import ClubContextCache, club_context_cache
+from .club_knowledge import ClubKnowledge, club_knowledge
+from .student_recommendations import StudentRecommendationStore, student_recommendations
+
+__all__ = [
+    'RecommendationEngine',
+    'EventSnapshot',
+    'recommendation_engine',
+    'SimilarityIndex',
+    'similarity_index',
+    'TrendingLeaderboard',
+    'trending_leaderboard',
+    'ViewCounter',
+    'view_counter',
+    'ToolCache',
+    'tool_cache',
+    'search_events',
+    'search_terms',
+    'register_for_event',
+    'cancel_registration',
+    'waitlist_position',
+    'LatencyStats',
+    'query_latency',
+    'ResponseCache',
+    'response_cache',
+    'ClubContextCache',
+    'club_context_cache',
+    'ClubKnowledge',
+    'club_knowledge',
+    'StudentRecommendationStore',
+    'student_recommendations'
+]
@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+
+Tag = Tuple[str, Optional[str]]
+
+
+def _tag(kind: str, row_id=None) -> Tag:
+    # "5" and 5 must name the same row
+    return (kind, None if row_id is None else str(row_id))
+
+
+class ToolCache:
+    """Read-through LRU cache for DatabaseTool results with TTL.
+
+    Every entry is tagged with the rows it was built from: ``(kind, id)`` for
+    one row, ``(kind, None)`` for "any row of that kind" (listings, lookups by
+    name). ``invalidate(kind, id)`` drops the entries of that row plus every
+    "any row" entry of the kind; ``invalidate(kind)`` drops the whole kind.
+
+    Invalidation only reaches this process, so ``ttl_seconds`` bounds how long
+    another worker's write can stay unseen.
+
+    Invalidations also bump per-row and per-kind version counters; ``stamp``
+    reads them for caches of derived data (agent responses) that keep their
+    own entries but expire on the same writes.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        if max_entries is None:
+            max_entries = int(os.getenv("TOOL_CACHE_SIZE", 1024))
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("TOOL_CACHE_TTL", 30))
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str, Set[Tag]]]" = OrderedDict()
+        self._by_tag: Dict[Tag, Set[str]] = {}
+        self._by_kind: Dict[str, Set[str]] = {}
+        self._generation = 0
+        self._epoch = 0
+        self._row_versions: Dict[Tag, int] = {}
+        self._kind_versions: Dict[str, int] = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    @staticmethod
+    def key(operation: str, parameters: Dict[str, Any]) -> str:
+        return json.dumps([operation, parameters], sort_keys=True, default=str)
+
+    @property
+    def generation(self) -> int:
+        """Bumped by every invalidation, see ``put``"""
+        return self._generation
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._drop(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def put(self, key: str, value: str, tags: Iterable[Tag], generation: int):
+        """Store ``value`` unless a write invalidated anything since ``generation``
+        was read: the value may have been computed from rows that changed."""
+        tags = {_tag(*tag) for tag in tags}
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, tags)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+                self._by_kind.setdefault(tag[0], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def stamp(self, tags: Iterable[Tag]) -> Tuple[int, ...]:
+        """Versions of the given tags, changed by any write that would
+        invalidate a cache entry with those tags"""
+        with self._lock:
+            versions = [self._epoch]
+            for kind, row_id in tags:
+                if row_id is None:
+                    versions.append(self._kind_versions.get(kind, 0))
+                else:
+                    # the row itself, or the whole kind at once
+                    versions.append(self._row_versions.get(_tag(kind, row_id), 0) + self._row_versions.get(_tag(kind), 0))
+            return tuple(versions)
+
+    def invalidate(self, kind: str, row_id=None):
+        with self._lock:
+            self._generation += 1
+            self._kind_versions[kind] = self._kind_versions.get(kind, 0) + 1
+            tag = _tag(kind, row_id)
+            self._row_versions[tag] = self._row_versions.get(tag, 0) + 1
+            if row_id is None:
+                keys = set(self._by_kind.get(kind, ()))
+            else:
+                keys = self._by_tag.get(_tag(kind, row_id), set()) | self._by_tag.get(_tag(kind), set())
+            for key in list(keys):
+                self._drop(key)
+            self._stats["invalidations"] += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._epoch += 1
+            self._entries.clear()
+            self._by_tag.clear()
+            self._by_kind.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            for index, index_key in ((self._by_tag, tag), (self._by_kind, tag[0])):
+                keys = index.get(index_key)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del index[index_key]
+
+
+tool_cache = ToolCache()
@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models import Club, Event, club_members
+
+
+# Longest description excerpt kept in a pack; the rest of the club's text
+# reaches the chatbot as passages retrieved for the question (club_knowledge)
+DESCRIPTION_LIMIT = 300
+UPCOMING_EVENTS = 5
+
+
+def _excerpt(text: Optional[str], limit: int) -> Optional[str]:
+    if not text:
+        return None
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + "…"
+
+
+class ClubContextCache:
+    """Compact per-club fact sheet for the club chatbot's task description.
+
+    A pack holds what most club questions need (a description excerpt,
+    contact, member count, next events), so the chatbot can answer in one LLM
+    call. ``load`` builds packs in bulk with three queries;
+    ``get`` builds a missing one on demand.
+
+    The clubs and events routers call ``invalidate(club_id)`` after writes.
+    Memberships and the passing of time are not tracked, ``ttl_seconds``
+    bounds how stale those get.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_clubs: Optional[int] = None):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("CLUB_CONTEXT_TTL", 300))
+        if max_clubs is None:
+            max_clubs = int(os.getenv("CLUB_CONTEXT_SIZE", 4096))
+        self.ttl_seconds = ttl_seconds
+        self.max_clubs = max_clubs
+
+        self._lock = threading.Lock()
+        self._packs: "OrderedDict[int, Tuple[float, str]]" = OrderedDict()
+        self._generation = 0
+        self._stats = {"hits": 0, "builds": 0, "invalidations": 0}
+
+    def get(self, session: Session, club_id: int) -> Optional[str]:
+        """Pack of ``club_id``, None when there is no such club"""
+        with self._lock:
+            entry = self._packs.get(club_id)
+            if entry is not None and entry[0] >= time.monotonic():
+                self._packs.move_to_end(club_id)
+                self._stats["hits"] += 1
+                return entry[1]
+        return self.load(session, [club_id]).get(club_id)
+
+    def load(self, session: Session, club_ids: Optional[Iterable[int]] = None) -> Dict[int, str]:
+        """Build and store the packs of ``club_ids``, every club by default"""
+        with self._lock:
+            generation = self._generation
+        packs = build_packs(session, None if club_ids is None else list(club_ids))
+
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            # a write while building may have made these stale
+            if generation == self._generation:
+                for club_id, pack in packs.items():
+                    self._packs[club_id] = (expires_at, pack)
+                    self._packs.move_to_end(club_id)
+                while len(self._packs) > self.max_clubs:
+                    self._packs.popitem(last=False)
+            self._stats["builds"] += len(packs)
+        return packs
+
+    def invalidate(self, club_id: Optional[int] = None):
+        with self._lock:
+            self._generation += 1
+            if club_id is None:
+                self._packs.clear()
+            else:
+                self._packs.pop(club_id, None)
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, clubs=len(self._packs))
+
+
+def build_packs(session: Session, club_ids: Optional[List[int]] = None) -> Dict[int, str]:
+    clubs = select(Club.id, Club.name, Club.description, Club.contact_email, Club.website)
+    members = select(club_members.c.club_id, func.count()).group_by(club_members.c.club_id)
+    rank = func.row_number().over(partition_by=Event.club_id, order_by=(Event.date, Event.id)).label("rank")
+    upcoming = select(
+        Event.club_id, Event.title, Event.event_type, Event.date, Event.location, rank
+    ).where(Event.date > datetime.utcnow())
+    if club_ids is not None:
+        clubs = clubs.where(Club.id.in_(club_ids))
+        members = members.where(club_members.c.club_id.in_(club_ids))
+        upcoming = upcoming.where(Event.club_id.in_(club_ids))
+
+    member_counts = dict(session.execute(members).all())
+    events: Dict[int, List[str]] = {}
+    upcoming = upcoming.subquery()
+    for club_id, title, event_type, date, location, _ in session.execute(
+        select(upcoming).where(upcoming.c.rank <= UPCOMING_EVENTS).order_by(upcoming.c.club_id, upcoming.c.rank)
+    ):
+        line = f"- {title}"
+        if event_type:
+            line += f" ({event_type})"
+        line += f" on {date:%a %d %b %Y at %H:%M}"
+        if location:
+            line += f", {location}"
+        events.setdefault(club_id, []).append(line)
+
+    packs = {}
+    for club_id, name, description, contact_email, website in session.execute(clubs):
+        lines = [f"Club: {name} (id {club_id}), {member_counts.get(club_id, 0)} members"]
+        description = _excerpt(description, DESCRIPTION_LIMIT)
+        if description:
+            lines.append(f"About: {description}")
+        if contact_email:
+            lines.append(f"Contact: {contact_email}")
+        if website:
+            lines.append(f"Website: {website}")
+        lines.append("Upcoming events:")
+        lines.extend(events.get(club_id) or ["- none scheduled"])
+        packs[club_id] = "\n".join(lines)
+    return packs
+
+
+club_context_cache = ClubContextCache()
@@ -0,0 +1,227 @@
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Club, Event
+
+
+CHUNK_WORDS = 80
+# events older than this are left out of a club's knowledge
+EVENT_HORIZON = timedelta(days=365)
+MAX_EVENTS = 200
+
+K1 = 1.5
+B = 0.75
+
+STOPWORDS = set("""
+a an the and or but of to in on at for by with from as is are was were be been it its this that
+these those we our you your they their he she his her i me my do does did what when where who how
+which can will would should could about into than then so if not no
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+Source = Tuple[str, Hashable]
+
+
+def stem(word: str) -> str:
+    """Strip the commonest suffixes so "meetings" finds "meet" """
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        word = word[:-1]
+    for suffix in ("ing", "ed"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(word) for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+def chunk(text: str, words: int = CHUNK_WORDS) -> List[str]:
+    """Sentence-aligned chunks of about ``words`` words"""
+    chunks, current, size = [], [], 0
+    for sentence in _SENTENCE.split(text or ""):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        current.append(sentence)
+        size += len(sentence.split())
+        if size >= words:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+class ClubIndex:
+    """BM25 over one club's chunks, kept per source so a changed event only
+    re-chunks that event. A stored index is not modified: a refresh works on
+    a ``copy`` and builds it before it replaces the old one, so searches need
+    no lock."""
+
+    def __init__(self, sources: Optional[Dict[Source, List[Tuple[str, Counter]]]] = None):
+        self.sources: Dict[Source, List[Tuple[str, Counter]]] = dict(sources or {})
+        self.dirty: Set[Source] = set()
+        self._built = None
+
+    def copy(self) -> "ClubIndex":
+        return ClubIndex(self.sources)
+
+    def set_source(self, source: Source, passages: List[str]):
+        if passages:
+            self.sources[source] = [(passage, Counter(tokenize(passage))) for passage in passages]
+        else:
+            self.sources.pop(source, None)
+        self._built = None
+
+    def build(self) -> "ClubIndex":
+        passages = [passage for chunks in self.sources.values() for passage, _ in chunks]
+        counts = [tokens for chunks in self.sources.values() for _, tokens in chunks]
+        vocabulary = {term: i for i, term in enumerate(sorted(set().union(*counts)))} if counts else {}
+        tf = np.zeros((len(counts), len(vocabulary)), dtype=np.float32)
+        for row, tokens in enumerate(counts):
+            for term, count in tokens.items():
+                tf[row, vocabulary[term]] = count
+        lengths = tf.sum(axis=1)
+        average = lengths.mean() if len(lengths) else 1.0
+        df = (tf > 0).sum(axis=0)
+        idf = np.log(1 + (len(counts) - df + 0.5) / (df + 0.5)).astype(np.float32)
+        # BM25 term weights, computed once per rebuild
+        matrix = tf * (K1 + 1) / (tf + K1 * (1 - B + B * lengths[:, None] / max(average, 1e-9)))
+        self._built = (passages, vocabulary, idf, matrix)
+        return self
+
+    def search(self, question: str, k: int) -> List[str]:
+        passages, vocabulary, idf, matrix = self._built or self.build()._built
+        columns = [vocabulary[term] for term in set(tokenize(question)) if term in vocabulary]
+        if not columns or not passages:
+            return []
+        scores = matrix[:, columns] @ idf[columns]
+        top = np.argsort(-scores, kind="stable")[:k]
+        return [passages[i] for i in top if scores[i] > 0]
+
+
+class ClubKnowledge:
+    """Per-club passage retrieval for the club chatbot.
+
+    Club description, mission and history and the descriptions of the club's
+    recent and upcoming events are split into sentence-aligned chunks and
+    indexed with BM25; ``passages`` returns the top-k chunks for a question
+    instead of the full texts.
+
+    Writers call ``invalidate(club_id)`` after a club change and
+    ``invalidate(club_id, event_id)`` after an event change; the next query
+    re-reads only those rows. At most ``max_clubs`` indexes are kept.
+    Reads and index builds run outside the lock; a result is only stored
+    when no invalidation came in meanwhile, like ``ClubContextCache.load``.
+    """
+
+    def __init__(self, max_clubs: Optional[int] = None):
+        if max_clubs is None:
+            max_clubs = int(os.getenv("CLUB_KNOWLEDGE_SIZE", 1024))
+        self.max_clubs = max_clubs
+        self._lock = threading.Lock()
+        self._indexes: "OrderedDict[int, ClubIndex]" = OrderedDict()
+        self._generation = 0
+
+    def passages(self, session: Session, club_id: int, question: str, k: int = 3) -> List[str]:
+        with self._lock:
+            generation = self._generation
+            index = self._indexes.get(club_id)
+            if index is not None:
+                self._indexes.move_to_end(club_id)
+                dirty = set(index.dirty)
+
+        if index is None:
+            updated = self._load(session, club_id)
+        elif dirty:
+            updated = self._refresh(session, club_id, index, dirty)
+        else:
+            return index.search(question, k)
+
+        with self._lock:
+            # a write while reading may have made the result stale
+            if generation == self._generation and self._indexes.get(club_id) is index:
+                if updated is None:
+                    self._indexes.pop(club_id, None)
+                else:
+                    self._indexes[club_id] = updated
+                    self._indexes.move_to_end(club_id)
+                while len(self._indexes) > self.max_clubs:
+                    self._indexes.popitem(last=False)
+        return updated.search(question, k) if updated is not None else []
+
+    def invalidate(self, club_id: int, event_id: Optional[int] = None):
+        with self._lock:
+            self._generation += 1
+            index = self._indexes.get(club_id)
+            if index is not None:
+                index.dirty.add(("event", event_id) if event_id is not None else ("club", club_id))
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._indexes.clear()
+
+    def _load(self, session: Session, club_id: int) -> Optional[ClubIndex]:
+        club = session.get(Club, club_id)
+        if club is None:
+            return None
+        index = ClubIndex()
+        self._set_club(index, club)
+        events = session.scalars(
+            select(Event).where(Event.club_id == club_id, Event.date >= datetime.utcnow() - EVENT_HORIZON)
+            .order_by(Event.date.desc()).limit(MAX_EVENTS)
+        )
+        for event in events:
+            index.set_source(("event", event.id), _event_chunks(event))
+        return index.build()
+
+    def _refresh(self, session: Session, club_id: int, index: ClubIndex, dirty: Set[Source]) -> Optional[ClubIndex]:
+        """A rebuilt copy of ``index`` with the ``dirty`` rows read again,
+        None when the club is gone"""
+        index = index.copy()
+        if ("club", club_id) in dirty:
+            club = session.get(Club, club_id)
+            if club is None:
+                return None
+            self._set_club(index, club)
+        event_ids = [row_id for kind, row_id in dirty if kind == "event"]
+        if event_ids:
+            events = {
+                event.id: event for event in session.scalars(
+                    select(Event).where(Event.id.in_(event_ids), Event.club_id == club_id)
+                )
+            }
+            for event_id in event_ids:
+                event = events.get(event_id)
+                index.set_source(("event", event_id), _event_chunks(event) if event is not None else [])
+        return index.build()
+
+    @staticmethod
+    def _set_club(index: ClubIndex, club: Club):
+        for field in ("description", "mission", "history"):
+            index.set_source(("club", field), [f"{field.title()}: {text}" for text in chunk(getattr(club, field))])
+
+
+def _event_chunks(event: Event) -> List[str]:
+    heading = f"Event {event.title}"
+    if event.event_type:
+        heading += f" ({event.event_type})"
+    heading += f" on {event.date:%d %b %Y}"
+    return [f"{heading}: {text}" for text in chunk(event.description)] or [heading]
+
+
+club_knowledge = ClubKnowledge()
@@ -0,0 +1,47 @@
+import math
+import threading
+from collections import deque
+from typing import Deque, Dict
+
+
+class LatencyStats:
+    """Rolling per-path latency samples with p50/p99.
+
+    Keeps the last ``window`` samples of each path, so the percentiles follow
+    current traffic rather than the whole process lifetime.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, path: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(path, deque(maxlen=self.window)).append(seconds)
+            self._counts[path] = self._counts.get(path, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            samples = {path: sorted(values) for path, values in self._samples.items()}
+            counts = dict(self._counts)
+        return {
+            path: {
+                "count": counts[path],
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+            }
+            for path, values in samples.items()
+        }
+
+
+def percentile(ordered, q: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered), math.ceil(q / 100 * len(ordered))) - 1)
+    return ordered[rank]
+
+
+query_latency = LatencyStats()
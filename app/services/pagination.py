@@ -0,0 +1,63 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.sql import Select
+
+
+# One paging contract for the REST list endpoints and the DatabaseTool list
+# operations: ``limit`` rows after an opaque ``cursor``, ordered by id, and
+# {"items", "next_cursor", "total"} back (total only when asked for).
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"after": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Id the page starts after, None for the first page. Raises ValueError."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        after = json.loads(raw)["after"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(after, int):
+        raise ValueError("Invalid cursor")
+    return after
+
+
+def page_size(limit: Any) -> int:
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def keyset(statement: Select, id_column, limit: int, after: Optional[int]) -> Select:
+    """The page of ``statement`` after id ``after``, plus one row to tell if more follow"""
+    if after is not None:
+        statement = statement.where(id_column > after)
+    return statement.order_by(id_column).limit(limit + 1)
+
+
+def count_of(statement: Select) -> Select:
+    return select(func.count()).select_from(statement.order_by(None).subquery())
+
+
+def page(items: List[Dict[str, Any]], limit: int, total: Optional[int] = None) -> Dict[str, Any]:
+    """Envelope for the rows of a ``keyset`` query, serialized with their "id" """
+    has_more = len(items) > limit
+    items = items[:limit]
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(items[-1]["id"]) if has_more else None,
+        "total": total
+    }
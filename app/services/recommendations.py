@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Club, Event, Skill, student_skills, event_skills, event_registrations, club_members
+
+
+# Scoring weights, shared with the reasons shown to students
+SKILL_MATCH_POINTS = 25
+SAME_CLUB_POINTS = 30
+TRENDING_POINTS = 15
+VIEW_POINTS = 0.05
+
+
+class EventSnapshot:
+    """Array-backed view of the upcoming events and their required skills.
+
+    The event x skill matrix is kept in CSR form: the skills of event ``i`` are
+    ``skill_ids[indptr[i]:indptr[i + 1]]`` (sorted by skill id) and
+    ``pair_rows`` repeats ``i`` once per required skill so a whole column mask
+    can be reduced with one ``np.bincount``.
+    """
+
+    def __init__(self, rows, skill_rows, built_at: float):
+        self.built_at = built_at
+        self.size = len(rows)
+
+        self.event_ids = np.fromiter((r.id for r in rows), dtype=np.int64, count=self.size)
+        self.club_ids = np.fromiter((r.club_id for r in rows), dtype=np.int64, count=self.size)
+        self.trending = np.fromiter((bool(r.is_trending) for r in rows), dtype=bool, count=self.size)
+        self.views = np.fromiter((r.view_count or 0 for r in rows), dtype=np.float64, count=self.size)
+        self.dates = np.array([r.date for r in rows], dtype="datetime64[us]")
+
+        # Only materialised for the handful of events that make the top-N
+        self.titles = [r.title for r in rows]
+        self.club_names = [r.club_name for r in rows]
+        self.locations = [r.location for r in rows]
+        self.date_values = [r.date for r in rows]
+
+        position = {event_id: i for i, event_id in enumerate(self.event_ids.tolist())}
+        pair_rows = np.fromiter((position[r.event_id] for r in skill_rows), dtype=np.int64, count=len(skill_rows))
+        skill_ids = np.fromiter((r.skill_id for r in skill_rows), dtype=np.int64, count=len(skill_rows))
+        order = np.lexsort((skill_ids, pair_rows))
+        self.pair_rows = pair_rows[order]
+        self.skill_ids = skill_ids[order]
+        self.indptr = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.pair_rows, minlength=self.size), out=self.indptr[1:])
+        self.skill_names = {r.skill_id: r.skill_name for r in skill_rows}
+
+        self._position = position
+
+    def positions(self, event_ids) -> np.ndarray:
+        return np.array([self._position[e] for e in event_ids if e in self._position], dtype=np.int64)
+
+
+class RecommendationEngine:
+    """Scores every upcoming event for a student in one vectorised pass.
+
+    Produces the same ranking and reasons as the original per-event loop in
+    ``DatabaseTool._get_recommendations``: 25 points per matching skill, 30 for
+    an event of one of the student's clubs, 15 if trending, plus 0.05 per view.
+    The event snapshot is rebuilt after ``ttl_seconds`` or when a write calls
+    ``invalidate()``; the per-student inputs are read fresh on every call.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("RECOMMENDATION_SNAPSHOT_TTL", 60))
+        self.ttl_seconds = ttl_seconds
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._snapshot = None
+
+    def snapshot(self, session: Session) -> EventSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None or time.monotonic() - snapshot.built_at > self.ttl_seconds:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None or time.monotonic() - snapshot.built_at > self.ttl_seconds:
+                    snapshot = self._build(session)
+                    self._snapshot = snapshot
+        return snapshot
+
+    def events(self, session: Session, event_ids: Iterable[int]) -> EventSnapshot:
+        """Uncached snapshot of just ``event_ids`` (those still upcoming)"""
+        return self._build(session, list(event_ids))
+
+    def _build(self, session: Session, event_ids: Optional[List[int]] = None) -> EventSnapshot:
+        built_at = time.monotonic()
+        now = datetime.utcnow()
+
+        rows = (
+            select(
+                Event.id, Event.club_id, Event.title, Event.location, Event.date,
+                Event.is_trending, Event.view_count, Club.name.label("club_name")
+            )
+            .join(Club, Club.id == Event.club_id)
+            .where(Event.date > now)
+            .order_by(Event.date, Event.id)
+        )
+        skill_rows = (
+            select(event_skills.c.event_id, Skill.id.label("skill_id"), Skill.name.label("skill_name"))
+            .join(Skill, Skill.id == event_skills.c.skill_id)
+            .join(Event, Event.id == event_skills.c.event_id)
+            .where(Event.date > now)
+        )
+        if event_ids is not None:
+            rows = rows.where(Event.id.in_(event_ids))
+            skill_rows = skill_rows.where(Event.id.in_(event_ids))
+
+        return EventSnapshot(session.execute(rows).all(), session.execute(skill_rows).all(), built_at)
+
+    def score(self, snapshot: EventSnapshot, skill_ids, club_ids, registered_event_ids):
+        """Return (score, skill_matches, same_club, eligible) arrays over the snapshot"""
+        if snapshot.skill_ids.size:
+            wanted = np.isin(snapshot.skill_ids, np.fromiter(skill_ids, dtype=np.int64))
+            skill_matches = np.bincount(snapshot.pair_rows[wanted], minlength=snapshot.size)
+        else:
+            skill_matches = np.zeros(snapshot.size, dtype=np.int64)
+        same_club = np.isin(snapshot.club_ids, np.fromiter(club_ids, dtype=np.int64))
+
+        score = (
+            skill_matches * SKILL_MATCH_POINTS
+            + same_club * SAME_CLUB_POINTS
+            + snapshot.trending * TRENDING_POINTS
+            + snapshot.views * VIEW_POINTS
+        )
+
+        eligible = snapshot.dates > np.datetime64(datetime.utcnow(), "us")
+        eligible[snapshot.positions(registered_event_ids)] = False
+        eligible &= (score > 0) | (skill_matches > 0) | same_club | snapshot.trending
+
+        return score, skill_matches, same_club, eligible
+
+    def recommend(self, session: Session, student_id: int, limit: int = 15) -> List[Dict]:
+        snapshot = self.snapshot(session)
+        return self.top(snapshot, *self.inputs(session, student_id), limit)
+
+    def inputs(self, session: Session, student_id: int) -> Tuple[Set[int], Set[int], Set[int]]:
+        """(skill_ids, club_ids, registered_event_ids) of a student"""
+        skill_ids = set(session.scalars(
+            select(student_skills.c.skill_id).where(student_skills.c.student_id == student_id)
+        ))
+        club_ids = set(session.scalars(
+            select(club_members.c.club_id).where(club_members.c.student_id == student_id)
+        ))
+        registered_event_ids = set(session.scalars(
+            select(event_registrations.c.event_id).where(event_registrations.c.student_id == student_id)
+        ))
+        return skill_ids, club_ids, registered_event_ids
+
+    def top(self, snapshot: EventSnapshot, skill_ids, club_ids, registered_event_ids, limit: int = 15) -> List[Dict]:
+        score, skill_matches, same_club, eligible = self.score(snapshot, skill_ids, club_ids, registered_event_ids)
+
+        candidates = np.flatnonzero(eligible)
+        if candidates.size == 0:
+            return []
+
+        # Ranking uses the rounded score; ties go to the sooner event (snapshot order)
+        rounded = np.round(score[candidates], 2)
+        if candidates.size > limit:
+            cutoff = np.partition(rounded, candidates.size - limit)[candidates.size - limit]
+            keep = rounded >= cutoff
+            candidates, rounded = candidates[keep], rounded[keep]
+        order = np.argsort(-rounded, kind="stable")[:limit]
+
+        recommendations = []
+        for i in candidates[order].tolist():
+            reasons = []
+            if skill_matches[i]:
+                event_skill_ids = snapshot.skill_ids[snapshot.indptr[i]:snapshot.indptr[i + 1]].tolist()
+                names = [snapshot.skill_names[s] for s in event_skill_ids if s in skill_ids]
+                reasons.append(f"Matches your skills: {', '.join(names)}")
+            if same_club[i]:
+                reasons.append("Your club's event")
+            if snapshot.trending[i]:
+                reasons.append("Trending event")
+
+            recommendations.append({
+                "item_id": int(snapshot.event_ids[i]),
+                "item_type": "event",
+                "title": snapshot.titles[i],
+                "club_name": snapshot.club_names[i],
+                "date": snapshot.date_values[i].isoformat(),
+                "location": snapshot.locations[i],
+                "score": round(float(score[i]), 2),
+                "reasons": reasons if reasons else ["Popular event"]
+            })
+        return recommendations
+
+
+recommendation_engine = RecommendationEngine()
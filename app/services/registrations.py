@@ -0,0 +1,162 @@
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import and_, exists, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import Event, Student, event_registrations, event_waitlist
+from .trending import trending_leaderboard
+
+
+_events = Event.__table__
+
+
+def _registered(student_id: int, event_id: int):
+    return exists().where(
+        event_registrations.c.student_id == student_id,
+        event_registrations.c.event_id == event_id
+    )
+
+
+def register_for_event(session: Session, student_id: int, event_id: int, waitlist: bool = False) -> Dict:
+    """Reserve a seat for ``student_id`` on ``event_id``.
+
+    The seat is taken by one conditional UPDATE that only matches while the
+    event is upcoming and has room, so concurrent registrations can never
+    oversell; the (student_id, event_id) primary key of event_registrations
+    rejects double registration. With ``waitlist`` a student refused because
+    the event is full is queued instead.
+    """
+    if not session.query(exists().where(Student.id == student_id)).scalar():
+        return {"error": "Student or event not found"}
+
+    seats_taken = func.coalesce(_events.c.current_registrations, 0)
+    reserved = session.execute(
+        update(_events)
+        .where(
+            _events.c.id == event_id,
+            _events.c.date > datetime.utcnow(),
+            or_(_events.c.max_seats.is_(None), seats_taken < _events.c.max_seats)
+        )
+        .values(current_registrations=seats_taken + 1)
+        .returning(_events.c.id, _events.c.title, _events.c.date)
+    ).first()
+
+    if reserved is None:
+        session.rollback()
+        return _refused(session, student_id, event_id, waitlist)
+
+    try:
+        session.execute(event_registrations.insert().values(student_id=student_id, event_id=event_id))
+        session.commit()
+    except IntegrityError:
+        # already registered: give the seat back
+        session.rollback()
+        return {"error": "Already registered for this event"}
+
+    trending_leaderboard.record_registration(reserved.id)
+    return {
+        "success": True,
+        "message": f"Successfully registered for {reserved.title}",
+        "event": {
+            "id": reserved.id,
+            "title": reserved.title,
+            "date": reserved.date.isoformat()
+        }
+    }
+
+
+def _refused(session: Session, student_id: int, event_id: int, waitlist: bool) -> Dict:
+    event = session.execute(
+        select(_events.c.title, _events.c.date).where(_events.c.id == event_id)
+    ).first()
+    if event is None:
+        return {"error": "Student or event not found"}
+    if session.query(_registered(student_id, event_id)).scalar():
+        return {"error": "Already registered for this event"}
+    if event.date <= datetime.utcnow():
+        return {"error": "Cannot register for past events"}
+    if not waitlist:
+        return {"error": "Event is full"}
+
+    try:
+        session.execute(event_waitlist.insert().values(student_id=student_id, event_id=event_id))
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        return {"error": "Already on the waitlist for this event"}
+
+    return {
+        "success": True,
+        "waitlisted": True,
+        "message": f"{event.title} is full, you are on the waitlist",
+        "position": waitlist_position(session, student_id, event_id)
+    }
+
+
+def waitlist_position(session: Session, student_id: int, event_id: int) -> int:
+    """1-based place in the event's waitlist, 0 when not waitlisted"""
+    mine = select(event_waitlist.c.created_at).where(
+        event_waitlist.c.event_id == event_id,
+        event_waitlist.c.student_id == student_id
+    ).scalar_subquery()
+    ahead = session.scalar(
+        select(func.count()).select_from(event_waitlist).where(
+            event_waitlist.c.event_id == event_id,
+            or_(
+                event_waitlist.c.created_at < mine,
+                and_(event_waitlist.c.created_at == mine, event_waitlist.c.student_id <= student_id)
+            )
+        )
+    )
+    return ahead or 0
+
+
+def cancel_registration(session: Session, student_id: int, event_id: int) -> Dict:
+    """Give up a seat (or a waitlist place); the freed seat goes to the head of the waitlist"""
+    cancelled = session.execute(event_registrations.delete().where(
+        event_registrations.c.student_id == student_id,
+        event_registrations.c.event_id == event_id
+    )).rowcount
+
+    if not cancelled:
+        left = session.execute(event_waitlist.delete().where(
+            event_waitlist.c.student_id == student_id,
+            event_waitlist.c.event_id == event_id
+        )).rowcount
+        session.commit()
+        if not left:
+            return {"error": "Not registered for this event"}
+        return {"success": True, "message": "Removed from the waitlist"}
+
+    # skip_locked lets concurrent cancellations promote different students
+    head = session.execute(
+        select(event_waitlist.c.student_id)
+        .where(
+            event_waitlist.c.event_id == event_id,
+            ~_registered(event_waitlist.c.student_id, event_id)
+        )
+        .order_by(event_waitlist.c.created_at, event_waitlist.c.student_id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalar()
+
+    if head is None:
+        session.execute(
+            update(_events)
+            .where(_events.c.id == event_id, _events.c.current_registrations > 0)
+            .values(current_registrations=_events.c.current_registrations - 1)
+        )
+    else:
+        session.execute(event_waitlist.delete().where(
+            event_waitlist.c.student_id == head,
+            event_waitlist.c.event_id == event_id
+        ))
+        session.execute(event_registrations.insert().values(student_id=head, event_id=event_id))
+    session.commit()
+
+    result = {"success": True, "message": "Registration cancelled"}
+    if head is not None:
+        result["promoted_student_id"] = head
+    return result
@@ -0,0 +1,135 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+
+# Left out when comparing prompts: fillers that never change the answer.
+# Anything else, a topic, a constraint, a date word, "my", a tense, is a
+# content word and has to match.
+STOPWORDS = set("""
+a an the is are be do does can i me you your we our us it its of to in on at for
+about with please tell what whats there any some show find list
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize(prompt: str) -> str:
+    return " ".join(_WORD.findall(prompt.lower().replace("'s ", " is ").replace("'", "")))
+
+
+def content_words(text: str) -> frozenset:
+    return frozenset(word for word in text.split() if word not in STOPWORDS)
+
+
+Scope = Tuple[str, Hashable]
+
+
+class ResponseCache:
+    """Cache of agent responses keyed on (agent, scope, normalized prompt).
+
+    ``scope`` is whatever else the answer depends on (club and personality,
+    student context, search filters). Every entry carries the data ``stamp`` it
+    was generated under, from ``ToolCache.stamp``; a lookup with a different
+    stamp drops it, so answers expire as soon as the rows behind them change.
+
+    Exact matches of the normalized prompt are tried first. Otherwise, with
+    ``near_matches`` on, a prompt with the same set of content words is
+    reused: "what events are there this week" answers "events this week
+    please", but any added or dropped topic or constraint ("python and java
+    events", "... for beginners") is a miss.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None,
+                 near_matches: Optional[bool] = None):
+        if max_entries is None:
+            max_entries = int(os.getenv("RESPONSE_CACHE_SIZE", 2048))
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("RESPONSE_CACHE_TTL", 600))
+        if near_matches is None:
+            near_matches = os.getenv("RESPONSE_CACHE_NEAR_MATCHES", "1").lower() in ("1", "true", "yes", "on")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.near_matches = near_matches
+
+        self._lock = threading.Lock()
+        # (agent, scope, text) -> (expires_at, stamp, content words, response)
+        self._entries: "OrderedDict[Tuple[str, Hashable, str], Tuple[float, tuple, frozenset, str]]" = OrderedDict()
+        self._by_scope: Dict[Scope, Set[str]] = {}
+        self._stats = {"hits": 0, "near_hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+
+    def get(self, agent: str, scope: Hashable, prompt: str, stamp: tuple) -> Optional[str]:
+        text = normalize(prompt)
+        now = time.monotonic()
+        with self._lock:
+            self._expire_scope((agent, scope), stamp, now)
+            entry = self._entries.get((agent, scope, text))
+            if entry is not None:
+                self._entries.move_to_end((agent, scope, text))
+                self._stats["hits"] += 1
+                return entry[3]
+            if self.near_matches and self._by_scope.get((agent, scope)):
+                key = self._nearest(agent, scope, text)
+                if key is not None:
+                    self._entries.move_to_end(key)
+                    self._stats["near_hits"] += 1
+                    return self._entries[key][3]
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, agent: str, scope: Hashable, prompt: str, stamp: tuple, response: str):
+        """Store ``response``; ``stamp`` must be read before generating it, so
+        a write during generation leaves the entry already stale"""
+        text = normalize(prompt)
+        with self._lock:
+            key = (agent, scope, text)
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, stamp, content_words(text), response)
+            self._by_scope.setdefault((agent, scope), set()).add(text)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_scope.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries))
+        lookups = stats["hits"] + stats["near_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["near_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def _expire_scope(self, scope: Scope, stamp: tuple, now: float):
+        for text in list(self._by_scope.get(scope, ())):
+            key = scope + (text,)
+            expires_at, entry_stamp = self._entries[key][:2]
+            if entry_stamp != stamp or expires_at < now:
+                self._drop(key)
+                self._stats["stale"] += 1
+
+    def _nearest(self, agent: str, scope: Hashable, text: str):
+        words = content_words(text)
+        if not words:
+            return None
+        return next((
+            (agent, scope, other) for other in self._by_scope[(agent, scope)]
+            if self._entries[(agent, scope, other)][2] == words
+        ), None)
+
+    def _drop(self, key):
+        if self._entries.pop(key, None) is None:
+            return
+        texts = self._by_scope.get(key[:2])
+        if texts is not None:
+            texts.discard(key[2])
+            if not texts:
+                del self._by_scope[key[:2]]
+
+
+response_cache = ResponseCache()
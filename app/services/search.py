@@ -0,0 +1,89 @@
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, column, desc, func, literal_column, or_, table
+from sqlalchemy.orm import Session, joinedload
+
+from models import Event
+from .trending import trending_leaderboard
+
+
+# Relevance multiplier for trending events, applied on top of the text rank
+TRENDING_BOOST = 1.5
+# How many of the leaderboard's hottest events get the boost
+TRENDING_BOOST_TOP = 20
+# bm25 column weights for (title, event_type, description)
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query_text: str) -> List[str]:
+    return [term.lower() for term in _TERM.findall(query_text or "")]
+
+
+def _trending_boost():
+    # featured by the club, or currently hot on the leaderboard
+    trending = Event.is_trending == True
+    hot_ids = trending_leaderboard.top_ids(TRENDING_BOOST_TOP)
+    if hot_ids:
+        trending = or_(trending, Event.id.in_(hot_ids))
+    return case((trending, TRENDING_BOOST), else_=1.0)
+
+
+def search_events(session: Session, query_text: str, filters: Optional[Dict] = None, limit: int = 20) -> List[Event]:
+    """Upcoming events matching ``query_text``, best text match first.
+
+    Ranked with bm25 (SQLite FTS5) or ts_rank (Postgres tsvector), multiplied
+    by ``TRENDING_BOOST`` for events the club featured or the trending
+    leaderboard ranks among its hottest; ties go to the sooner event.
+    Without a query the listing is trending first, then by date.
+    """
+    filters = filters or {}
+    trending_leaderboard.ensure_loaded(session)
+    query = session.query(Event).options(joinedload(Event.club))
+
+    terms = search_terms(query_text)
+    if terms:
+        dialect = session.get_bind().dialect.name
+        if dialect == "sqlite":
+            # OR of prefix terms, same recall as the old per-term substring match
+            fts = literal_column("events_fts")
+            query = query.join(table("events_fts", column("rowid")), literal_column("events_fts.rowid") == Event.id)
+            query = query.filter(fts.op("MATCH")(" OR ".join(f'"{term}"*' for term in terms)))
+            relevance = -func.bm25(fts, *BM25_WEIGHTS)
+        elif dialect == "postgresql":
+            vector = literal_column("events.search_vector")
+            tsquery = func.to_tsquery("english", " | ".join(f"{term}:*" for term in terms))
+            query = query.filter(vector.op("@@")(tsquery))
+            relevance = func.ts_rank(vector, tsquery)
+        else:
+            conditions = [
+                or_(
+                    Event.title.ilike(f"%{term}%"),
+                    Event.description.ilike(f"%{term}%"),
+                    Event.event_type.ilike(f"%{term}%")
+                )
+                for term in terms
+            ]
+            query = query.filter(or_(*conditions))
+            # one point per matching term
+            relevance = sum(case((condition, 1.0), else_=0.0) for condition in conditions)
+        query = query.order_by(desc(relevance * _trending_boost()), Event.date)
+    else:
+        query = query.order_by(desc(Event.is_trending), Event.date)
+
+    if filters.get('date_from'):
+        query = query.filter(Event.date >= datetime.fromisoformat(filters['date_from']))
+    if filters.get('date_to'):
+        query = query.filter(Event.date <= datetime.fromisoformat(filters['date_to']))
+    if filters.get('club_id'):
+        query = query.filter(Event.club_id == filters['club_id'])
+    if filters.get('event_type'):
+        query = query.filter(Event.event_type == filters['event_type'])
+
+    # Only future events
+    query = query.filter(Event.date > datetime.utcnow())
+
+    return query.limit(limit).all()
@@ -0,0 +1,178 @@
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import student_skills
+
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+class SimilarityIndex:
+    """In-memory index over student skill sets.
+
+    Two lookups are served without scanning the students table:
+
+    - ``exact_top_k``: an inverted skill -> students posting list counts shared
+      skills, touching only students that share at least one skill.
+    - ``approximate_top_k``: MinHash signatures bucketed by LSH bands give the
+      candidates, ranked by estimated Jaccard similarity.
+
+    The index is bulk-loaded from ``student_skills`` on first use, kept current
+    by ``update`` / ``remove`` / ``drop_skill`` on writes, and reloaded after
+    ``ttl_seconds`` to pick up changes made by other worker processes.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, ttl_seconds: Optional[float] = None, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("SIMILARITY_INDEX_TTL", 300))
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.ttl_seconds = ttl_seconds
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._reset()
+
+    def _reset(self):
+        self._skills: Dict[int, frozenset] = {}
+        self._postings: Dict[int, Set[int]] = {}
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, Set[int]]] = [{} for _ in range(self.bands)]
+
+    # -- loading --------------------------------------------------------------
+
+    def ensure_loaded(self, session: Session):
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl_seconds:
+            with self._lock:
+                if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+                    self.load(session)
+
+    def load(self, session: Session):
+        skills_by_student: Dict[int, Set[int]] = {}
+        for student_id, skill_id in session.execute(select(student_skills.c.student_id, student_skills.c.skill_id)):
+            skills_by_student.setdefault(student_id, set()).add(skill_id)
+
+        with self._lock:
+            self._reset()
+            for student_id, skill_ids in skills_by_student.items():
+                self._add(student_id, frozenset(skill_ids))
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    # -- incremental updates --------------------------------------------------
+
+    def update(self, student_id: int, skill_ids: Iterable[int]):
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._discard(student_id)
+            skill_ids = frozenset(skill_ids)
+            if skill_ids:
+                self._add(student_id, skill_ids)
+
+    def remove(self, student_id: int):
+        with self._lock:
+            if self._loaded_at is not None:
+                self._discard(student_id)
+
+    def drop_skill(self, skill_id: int):
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            for student_id in list(self._postings.get(skill_id, ())):
+                self.update(student_id, self._skills[student_id] - {skill_id})
+
+    def skills_of(self, student_id: int) -> frozenset:
+        return self._skills.get(student_id, frozenset())
+
+    def _add(self, student_id: int, skill_ids: frozenset):
+        self._skills[student_id] = skill_ids
+        for skill_id in skill_ids:
+            self._postings.setdefault(skill_id, set()).add(student_id)
+
+        signature = self.signature(skill_ids)
+        self._signatures[student_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(student_id)
+
+    def _discard(self, student_id: int):
+        skill_ids = self._skills.pop(student_id, None)
+        if skill_ids is None:
+            return
+        for skill_id in skill_ids:
+            posting = self._postings.get(skill_id)
+            if posting is not None:
+                posting.discard(student_id)
+                if not posting:
+                    del self._postings[skill_id]
+
+        signature = self._signatures.pop(student_id)
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(student_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    # -- MinHash --------------------------------------------------------------
+
+    def signature(self, skill_ids: Iterable[int]) -> np.ndarray:
+        values = np.fromiter(skill_ids, dtype=np.int64)
+        if values.size == 0:
+            return np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.int64)
+        hashed = (self._a[:, None] * values[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return hashed.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            start = band * self.rows_per_band
+            yield signature[start:start + self.rows_per_band].tobytes()
+
+    # -- queries --------------------------------------------------------------
+
+    def exact_top_k(self, student_id: int, skill_ids: Iterable[int], k: int = 10) -> List[Tuple[int, int]]:
+        """(student_id, shared skill count) pairs, most shared first, ties by id"""
+        with self._lock:
+            overlap = Counter()
+            for skill_id in skill_ids:
+                overlap.update(self._postings.get(skill_id, ()))
+        overlap.pop(student_id, None)
+        return sorted(overlap.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+    def approximate_top_k(self, student_id: int, skill_ids: Iterable[int], k: int = 10) -> List[Tuple[int, float]]:
+        """(student_id, estimated Jaccard similarity) pairs from the LSH candidates"""
+        signature = self.signature(skill_ids)
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates |= self._buckets[band].get(key, set())
+            candidates.discard(student_id)
+            if not candidates:
+                return []
+            ids = np.fromiter(candidates, dtype=np.int64)
+            matrix = np.stack([self._signatures[c] for c in ids.tolist()])
+
+        estimates = (matrix == signature).mean(axis=1)
+        order = np.lexsort((ids, -estimates))[:k]
+        return [(int(ids[i]), round(float(estimates[i]), 3)) for i in order]
+
+
+similarity_index = SimilarityIndex()
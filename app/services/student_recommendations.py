@@ -0,0 +1,329 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Event, Student, student_skills, club_members, event_registrations
+from .recommendations import (
+    RecommendationEngine, recommendation_engine,
+    SKILL_MATCH_POINTS, SAME_CLUB_POINTS, TRENDING_POINTS, VIEW_POINTS
+)
+
+
+# (event_id, score, reasons); title, club, date and location are kept once
+# per event in StudentRecommendationStore._events
+Entry = Tuple[int, float, Tuple[str, ...]]
+Inputs = Tuple[Set[int], Set[int], Set[int]]
+
+
+class StudentRecommendationStore:
+    """Every student's top-N recommended events, kept between requests.
+
+    ``load`` scores all students against the upcoming events in bulk; it is
+    the batch job, run at startup and by ``refresh`` every ``rebuild_seconds``
+    (view counts drift in between). Writers report changes and the next read
+    catches up incrementally:
+
+    - ``event_changed(event_id)`` after an event is created, updated (a
+      trending flip included) or deleted: only that event is scored again,
+      for every student, and merged into their lists;
+    - ``student_changed(student_id)`` after a registration, a cancellation or
+      a skill change: only that student's list is recomputed;
+    - ``invalidate()`` after changes to clubs or skills, which reach many
+      events at once: reads go to the engine until the next ``load``.
+
+    A list that was cut at N and loses entries (an event deleted or started)
+    may now miss events that ranked just below it, so that student is
+    recomputed. Lists are the engine's ranking exactly as of the last
+    change, except for view counts.
+
+    Queries and scoring run outside the lock, which only guards the stored
+    lists; a result is stored unless an ``invalidate`` or ``load`` came in
+    meanwhile (``_generation``), and a student whose list changed while it
+    was computed is left dirty for the next read. A read that overlaps
+    another request's merge may still get the list from before it.
+    """
+
+    def __init__(self, top_n: Optional[int] = None, rebuild_seconds: Optional[float] = None,
+                 engine: RecommendationEngine = recommendation_engine):
+        if top_n is None:
+            top_n = int(os.getenv("STUDENT_RECOMMENDATIONS_TOP", 30))
+        if rebuild_seconds is None:
+            rebuild_seconds = float(os.getenv("STUDENT_RECOMMENDATIONS_REBUILD", 600))
+        self.top_n = top_n
+        self.rebuild_seconds = rebuild_seconds
+        self.engine = engine
+
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._generation = 0
+        # bumped by every reported change, tells a recompute that it may have
+        # read rows from before one
+        self._changes = 0
+        self._events: Dict[int, Tuple[str, str, datetime, Optional[str]]] = {}
+        self._inputs: Dict[int, Inputs] = {}
+        self._lists: Dict[int, List[Entry]] = {}
+        # students whose list holds every event they are eligible for
+        self._complete: Set[int] = set()
+        self._dirty_students: Set[int] = set()
+        self._pending_events: Set[int] = set()
+        # changes reported while a load runs, replayed over its result
+        self._changes_during_load: Optional[Tuple[Set[int], Set[int]]] = None
+        self._stats = {"hits": 0, "recomputed": 0, "events_merged": 0, "fallbacks": 0, "loads": 0}
+
+    # -- reads ----------------------------------------------------------------
+
+    def get(self, session: Session, student_id: int, limit: int = 15) -> List[Dict]:
+        """Top ``limit`` recommendations, same shape as ``RecommendationEngine.recommend``"""
+        with self._lock:
+            fallback = self._loaded_at is None or limit > self.top_n
+            if fallback:
+                self._stats["fallbacks"] += 1
+            pending = bool(self._pending_events)
+        if fallback:
+            return self.engine.recommend(session, student_id, limit)
+        if pending:
+            self._merge_events(session)
+
+        with self._lock:
+            entries = None
+            if student_id not in self._dirty_students:
+                entries = self._upcoming(student_id)
+            if entries is not None:
+                self._stats["hits"] += 1
+                return [self._item(entry) for entry in entries[:limit]]
+        return self._recompute(session, student_id)[:limit]
+
+    def _upcoming(self, student_id: int) -> Optional[List[Entry]]:
+        """Stored list without events that started, None when it has to be recomputed"""
+        entries = self._lists.get(student_id)
+        if entries is None:
+            return None
+        now = datetime.utcnow()
+        upcoming = [entry for entry in entries if self._events[entry[0]][2] > now]
+        if len(upcoming) < len(entries):
+            if student_id not in self._complete:
+                return None
+            self._lists[student_id] = upcoming
+        return upcoming
+
+    def _recompute(self, session: Session, student_id: int) -> List[Dict]:
+        with self._lock:
+            generation, changes = self._generation, self._changes
+        inputs = self.engine.inputs(session, student_id)
+        items = self.engine.top(self.engine.snapshot(session), *inputs, self.top_n)
+        with self._lock:
+            if generation == self._generation:
+                self._store(student_id, inputs, self._entries(items), complete=len(items) < self.top_n)
+                if changes == self._changes:
+                    self._dirty_students.discard(student_id)
+                else:
+                    self._dirty_students.add(student_id)
+            self._stats["recomputed"] += 1
+        return items
+
+    def _item(self, entry: Entry) -> Dict:
+        event_id, score, reasons = entry
+        title, club_name, date, location = self._events[event_id]
+        return {
+            "item_id": event_id,
+            "item_type": "event",
+            "title": title,
+            "club_name": club_name,
+            "date": date.isoformat(),
+            "location": location,
+            "score": score,
+            "reasons": list(reasons)
+        }
+
+    # -- incremental updates --------------------------------------------------
+
+    def event_changed(self, event_id: int):
+        with self._lock:
+            self._changes += 1
+            self._pending_events.add(event_id)
+            if self._changes_during_load is not None:
+                self._changes_during_load[0].add(event_id)
+
+    def student_changed(self, student_id: int):
+        with self._lock:
+            self._changes += 1
+            self._dirty_students.add(student_id)
+            if self._changes_during_load is not None:
+                self._changes_during_load[1].add(student_id)
+
+    def remove(self, student_id: int):
+        with self._lock:
+            self._lists.pop(student_id, None)
+            self._inputs.pop(student_id, None)
+            self._complete.discard(student_id)
+            self._dirty_students.discard(student_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+            self._generation += 1
+
+    def _merge_events(self, session: Session):
+        """Score the pending events for every student and merge them in"""
+        with self._lock:
+            if not self._pending_events:
+                return
+            generation = self._generation
+            event_ids, self._pending_events = self._pending_events, set()
+            inputs, lists, complete = dict(self._inputs), dict(self._lists), set(self._complete)
+            events = dict(self._events)
+
+        snapshot = self.engine.events(session, event_ids)
+        changed = []
+        for i, event_id in enumerate(snapshot.event_ids.tolist()):
+            events[event_id] = (
+                snapshot.titles[i], snapshot.club_names[i], snapshot.date_values[i], snapshot.locations[i]
+            )
+            changed.append((
+                event_id,
+                set(snapshot.skill_ids[snapshot.indptr[i]:snapshot.indptr[i + 1]].tolist()),
+                int(snapshot.club_ids[i]),
+                float(snapshot.trending[i] * TRENDING_POINTS + snapshot.views[i] * VIEW_POINTS),
+            ))
+
+        # student_id -> (list merged into, merged list, cut at N, lost entries)
+        merged = {}
+        for student_id, student_inputs in inputs.items():
+            previous = lists.get(student_id)
+            if previous is not None and len(previous) >= self.top_n and not any(
+                entry[0] in event_ids for entry in previous
+            ):
+                # a full list the events can't get into stays as it is
+                skill_ids, club_ids, registered = student_inputs
+                best = max((
+                    round(len(skill_ids & event_skills) * SKILL_MATCH_POINTS
+                          + (club_id in club_ids) * SAME_CLUB_POINTS + points, 2)
+                    for event_id, event_skills, club_id, points in changed if event_id not in registered
+                ), default=None)
+                if best is None or best < round(previous[-1][1], 2):
+                    continue
+
+            entries = [entry for entry in previous or [] if entry[0] not in event_ids]
+            shrunk = len(entries) < len(previous or [])
+            if snapshot.size:
+                entries += self._entries(self.engine.top(snapshot, *student_inputs, len(event_ids)), events)
+            entries.sort(key=lambda entry: self._rank(entry, events))
+            cut = len(entries) > self.top_n
+            del entries[self.top_n:]
+            merged[student_id] = (previous, entries, cut, shrunk)
+
+        with self._lock:
+            if generation != self._generation:
+                # invalidated or reloaded meanwhile, the events are covered
+                return
+            # events that were deleted or started stay in _events until the next load
+            for event_id in snapshot.event_ids.tolist():
+                self._events[event_id] = events[event_id]
+            for student_id, (previous, entries, cut, shrunk) in merged.items():
+                if self._lists.get(student_id) is not previous:
+                    # recomputed or trimmed meanwhile, may miss these events
+                    self._dirty_students.add(student_id)
+                    continue
+                self._lists[student_id] = entries
+                if cut:
+                    self._complete.discard(student_id)
+                elif shrunk and student_id not in complete:
+                    self._dirty_students.add(student_id)
+            self._stats["events_merged"] += len(event_ids)
+
+    # -- batch rebuild --------------------------------------------------------
+
+    def refresh(self, session: Session):
+        """Rebuild when invalidated or older than ``rebuild_seconds``"""
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.rebuild_seconds:
+            self.load(session)
+
+    def load(self, session: Session):
+        with self._lock:
+            generation = self._generation
+            self._changes_during_load = (set(), set())
+        try:
+            self.engine.invalidate()
+            snapshot = self.engine.snapshot(session)
+            inputs: Dict[int, Inputs] = {
+                student_id: (set(), set(), set()) for student_id in session.scalars(select(Student.id))
+            }
+            for position, statement in enumerate((
+                select(student_skills.c.student_id, student_skills.c.skill_id),
+                select(club_members.c.student_id, club_members.c.club_id),
+                select(event_registrations.c.student_id, event_registrations.c.event_id)
+                .join(Event, Event.id == event_registrations.c.event_id)
+                .where(Event.date > datetime.utcnow()),
+            )):
+                for student_id, row_id in session.execute(statement):
+                    if student_id in inputs:
+                        inputs[student_id][position].add(row_id)
+
+            events, lists, complete = {}, {}, set()
+            for student_id, student_inputs in inputs.items():
+                items = self.engine.top(snapshot, *student_inputs, self.top_n)
+                lists[student_id] = self._entries(items, events)
+                if len(items) < self.top_n:
+                    complete.add(student_id)
+        except Exception:
+            with self._lock:
+                self._changes_during_load = None
+            raise
+
+        with self._lock:
+            changed_events, changed_students = self._changes_during_load
+            self._changes_during_load = None
+            if generation != self._generation:
+                return
+            self._events, self._inputs, self._lists, self._complete = events, inputs, lists, complete
+            self._pending_events = changed_events
+            self._dirty_students = changed_students
+            self._loaded_at = time.monotonic()
+            # merges and recomputes still running worked on the old lists
+            self._generation += 1
+            self._stats["loads"] += 1
+
+    # -- helpers --------------------------------------------------------------
+
+    def _store(self, student_id: int, inputs: Inputs, entries: List[Entry], complete: bool):
+        self._inputs[student_id] = inputs
+        self._lists[student_id] = entries
+        if complete:
+            self._complete.add(student_id)
+        else:
+            self._complete.discard(student_id)
+
+    def _entries(self, items: List[Dict], events: Optional[Dict] = None) -> List[Entry]:
+        events = self._events if events is None else events
+        entries = []
+        for item in items:
+            event_id = item["item_id"]
+            if event_id not in events:
+                events[event_id] = (
+                    item["title"], item["club_name"], datetime.fromisoformat(item["date"]), item["location"]
+                )
+            entries.append((event_id, item["score"], tuple(item["reasons"])))
+        return entries
+
+    def _rank(self, entry: Entry, events: Dict):
+        # the engine's order: rounded score, then the sooner event
+        return -round(entry[1], 2), events[entry[0]][2], entry[0]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(
+                self._stats,
+                loaded=self._loaded_at is not None,
+                students=len(self._lists),
+                dirty_students=len(self._dirty_students),
+                pending_events=len(self._pending_events),
+            )
+
+
+student_recommendations = StudentRecommendationStore()
@@ -0,0 +1,188 @@
+import math
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.orm import Session
+
+from models import Event
+
+
+# Activity weights: a registration says more than a page view
+VIEW_WEIGHT = 1.0
+REGISTRATION_WEIGHT = 10.0
+
+
+def _logaddexp(a: Optional[float], b: float) -> float:
+    if a is None:
+        return b
+    high, low = (a, b) if a >= b else (b, a)
+    return high + math.log1p(math.exp(low - high))
+
+
+def _epoch(moment: Optional[datetime]) -> float:
+    if moment is None:
+        return time.time()
+    return moment.replace(tzinfo=timezone.utc).timestamp()
+
+
+class TrendingLeaderboard:
+    """Time-decayed trending scores for upcoming events.
+
+    Every view or registration adds ``weight * exp(-decay * age)`` to an
+    event's score. Scores are kept as the time-invariant key
+    ``log(score) + decay * t``, so activity never has to be re-decayed: the
+    ordering of keys is the ordering of current scores, a new hit is one
+    ``logaddexp`` and the current score is ``exp(key - decay * now)``.
+
+    The best ``capacity`` events are held in a sorted array. Keys only grow,
+    so an event can only enter it on its own hit and ``top`` reads it in O(k).
+
+    Hits are buffered in memory and merged into ``events.trending_score`` by
+    ``flush``, which also reloads the board so hits recorded by other worker
+    processes show up after one flush interval.
+    """
+
+    def __init__(self, half_life_hours: Optional[float] = None, capacity: int = 100):
+        if half_life_hours is None:
+            half_life_hours = float(os.getenv("TRENDING_HALF_LIFE_HOURS", 24))
+        self.decay = math.log(2) / (half_life_hours * 3600)
+        self.capacity = capacity
+
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._keys: Dict[int, float] = {}
+        self._pending: Dict[int, float] = {}
+        self._top: List[Tuple[float, int]] = []  # (-key, event_id), best first
+
+    # -- recording ------------------------------------------------------------
+
+    def record_view(self, event_id: int, at: Optional[float] = None):
+        self.record(event_id, VIEW_WEIGHT, at)
+
+    def record_registration(self, event_id: int, at: Optional[float] = None):
+        self.record(event_id, REGISTRATION_WEIGHT, at)
+
+    def record(self, event_id: int, weight: float, at: Optional[float] = None):
+        hit = math.log(weight) + self.decay * (time.time() if at is None else at)
+        with self._lock:
+            self._pending[event_id] = _logaddexp(self._pending.get(event_id), hit)
+            self._set(event_id, _logaddexp(self._keys.get(event_id), hit))
+
+    def remove(self, event_id: int):
+        with self._lock:
+            self._pending.pop(event_id, None)
+            key = self._keys.pop(event_id, None)
+            if key is not None:
+                position = bisect_left(self._top, (-key, event_id))
+                if position < len(self._top) and self._top[position] == (-key, event_id):
+                    del self._top[position]
+
+    def _set(self, event_id: int, key: float):
+        old = self._keys.get(event_id)
+        self._keys[event_id] = key
+        if old is not None:
+            position = bisect_left(self._top, (-old, event_id))
+            if position < len(self._top) and self._top[position] == (-old, event_id):
+                del self._top[position]
+                insort(self._top, (-key, event_id))
+                return
+        if len(self._top) < self.capacity:
+            insort(self._top, (-key, event_id))
+        elif -key < self._top[-1][0]:
+            self._top.pop()
+            insort(self._top, (-key, event_id))
+
+    # -- reading --------------------------------------------------------------
+
+    def top(self, k: int = 10) -> List[Tuple[int, float]]:
+        """(event_id, current score) pairs, hottest first"""
+        now = self.decay * time.time()
+        with self._lock:
+            best = self._top[:k]
+        return [(event_id, round(math.exp(-negative_key - now), 3)) for negative_key, event_id in best]
+
+    def top_ids(self, k: int = 10) -> List[int]:
+        with self._lock:
+            return [event_id for _, event_id in self._top[:k]]
+
+    # -- persistence ----------------------------------------------------------
+
+    def ensure_loaded(self, session: Session):
+        if not self._loaded:
+            self.load(session)
+
+    def load(self, session: Session):
+        rows = session.execute(
+            select(Event.id, Event.trending_score, Event.view_count,
+                   Event.current_registrations, Event.updated_at)
+            .where(Event.date > datetime.utcnow())
+            .where(or_(Event.trending_score.is_not(None), Event.view_count > 0, Event.current_registrations > 0))
+        ).all()
+
+        keys = {}
+        for row in rows:
+            if row.trending_score is not None:
+                keys[row.id] = row.trending_score
+            else:
+                # Never flushed: seed from the lifetime counters as of the last update
+                activity = (row.view_count or 0) * VIEW_WEIGHT + (row.current_registrations or 0) * REGISTRATION_WEIGHT
+                keys[row.id] = math.log(activity) + self.decay * _epoch(row.updated_at)
+
+        with self._lock:
+            # hits recorded while the rows were loading are still pending
+            for event_id, hit in self._pending.items():
+                keys[event_id] = _logaddexp(keys.get(event_id), hit)
+            self._keys = keys
+            self._top = sorted((-key, event_id) for event_id, key in keys.items())[:self.capacity]
+            self._loaded = True
+
+    def flush(self, session: Session) -> int:
+        """Merge buffered hits into events.trending_score, then reload the board"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if pending:
+            try:
+                stored = dict(session.execute(
+                    select(Event.id, Event.trending_score).where(Event.id.in_(list(pending)))
+                ).all())
+                with self._lock:
+                    # a never-flushed row keeps its counter seed from the board
+                    merged = [
+                        {
+                            "event_id": event_id,
+                            "score": _logaddexp(stored[event_id], hit)
+                            if stored[event_id] is not None else self._keys.get(event_id, hit)
+                        }
+                        for event_id, hit in pending.items() if event_id in stored
+                    ]
+                if merged:
+                    events = Event.__table__
+                    # a score write is not an edit: keep updated_at from its onupdate default
+                    session.execute(
+                        update(events)
+                        .where(events.c.id == bindparam("event_id"))
+                        .values(trending_score=bindparam("score"), updated_at=events.c.updated_at),
+                        sorted(merged, key=lambda row: row["event_id"])
+                    )
+                    session.commit()
+            except Exception:
+                session.rollback()
+                with self._lock:
+                    for event_id, hit in pending.items():
+                        self._pending[event_id] = _logaddexp(self._pending.get(event_id), hit)
+                raise
+
+        self.load(session)
+        return len(pending)
+
+    def invalidate(self):
+        self._loaded = False
+
+
+trending_leaderboard = TrendingLeaderboard()
@@ -0,0 +1,68 @@
+import threading
+from collections import Counter
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.orm import Session
+
+from models import Event
+
+
+class ViewCounter:
+    """Write-behind buffer for event page views.
+
+    ``record`` only bumps an in-process counter. ``flush`` drains it into one
+    batched ``UPDATE events SET view_count = view_count + n`` per event, so a
+    page view never writes to the database and concurrent workers add up
+    instead of overwriting each other.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+
+    def record(self, event_id: int) -> int:
+        """Count one view, return the views of ``event_id`` not yet flushed"""
+        with self._lock:
+            self._pending[event_id] += 1
+            return self._pending[event_id]
+
+    def pending(self, event_id: int) -> int:
+        with self._lock:
+            return self._pending.get(event_id, 0)
+
+    def discard(self, event_id: int):
+        with self._lock:
+            self._pending.pop(event_id, None)
+
+    def flush(self, session: Session) -> int:
+        """Write the buffered views, return how many were written"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return 0
+
+        events = Event.__table__
+        statement = (
+            update(events)
+            .where(events.c.id == bindparam("event_id"))
+            # a view is not an edit: keep updated_at from its onupdate default
+            .values(
+                view_count=func.coalesce(events.c.view_count, 0) + bindparam("views"),
+                updated_at=events.c.updated_at,
+            )
+        )
+        try:
+            # id order keeps concurrent flushes from deadlocking on row locks
+            session.execute(statement, [
+                {"event_id": event_id, "views": views} for event_id, views in sorted(pending.items())
+            ])
+            session.commit()
+        except Exception:
+            session.rollback()
+            with self._lock:
+                self._pending.update(pending)
+            raise
+        return sum(pending.values())
+
+
+view_counter = ViewCounter()